@@ -1,12 +1,11 @@
-from cms.models import CompanyProfile
+from django.utils.functional import SimpleLazyObject
+from .profile_cache import load_profile
 
 
 # Context processor to make tenant-specific profile data available in all templates.
+# The profile is shared with the view through load_profile, and only loaded if a template uses it.
 def tenant_profile(request):
-    profile = None
-    if hasattr(request, 'tenant') and request.tenant.schema_name != 'public':
-        profile = CompanyProfile.objects.filter(tenant_slug=request.tenant.schema_name).first()
     return {
-        'profile': profile,
+        'profile': SimpleLazyObject(lambda: load_profile(request)),
         'tenant': request.tenant if hasattr(request, 'tenant') else None
     }
@@ -0,0 +1,30 @@
+import hashlib
+import uuid
+
+from django.core.cache import cache
+
+
+def _version_key(schema_name):
+    return f'cms:fragments:version:{schema_name}'
+
+
+def get_fragment_version(schema_name):
+    version = cache.get(_version_key(schema_name))
+    if version is None:
+        cache.add(_version_key(schema_name), uuid.uuid4().hex, None)
+        version = cache.get(_version_key(schema_name))
+    return version
+
+
+def bump_fragment_version(schema_name):
+    """Orphans the schema's cached fragments (nav, footer) after its CompanyProfile changes."""
+    cache.set(_version_key(schema_name), uuid.uuid4().hex, None)
+
+
+def fragment_key(schema_name, name, source_digest, vary_on):
+    """
+    Key for one rendering of a fragment: the schema and its version, the fragment's template source
+    (so a deploy that edits the markup never serves the old copy) and any values it varies on.
+    """
+    vary = hashlib.md5('|'.join(str(value) for value in vary_on).encode(), usedforsecurity=False).hexdigest()
+    return f'cms:fragment:{schema_name}:{get_fragment_version(schema_name)}:{name}:{source_digest}:{vary}'
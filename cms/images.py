@@ -0,0 +1,176 @@
+import io
+import math
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.utils import timezone
+from django_tenants.utils import schema_context
+from PIL import ExifTags, Image, ImageOps
+
+from customers.models import QueuedImage
+from customers.queueing import claim_due, retry_delay
+from .models import CompanyProfile
+from .responsive import resizes_by_url, variant_name, variant_widths
+
+# Largest size each CompanyProfile image is displayed at, as (max width, max height), doubled for
+# high-density screens. The logo sits in a 40px high navbar; the hero fills the viewport width.
+IMAGE_SLOTS = {
+    'logo': (None, 80),
+    'hero_image': (2560, None),
+    'team_photo': (1600, None),
+}
+
+# No upload is anywhere near this wide or high; it stands in for "unbounded" in thumbnail()
+_UNBOUNDED = 100000
+
+
+def _bounds(field_name):
+    max_width, max_height = IMAGE_SLOTS[field_name]
+    return max_width or _UNBOUNDED, max_height or _UNBOUNDED
+
+
+def _draft_size(size, bounds):
+    """The size `size` comes out at once fitted into `bounds`, or None if it already fits."""
+    scale = min(bounds[0] / size[0], bounds[1] / size[1])
+    if scale >= 1:
+        return None
+    return math.ceil(size[0] * scale), math.ceil(size[1] * scale)
+
+
+def _decode(source, field_name):
+    """Opens the image in `source` upright and in RGB(A), decoded no larger than needed for its slot."""
+    bounds = _bounds(field_name)
+    with Image.open(source) as image:
+        if image.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+            # Stored sideways: the slot's width applies to the stored height
+            bounds = bounds[::-1]
+        # JPEGs can decode straight to a smaller scale, which is far cheaper than resizing afterwards.
+        # draft() keeps to a scale at least as large as the size asked for, so ask for the fitted size.
+        draft_size = _draft_size(image.size, bounds)
+        if draft_size:
+            image.draft('RGB', draft_size)
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+        return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def _optimised(source, field_name):
+    image = _decode(source, field_name)
+    image.thumbnail(_bounds(field_name), Image.Resampling.LANCZOS)
+    image.info.clear()
+    return image
+
+
+def _webp(image):
+    output = io.BytesIO()
+    image.save(output, 'WEBP', quality=getattr(settings, 'IMAGE_WEBP_QUALITY', 82), method=4)
+    return output.getvalue()
+
+
+def optimise_image(source, field_name):
+    """
+    Returns the image in `source` as WebP bytes: turned upright, scaled down to fit the slot
+    (never up) and without EXIF, XMP or ICC metadata (camera details, GPS positions).
+    """
+    return _webp(_optimised(source, field_name))
+
+
+def save_profile_form(form, tenant):
+    """
+    Saves a valid CompanyProfileForm without uploading its images. New logo, hero and team photo
+    uploads are stored in a QueuedImage row for process_images, which runs on another dyno and
+    can't see this one's disk, and the profile keeps its current images until the worker swaps
+    them in. Returns the names of the queued fields.
+    """
+    uploads = {}
+    for field_name in IMAGE_SLOTS:
+        upload = form.cleaned_data.get(field_name)
+        if field_name in form.changed_data and isinstance(upload, UploadedFile):
+            uploads[field_name] = upload
+            # Form validation already put the upload on the instance; saving it there would upload the original
+            setattr(form.instance, field_name, form.initial.get(field_name))
+    form.save()
+
+    for field_name, upload in uploads.items():
+        with transaction.atomic():
+            # An upload that hasn't been processed yet is superseded by this one
+            stale = list(
+                QueuedImage.objects.select_for_update(skip_locked=True)
+                .filter(tenant=tenant, field_name=field_name, status='pending')
+                .values_list('pk', flat=True)
+            )
+            QueuedImage.objects.filter(pk__in=stale).delete()
+            QueuedImage.objects.create(
+                tenant=tenant, field_name=field_name, content=b''.join(upload.chunks()), original_name=upload.name,
+            )
+    return list(uploads)
+
+
+def _apply(queued):
+    """
+    Optimises and uploads the queued image, outside any transaction, then swaps it into the profile
+    and drops the queued row in one short transaction. If a newer upload superseded this one in
+    the meantime, the profile is left alone and the files just uploaded are removed.
+    """
+    field_name = queued.field_name
+    image = _optimised(io.BytesIO(queued.content), field_name)
+    schema_name = queued.tenant.schema_name
+    with schema_context(schema_name):
+        profile = CompanyProfile.objects.get(tenant_slug=schema_name)
+        fieldfile = getattr(profile, field_name)
+        fieldfile.save(f"{Path(queued.original_name).stem or 'image'}.webp", ContentFile(_webp(image)), save=False)
+        uploaded = [fieldfile.name]
+        if not resizes_by_url(fieldfile.storage):
+            # Narrower copies for srcset, named after the stored image (see cms.responsive)
+            for width in variant_widths(image.width):
+                variant = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+                name = fieldfile.storage.save(variant_name(fieldfile.name, width), ContentFile(_webp(variant)))
+                uploaded.append(name)
+        setattr(profile, f'{field_name}_width', image.width)
+        setattr(profile, f'{field_name}_height', image.height)
+        with transaction.atomic():
+            current = list(QueuedImage.objects.select_for_update().filter(pk=queued.pk).values_list('pk', flat=True))
+            if current:
+                profile.save(update_fields=[field_name, f'{field_name}_width', f'{field_name}_height'])
+                QueuedImage.objects.filter(pk=queued.pk).delete()
+        if not current:
+            for name in uploaded:
+                fieldfile.storage.delete(name)
+
+
+def process_pending_images(batch_size=None):
+    """
+    Optimises and uploads one batch of due images and returns (done, failed).
+    The batch is claimed in a short transaction (see claim_due), so several workers can run side
+    by side, and the uploads happen outside it; each result is recorded in its own transaction,
+    so one tenant's failure doesn't undo the rest of the batch.
+    The uploaded bytes are left out of the batch query and loaded one image at a time.
+    """
+    batch_size = batch_size or getattr(settings, 'IMAGE_QUEUE_BATCH_SIZE', 10)
+    max_attempts = getattr(settings, 'IMAGE_QUEUE_MAX_ATTEMPTS', 5)
+    done = failed = 0
+
+    batch = claim_due(
+        QueuedImage.objects.select_related('tenant').defer('content'),
+        batch_size, getattr(settings, 'IMAGE_QUEUE_CLAIM_TIMEOUT', 300),
+    )
+    for queued in batch:
+        try:
+            _apply(queued)
+        except Exception as e:
+            failed += 1
+            attempts = queued.attempts + 1
+            changes = {'attempts': attempts, 'last_error': str(e)}
+            if attempts >= max_attempts:
+                changes['status'] = 'failed'
+            else:
+                changes['next_attempt_at'] = timezone.now() + retry_delay(attempts)
+            # update() rather than save(): a newer upload may have replaced the row meanwhile
+            QueuedImage.objects.filter(pk=queued.pk).update(**changes)
+        else:
+            done += 1
+
+    return done, failed
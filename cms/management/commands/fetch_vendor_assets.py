@@ -0,0 +1,33 @@
+import base64
+import hashlib
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.vendor import VENDOR_ASSETS, VENDOR_ROOT
+
+
+class Command(BaseCommand):
+    help = "Downloads the pinned vendor CSS, JS and fonts (Bootstrap, Bootstrap Icons) into the static files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Download files that are already present again.")
+
+    def handle(self, *args, **options):
+        for name, asset in VENDOR_ASSETS.items():
+            destination = VENDOR_ROOT / asset.path
+            if destination.exists() and not options['force']:
+                continue
+            try:
+                with urllib.request.urlopen(asset.cdn_url, timeout=30) as response:
+                    content = response.read()
+            except OSError as e:
+                raise CommandError(f"Downloading {asset.cdn_url} failed: {e}")
+            if asset.integrity:
+                algorithm, expected = asset.integrity.split('-', 1)
+                actual = base64.b64encode(hashlib.new(algorithm, content).digest()).decode()
+                if actual != expected:
+                    raise CommandError(f"{asset.cdn_url} doesn't match its integrity hash")
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            destination.write_bytes(content)
+            self.stdout.write(f"Fetched {name} ({len(content)} bytes)")
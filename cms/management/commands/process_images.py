@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from cms.images import process_pending_images
+
+
+class Command(BaseCommand):
+    help = "Optimises queued site editor images (resize, strip metadata, WebP) and uploads them to the media storage."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Process the due images once and exit.")
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--interval', type=float, default=getattr(settings, 'IMAGE_QUEUE_POLL_INTERVAL', 5),
+                            help="Seconds to sleep when there is nothing to process.")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                done, failed = process_pending_images(options['batch_size'])
+            except Exception as e:
+                # Database unavailable: the batch stays queued, try again later
+                self.stderr.write(f"Image batch failed: {e}")
+                done = failed = 0
+            if done or failed:
+                self.stdout.write(f"Images: {done} uploaded, {failed} failed")
+                continue
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:32
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Created in the tenant schema (first on the search_path), so each tenant, and clones of the
+# template schema, carry their own copy.
+SEARCH_TRIGGER_SQL = """
+CREATE FUNCTION cms_job_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.location, '')), 'B') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.summary, '')), 'B') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER cms_job_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, location, summary, description ON cms_job
+    FOR EACH ROW EXECUTE FUNCTION cms_job_search_vector_update();
+
+UPDATE cms_job SET title = title;
+"""
+
+DROP_SEARCH_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS cms_job_search_vector_trigger ON cms_job;
+DROP FUNCTION IF EXISTS cms_job_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0004_job_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+        ),
+        migrations.RunSQL(SEARCH_TRIGGER_SQL, DROP_SEARCH_TRIGGER_SQL),
+    ]
@@ -1,6 +1,38 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.templatetags.static import static
 
+from .responsive import static_image, stored_image
+from .theme import theme_bundle
+
+
+# What a new tenant's site says until they edit it. The template schema's profile carries it,
+# so cloned schemas start with it (see customers.schema_clone.seed_template_schema).
+STARTER_PROFILE = {
+    'hero_title': "Connecting Exceptional Talent with World-Class Teams",
+    'hero_text': (
+        "We specialize in finding the perfect match between industry leaders "
+        "and top-tier professionals."
+    ),
+    'homepage_body_text': (
+        "Whether you're a business looking for your next key hire or a professional ready for a new challenge, "
+        "we're here to make the right introduction. Our consultants bring deep sector knowledge and a "
+        "personal approach to every search, ensuring that we don't just fill roles, but build lasting "
+        "professional partnerships. By combining rigorous candidate screening with an intuitive understanding "
+        "of company culture, we help organizations scale with confidence while guiding talented individuals "
+        "toward the career-defining opportunities they deserve."
+        "We believe that recruitment is about more than just matching a CV to a job description; "
+        "it is about recognizing potential and fostering growth. In today’s competitive landscape, "
+        "finding the right fit requires a partner who listens as much as they search. From the initial "
+        "consultation to the final placement, we remain committed to transparency, integrity, and the "
+        "long-term success of both our clients and our candidates."
+    ),
+    'about_title': "Expertise. Integrity. Results.",
+    'about_content': "With over a decade of experience in specialized recruitment...",
+    'jobs_header_text': "Current Vacancies",
+}
+
 
 class CompanyProfile(models.Model):
     tenant_slug = models.CharField(max_length=63, unique=True, editable=False, null=True)
@@ -23,6 +55,9 @@ class CompanyProfile(models.Model):
         blank=True,
         help_text="Your logo (appears in navigation bar)"
     )
+    # Pixel sizes of the optimised images, recorded by process_images (unknown for older uploads)
+    logo_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    logo_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     primary_color = models.CharField(max_length=7, default="#0f172a")
     secondary_color = models.CharField(max_length=7, default="#0f172a")
     background_color = models.CharField(max_length=7, default="#ffffff")
@@ -31,6 +66,8 @@ class CompanyProfile(models.Model):
     hero_title = models.CharField(max_length=200, default="Great Careers Await")
     hero_text = models.TextField(blank=True, help_text="The main pitch to candidates")
     hero_image = models.ImageField(upload_to='hero/', null=True, blank=True)
+    hero_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    hero_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     homepage_body_text = models.TextField(
         blank=True,
         help_text="Short paragraph shown below the hero section on the homepage."
@@ -39,6 +76,8 @@ class CompanyProfile(models.Model):
     # About Us
     about_title = models.CharField(max_length=200, default="Our Story", blank=True)
     team_photo = models.ImageField(upload_to='team/', null=True, blank=True)
+    team_photo_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    team_photo_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     about_content = models.TextField(blank=True)
 
     # Jobs Section
@@ -70,6 +109,30 @@ class CompanyProfile(models.Model):
             return self.team_photo.url
         return static('marketing/images/default_about.webp')
 
+    def get_hero_image_set(self):
+        """The hero (or the theme's default) as a ResponsiveImage, for the responsive_img tag."""
+        if self.hero_image:
+            return stored_image(self.hero_image, self.hero_image_width, self.hero_image_height)
+        return static_image(f'marketing/images/default_{self.template_choice}.webp')
+
+    def get_team_photo_set(self):
+        if self.team_photo:
+            return stored_image(self.team_photo, self.team_photo_width, self.team_photo_height)
+        return static_image('marketing/images/default_about.webp')
+
+    @property
+    def theme_digest(self):
+        """Content digest of the tenant's theme stylesheet, for its cache-busting URL."""
+        return theme_bundle(self)[1]
+
+    @property
+    def logo_display_size(self):
+        """(width, height) the logo renders at in the 40px navbar, or None for logos of unknown size."""
+        if not (self.logo_width and self.logo_height):
+            return None
+        height = min(self.logo_height, 40)
+        return round(self.logo_width * height / self.logo_height), height
+
     def __str__(self):
         return self.display_name
 
@@ -101,8 +164,19 @@ class Job(models.Model):
     linkedin_post_id = models.CharField(max_length=100, blank=True, null=True)
     last_shared_date = models.DateTimeField(null=True, blank=True)
 
+    # Weighted title/location/summary/description document, maintained by a database trigger (see cms.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Columns the job cards render; lists load only these and leave out the description
+    CARD_FIELDS = ('id', 'title', 'company_name', 'salary', 'location', 'summary', 'created_at')
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the job lists (cms.pagination)
+            models.Index(fields=['-created_at', '-id'], name='job_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='job_search_vector_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.location}"
@@ -0,0 +1,82 @@
+import hashlib
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+
+
+def _version_key(schema_name):
+    return f'cms:pages:version:{schema_name}'
+
+
+def get_page_version(schema_name):
+    version = cache.get(_version_key(schema_name))
+    if version is None:
+        cache.add(_version_key(schema_name), uuid.uuid4().hex, None)
+        version = cache.get(_version_key(schema_name))
+    return version
+
+
+def bump_page_version(schema_name):
+    """Orphans every cached page for the tenant; old entries simply expire."""
+    cache.set(_version_key(schema_name), uuid.uuid4().hex, None)
+
+
+def _page_key(request, template_name, query_params=()):
+    # Only the parameters the view reads: anything else (utm tags, cache busters) would mint new entries
+    query = urlencode([(name, value) for name in query_params for value in request.GET.getlist(name)])
+    raw = f'{request.get_host()}|{request.path}|{query}|{template_name}'
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    schema_name = request.tenant.schema_name
+    return f'cms:page:{schema_name}:{get_page_version(schema_name)}:{digest}'
+
+
+def _is_cacheable_request(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if not hasattr(request, 'tenant') or request.tenant.schema_name == 'public':
+        return False
+    if request.user.is_authenticated:
+        return False
+    # len() doesn't mark the messages as read, so they are still shown on the rendered page
+    return not len(messages.get_messages(request))
+
+
+def _is_cacheable_response(request, response):
+    if response.status_code != 200 or response.cookies:
+        return False
+    # A token rendered into a shared page would break the next visitor's form
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        return False
+    return not len(messages.get_messages(request))
+
+
+def cache_public_page(template_name, query_params=()):
+    """
+    Caches the rendered page for anonymous visitors, keyed on host, path, template and the
+    query_params the view reads; other query strings share the page rendered without them.
+    Saving or deleting a CompanyProfile or Job bumps the tenant's version, which orphans the old pages.
+    Pages that render a CSRF token are never stored; forms on cached pages get theirs from
+    cms/js/csrf-field.js instead.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            timeout = getattr(settings, 'PAGE_CACHE_TIMEOUT', 0)
+            if not timeout or not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_key(request, template_name, query_params)
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if _is_cacheable_response(request, response):
+                cache.set(key, response, timeout)
+            return response
+        return _wrapped
+    return decorator
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import CompanyProfile
+
+
+def _cache_key(schema_name):
+    return f'cms:profile:{schema_name}'
+
+
+def load_profile(request):
+    """
+    Returns the tenant's CompanyProfile (or None), fetched at most once per request.
+    Also reads through a cross-request cache keyed by schema name when PROFILE_CACHE_TIMEOUT is set.
+    """
+    if hasattr(request, '_cached_profile'):
+        return request._cached_profile
+
+    profile = None
+    tenant = getattr(request, 'tenant', None)
+    if tenant is not None and tenant.schema_name != 'public':
+        timeout = getattr(settings, 'PROFILE_CACHE_TIMEOUT', 0)
+        key = _cache_key(tenant.schema_name)
+        profile = cache.get(key) if timeout else None
+        if profile is None:
+            profile = CompanyProfile.objects.filter(tenant_slug=tenant.schema_name).first()
+            if profile is not None and timeout:
+                cache.set(key, profile, timeout)
+
+    request._cached_profile = profile
+    return profile
+
+
+def invalidate_profile(schema_name):
+    cache.delete(_cache_key(schema_name))
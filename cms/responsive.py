@@ -0,0 +1,54 @@
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from PIL import Image
+
+# Widths offered in srcset; browsers pick the smallest that covers the slot at the screen's density
+IMAGE_VARIANT_WIDTHS = (480, 800, 1200, 1600, 2000)
+
+# src and srcset for an <img>, with the intrinsic size (None when unknown) so the browser can reserve space
+ResponsiveImage = namedtuple('ResponsiveImage', 'src srcset width height')
+
+
+def resizes_by_url(storage):
+    """Cloudinary resizes on the fly from transformation URLs; other storages get variant files from process_images."""
+    return type(storage).__module__.startswith('cloudinary_storage')
+
+
+def variant_name(name, width):
+    """'hero/beach.webp' -> 'hero/beach-800w.webp'"""
+    root, ext = os.path.splitext(name)
+    return f"{root}-{width}w{ext}"
+
+
+def variant_widths(width):
+    return [w for w in IMAGE_VARIANT_WIDTHS if w < width]
+
+
+def stored_image(fieldfile, width=None, height=None):
+    """A ResponsiveImage for an uploaded image; images without a recorded width get no local variants."""
+    url = fieldfile.url
+    if resizes_by_url(fieldfile.storage):
+        # c_limit never enlarges, so widths past an unknown original are merely redundant
+        widths = variant_widths(width) if width else IMAGE_VARIANT_WIDTHS
+        candidates = [(url.replace('/image/upload/', f'/image/upload/c_limit,w_{w}/', 1), w) for w in widths]
+    else:
+        candidates = [(fieldfile.storage.url(variant_name(fieldfile.name, w)), w) for w in variant_widths(width or 0)]
+    if width:
+        candidates.append((url, width))
+    srcset = ', '.join(f"{candidate} {w}w" for candidate, w in candidates)
+    return ResponsiveImage(url, srcset, width, height)
+
+
+@lru_cache(maxsize=None)
+def static_image(path):
+    """A ResponsiveImage for a bundled default image, sized once per process from the file."""
+    width = height = None
+    found = finders.find(path)
+    if found:
+        with Image.open(found) as image:
+            width, height = image.size
+    return ResponsiveImage(static(path), '', width, height)
@@ -0,0 +1,114 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, CharField, DecimalField, F, Func, Value, When
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Job
+
+# Must match the configuration used by the trigger in migration 0005_job_search_vector
+SEARCH_CONFIG = 'english'
+
+# (key, label, lowest salary included, lowest salary excluded)
+SALARY_BANDS = [
+    ('under-30k', 'Under 30k', None, 30000),
+    ('30k-50k', '30k - 50k', 30000, 50000),
+    ('50k-80k', '50k - 80k', 50000, 80000),
+    ('80k-plus', '80k+', 80000, None),
+]
+UNSPECIFIED_BAND = 'unspecified'
+
+# Sentinels around matched words; the snippet is escaped before they become <mark> tags
+_START, _STOP = '\x02', '\x03'
+
+
+class SalaryFloor(Func):
+    """
+    First amount in the free-text salary, in whole units: '£45k - £55k' -> 45000, 'Competitive' -> NULL.
+    Kept as numeric, so a salary typed with dozens of digits can't overflow an integer cast.
+    """
+    output_field = DecimalField()
+    template = (
+        "(SELECT CASE WHEN m[2] <> '' THEN trunc(m[1]::numeric * 1000) ELSE trunc(m[1]::numeric) END "
+        "FROM regexp_match(replace(%(expressions)s, ',', ''), '(\\d+(?:\\.\\d+)?)\\s*([kK]?)') AS m)"
+    )
+
+
+def salary_band():
+    whens = []
+    for key, _, low, high in SALARY_BANDS:
+        bounds = {}
+        if low is not None:
+            bounds['salary_floor__gte'] = low
+        if high is not None:
+            bounds['salary_floor__lt'] = high
+        whens.append(When(then=Value(key), **bounds))
+    return Case(*whens, default=Value(UNSPECIFIED_BAND), output_field=CharField())
+
+
+def _highlight(snippet):
+    return mark_safe(escape(snippet).replace(_START, '<mark>').replace(_STOP, '</mark>'))
+
+
+def _facet_counts(queryset):
+    """Location and salary band counts for the matching jobs, from one GROUPING SETS query."""
+    sql, params = queryset.order_by().values('location', 'band').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT location, band, GROUPING(location), COUNT(*) FROM ({sql}) AS matches "
+            f"GROUP BY GROUPING SETS ((location), (band)) ORDER BY COUNT(*) DESC, location, band",
+            params,
+        )
+        rows = cursor.fetchall()
+    locations = [(location, count) for location, _, by_band, count in rows if not by_band]
+    band_counts = {band: count for _, band, by_band, count in rows if by_band}
+    bands = [(key, label, band_counts[key]) for key, label, _, _ in SALARY_BANDS if key in band_counts]
+    if UNSPECIFIED_BAND in band_counts:
+        bands.append((UNSPECIFIED_BAND, 'Not stated', band_counts[UNSPECIFIED_BAND]))
+    return locations, bands
+
+
+def search_jobs(query='', location='', band='', offset=0, limit=24):
+    """
+    Searches the tenant's jobs with the trigger-maintained tsvector and its GIN index.
+    Returns a dict with the ranked page of `results` (each with a highlighted `snippet`),
+    `total` matches and `locations` / `salary_bands` facets. Facet counts cover the text
+    match before the location and band filters, so visitors can see the alternatives.
+    """
+    jobs = Job.objects.only(*Job.CARD_FIELDS).annotate(salary_floor=SalaryFloor('salary'), band=salary_band())
+    search_query = None
+    if query:
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        jobs = jobs.filter(search_vector=search_query)
+
+    locations, bands = _facet_counts(jobs)
+
+    if location:
+        jobs = jobs.filter(location=location)
+    if band:
+        jobs = jobs.filter(band=band)
+    if location or band:
+        total = jobs.count()
+    else:
+        total = sum(count for _, count in locations)
+
+    if search_query is not None:
+        jobs = jobs.annotate(
+            rank=SearchRank(F('search_vector'), search_query),
+            headline=SearchHeadline(
+                'description', search_query, config=SEARCH_CONFIG, start_sel=_START, stop_sel=_STOP,
+                max_words=30, min_words=12, max_fragments=2,
+            ),
+        ).order_by('-rank', '-created_at', '-id')
+    else:
+        jobs = jobs.order_by('-created_at', '-id')
+
+    results = list(jobs[offset:offset + limit])
+    for job in results:
+        job.snippet = _highlight(job.headline) if search_query is not None else job.summary
+    return {
+        'results': results,
+        'total': total,
+        'locations': locations,
+        'salary_bands': bands,
+    }
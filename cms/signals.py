@@ -0,0 +1,25 @@
+from django.db import connection
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import CompanyProfile, Job
+from .profile_cache import invalidate_profile
+from .page_cache import bump_page_version
+from .fragment_cache import bump_fragment_version
+
+
+@receiver([post_save, post_delete], sender=CompanyProfile)
+def invalidate_cached_profile(sender, **kwargs):
+    invalidate_profile(connection.schema_name)
+    bump_fragment_version(connection.schema_name)
+
+
+@receiver(post_delete, sender=Job)
+def invalidate_profile_featured_job(sender, **kwargs):
+    """Deleting a job nulls featured_job in the database, so a cached profile would point at a missing row."""
+    invalidate_profile(connection.schema_name)
+
+
+@receiver([post_save, post_delete], sender=CompanyProfile)
+@receiver([post_save, post_delete], sender=Job)
+def invalidate_cached_pages(sender, **kwargs):
+    bump_page_version(connection.schema_name)
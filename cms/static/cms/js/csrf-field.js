@@ -0,0 +1,22 @@
+/**
+ * csrf-field.js
+ * Fills the CSRF field of forms on cached public pages, which are shared between visitors
+ * and so can't carry a token. Uses the csrftoken cookie when the visitor already has one,
+ * otherwise asks the csrf endpoint, which also sets the cookie.
+ */
+(function () {
+    const fields = document.querySelectorAll('input[name="csrfmiddlewaretoken"][data-csrf-url]');
+    if (!fields.length) return;
+
+    const fill = (token) => fields.forEach((field) => { field.value = token; });
+
+    const cookie = document.cookie.split('; ').find((part) => part.startsWith('csrftoken='));
+    if (cookie) {
+        fill(decodeURIComponent(cookie.slice('csrftoken='.length)));
+        return;
+    }
+
+    fetch(fields[0].dataset.csrfUrl, { credentials: 'same-origin', headers: { 'Accept': 'application/json' } })
+        .then((response) => (response.ok ? response.json() : null))
+        .then((data) => { if (data) fill(data.token); });
+})();
@@ -0,0 +1,39 @@
+/**
+ * job-scroll.js
+ * Infinite scroll for the public job list. When the "More vacancies" link comes into view,
+ * fetches the next page of cards from the feed (?cursor=...) and appends them.
+ * Without JavaScript the link still works as a plain next-page link.
+ */
+(function () {
+    const link = document.getElementById('more-jobs');
+    const cards = document.getElementById('job-cards');
+    if (!link || !cards || !('IntersectionObserver' in window)) return;
+
+    let loading = false;
+
+    const loadMore = async (observer) => {
+        if (loading) return;
+        loading = true;
+        try {
+            const url = `${link.dataset.feedUrl}?cursor=${encodeURIComponent(link.dataset.cursor)}`;
+            const response = await fetch(url, { headers: { 'Accept': 'application/json' } });
+            if (!response.ok) return;
+            const page = await response.json();
+            cards.insertAdjacentHTML('beforeend', page.html);
+            if (page.next_cursor) {
+                link.dataset.cursor = page.next_cursor;
+                link.href = `?cursor=${page.next_cursor}`;
+            } else {
+                observer.disconnect();
+                link.remove();
+            }
+        } finally {
+            loading = false;
+        }
+    };
+
+    const observer = new IntersectionObserver((entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) loadMore(observer);
+    }, { rootMargin: '400px' });
+    observer.observe(link);
+})();
@@ -0,0 +1,57 @@
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from cms.fragment_cache import fragment_key
+
+register = template.Library()
+
+
+class CachedFragmentNode(template.Node):
+    def __init__(self, nodelist, name, vary_on, source_digest):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+        self.source_digest = source_digest
+
+    def render(self, context):
+        timeout = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 0)
+        if not timeout:
+            return self.nodelist.render(context)
+        key = fragment_key(
+            connection.schema_name, self.name.resolve(context), self.source_digest,
+            [value.resolve(context) for value in self.vary_on],
+        )
+        html = cache.get(key)
+        if html is None:
+            html = self.nodelist.render(context)
+            cache.set(key, html, timeout)
+        return html
+
+
+@register.tag
+def cachedfragment(parser, token):
+    """
+    {% cachedfragment 'nav' [vary_on ...] %}...{% endcachedfragment %}
+
+    Caches the rendered block per schema for FRAGMENT_CACHE_TIMEOUT seconds. Saving the tenant's
+    CompanyProfile orphans every cached fragment of that schema, so the block may only depend on
+    the profile, the tenant and the values passed as vary_on (e.g. the year, or the visitor's login state).
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name.")
+    # parser.tokens is consumed from the end; what parse() pops is the fragment's own source
+    remaining = list(parser.tokens)
+    nodelist = parser.parse(('endcachedfragment',))
+    source = ''.join(t.contents for t in reversed(remaining[len(parser.tokens):]))
+    parser.delete_first_token()
+    return CachedFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+        hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()[:12],
+    )
@@ -0,0 +1,41 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+def _sizes(columns, inset):
+    # Bootstrap containers are 960/1140/1320px wide from lg/xl/xxl up, with 24px column gutters;
+    # below lg the columns stack to the full width
+    breakpoints = [(1400, 1320), (1200, 1140), (992, 960)]
+    hints = [f"(min-width: {bp}px) {container * columns // 12 - 24 - inset}px" for bp, container in breakpoints]
+    return ', '.join(hints + [f"calc(100vw - {24 + inset}px)"])
+
+
+# `sizes` hint for each image slot per theme: the hero sits in a col-lg-5, the team photo in a col-lg-6,
+# and the boutique theme frames both with 12px of padding
+THEME_IMAGE_SIZES = {
+    theme: {'hero_image': _sizes(5, inset), 'team_photo': _sizes(6, inset)}
+    for theme, inset in [('executive', 0), ('startup', 0), ('boutique', 24)]
+}
+
+
+@register.simple_tag
+def responsive_img(image, slot, theme='executive', alt='', css_class='', lazy=False):
+    """
+    Renders an <img> for a ResponsiveImage (see CompanyProfile.get_hero_image_set) with its srcset,
+    the theme's sizes hint and intrinsic width/height, so the browser downloads the smallest variant
+    that fills the slot and reserves its space before it arrives. Above-the-fold images are fetched
+    with high priority; pass lazy=True for images further down the page.
+    """
+    attrs = [('src', image.src)]
+    if image.srcset:
+        sizes = THEME_IMAGE_SIZES.get(theme, THEME_IMAGE_SIZES['executive'])[slot]
+        attrs += [('srcset', image.srcset), ('sizes', sizes)]
+    if image.width and image.height:
+        attrs += [('width', image.width), ('height', image.height)]
+    if css_class:
+        attrs.append(('class', css_class))
+    attrs.append(('alt', alt))
+    attrs += [('loading', 'lazy'), ('decoding', 'async')] if lazy else [('fetchpriority', 'high')]
+    return format_html('<img {}>', format_html_join(' ', '{}="{}"', attrs))
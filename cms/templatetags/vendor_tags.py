@@ -0,0 +1,24 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from cms.vendor import VENDOR_ASSETS, is_self_hosted
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_asset(name):
+    """
+    A <link> or <script> for a pinned third-party file (see cms.vendor), served from our own static
+    files once fetch_vendor_assets has run, and from jsDelivr with its integrity hash until then.
+    """
+    asset = VENDOR_ASSETS[name]
+    if is_self_hosted(name):
+        url, integrity = static(asset.path), ''
+    else:
+        url = asset.cdn_url
+        integrity = format_html(' integrity="{}" crossorigin="anonymous"', asset.integrity) if asset.integrity else ''
+    if asset.path.endswith('.js'):
+        return format_html('<script src="{}"{}></script>', url, integrity)
+    return format_html('<link rel="stylesheet" href="{}"{}>', url, integrity)
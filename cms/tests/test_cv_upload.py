@@ -0,0 +1,91 @@
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.urls import clear_url_caches
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context
+from cms.models import CompanyProfile, Job
+from cms.views import apply_to_job
+from customers.models import QueuedEmail
+
+
+class CVUploadTest(TenantTestCase):
+    """
+    Tests the streaming CV upload handler on the apply endpoint.
+    MAX_CV_UPLOAD_SIZE is lowered so the tests don't need multi-megabyte bodies.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'cv_upload_test'
+        tenant.master_email = 'recruiter@cvupload.com'
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'cv-upload.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        self.settings_override = override_settings(
+            MAX_CV_UPLOAD_SIZE=1024,
+            ROOT_URLCONF='recruit_saas.urls_tenant',
+        )
+        self.settings_override.enable()
+        clear_url_caches()
+        with schema_context(self.tenant.schema_name):
+            CompanyProfile.objects.create(tenant_slug=self.tenant.schema_name, display_name='CV Ltd')
+            self.job = Job.objects.create(
+                title='Upload Tester', salary='£30k', location='Hull',
+                summary='Role', description='Details',
+            )
+
+    def _apply(self, cv, **extra):
+        request = RequestFactory().post(f'/jobs/{self.job.pk}/apply/', {'full_name': 'Ada', 'cv': cv}, **extra)
+        request.tenant = self.tenant
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        request._dont_enforce_csrf_checks = True
+        connection.set_tenant(self.tenant)
+        return request, apply_to_job(request, pk=self.job.pk)
+
+    def test_small_cv_is_queued_with_the_email(self):
+        request, response = self._apply(SimpleUploadedFile('cv.pdf', b'x' * 512, content_type='application/pdf'))
+        self.assertEqual(response.status_code, 302)
+        queued = QueuedEmail.objects.get()
+        self.assertEqual(len(queued.attachment_content), 512)
+
+    def test_cv_over_limit_is_rejected_mid_stream(self):
+        request, response = self._apply(
+            SimpleUploadedFile('cv.pdf', b'x' * 4096, content_type='application/pdf'),
+            # Understate the length so only the streaming check can catch it
+            CONTENT_LENGTH='2048',
+        )
+        self.assertTrue(request.cv_upload_rejected)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(QueuedEmail.objects.exists())
+        self.assertIn('File too large', [str(m) for m in get_messages(request)][0])
+
+    def test_oversized_content_length_is_rejected_without_reading_body(self):
+        request, response = self._apply(
+            SimpleUploadedFile('cv.pdf', b'x' * 512, content_type='application/pdf'),
+            CONTENT_LENGTH=str(10 * 1024 * 1024),
+        )
+        self.assertTrue(request.cv_upload_rejected)
+        self.assertEqual(len(request.FILES), 0)
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def tearDown(self):
+        self.settings_override.disable()
+        clear_url_caches()
+        connection.set_schema_to_public()
@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.db import connection
+from django.template import Context, Template
+from django.test import override_settings
+from django_tenants.test.cases import TenantTestCase
+from cms.models import CompanyProfile
+
+
+class FragmentCacheTest(TenantTestCase):
+    """
+    Tests {% cachedfragment %}: cached per schema, orphaned by a CompanyProfile save,
+    and keyed on its own template source and vary_on values.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'fragment_cache_test'
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'fragment-cache.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        cache.clear()
+        connection.set_tenant(self.tenant)
+        self.profile = CompanyProfile.objects.create(tenant_slug=self.tenant.schema_name, display_name='Before')
+
+    def _render(self, source, **context):
+        return Template('{% load fragment_tags %}' + source).render(Context({'profile': self.profile, **context}))
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=60)
+    def test_fragment_is_served_from_cache_until_the_profile_is_saved(self):
+        nav = "{% cachedfragment 'nav' %}{{ profile.display_name }}{% endcachedfragment %}"
+        self.assertEqual(self._render(nav), 'Before')
+
+        # Stale in-memory copy: the cached rendering is reused
+        self.profile.display_name = 'Changed in memory'
+        self.assertEqual(self._render(nav), 'Before')
+
+        self.profile.display_name = 'After'
+        self.profile.save()
+        self.assertEqual(self._render(nav), 'After')
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=60)
+    def test_vary_on_values_and_source_get_their_own_entries(self):
+        footer = "{% cachedfragment 'footer' year %}{{ year }}{% endcachedfragment %}"
+        self.assertEqual(self._render(footer, year=2025), '2025')
+        self.assertEqual(self._render(footer, year=2026), '2026')
+
+        edited = "{% cachedfragment 'footer' year %}&copy; {{ year }}{% endcachedfragment %}"
+        self.assertEqual(self._render(edited, year=2025), '&copy; 2025')
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=60)
+    def test_fragments_are_cached_per_schema(self):
+        nav = "{% cachedfragment 'nav' %}{{ profile.display_name }}{% endcachedfragment %}"
+        self.assertEqual(self._render(nav), 'Before')
+        connection.set_schema_to_public()
+        self.assertEqual(self._render(nav, profile={'display_name': 'Pillar & Post'}), 'Pillar &amp; Post')
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+    def test_disabled_cache_renders_every_time(self):
+        nav = "{% cachedfragment 'nav' %}{{ profile.display_name }}{% endcachedfragment %}"
+        self._render(nav)
+        self.profile.display_name = 'Changed in memory'
+        self.assertEqual(self._render(nav), 'Changed in memory')
+
+    def tearDown(self):
+        cache.clear()
+        connection.set_schema_to_public()
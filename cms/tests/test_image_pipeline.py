@@ -0,0 +1,155 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context
+from PIL import Image
+from cms.forms import CompanyProfileForm
+from cms.images import _decode, _optimised as optimised, optimise_image, process_pending_images, save_profile_form
+from cms.models import CompanyProfile
+from cms.responsive import variant_name
+from customers.models import QueuedImage
+
+
+def _jpeg(width, height, orientation=None):
+    exif = Image.Exif()
+    exif[0x010F] = 'Test Camera'  # Make
+    if orientation:
+        exif[0x0112] = orientation
+    output = io.BytesIO()
+    Image.new('RGB', (width, height), '#336699').save(output, 'JPEG', exif=exif)
+    return output.getvalue()
+
+
+class ImagePipelineTest(TenantTestCase):
+    """
+    Tests that site editor uploads are queued instead of uploaded in the request, and that
+    the worker resizes them, strips their metadata and stores them as WebP.
+    Media goes to a temporary FileSystemStorage instead of Cloudinary.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'image_pipeline_test'
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'image-pipeline.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        self.media_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media_dir,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+        )
+        self.settings_override.enable()
+        with schema_context(self.tenant.schema_name):
+            self.profile = CompanyProfile.objects.create(tenant_slug=self.tenant.schema_name, display_name='Pics Ltd')
+
+    def _save_form(self, **files):
+        data = {
+            'template_choice': 'executive', 'display_name': 'Pics Ltd', 'primary_color': '#0f172a',
+            'secondary_color': '#0f172a', 'background_color': '#ffffff', 'hero_title': 'Hello',
+            'about_title': 'Us',
+        }
+        connection.set_tenant(self.tenant)
+        form = CompanyProfileForm(data, files, instance=self.profile)
+        self.assertTrue(form.is_valid(), form.errors)
+        return save_profile_form(form, self.tenant)
+
+    def test_hero_is_resized_and_stripped(self):
+        image = Image.open(io.BytesIO(optimise_image(io.BytesIO(_jpeg(4000, 1000)), 'hero_image')))
+        self.assertEqual(image.format, 'WEBP')
+        self.assertEqual(image.size, (2560, 640))
+        self.assertFalse(image.getexif())
+
+    def test_large_jpeg_is_decoded_at_a_reduced_scale(self):
+        # Half scale is the smallest that still covers the 1600x1067 the team photo is fitted to
+        image = _decode(io.BytesIO(_jpeg(6000, 4000)), 'team_photo')
+        self.assertEqual(image.size, (3000, 2000))
+
+    def test_logo_is_fitted_to_the_navbar_height_and_turned_upright(self):
+        # Stored 300x100 but tagged "rotate 90", so it displays 100x300
+        image = Image.open(io.BytesIO(optimise_image(io.BytesIO(_jpeg(300, 100, orientation=6)), 'logo')))
+        self.assertEqual(image.size, (27, 80))
+
+    def test_small_images_are_not_upscaled(self):
+        image = Image.open(io.BytesIO(optimise_image(io.BytesIO(_jpeg(200, 50)), 'hero_image')))
+        self.assertEqual(image.size, (200, 50))
+
+    def test_upload_is_queued_and_applied_by_the_worker(self):
+        queued = self._save_form(hero_image=SimpleUploadedFile('beach.jpg', _jpeg(3000, 1500), 'image/jpeg'))
+        self.assertEqual(queued, ['hero_image'])
+        connection.set_schema_to_public()
+
+        pending = QueuedImage.objects.get(tenant=self.tenant)
+        # The worker dyno can't see this one's disk, so the upload travels in the row
+        self.assertEqual(Image.open(io.BytesIO(pending.content)).size, (3000, 1500))
+        with schema_context(self.tenant.schema_name):
+            self.assertFalse(CompanyProfile.objects.get().hero_image)
+
+        self.assertEqual(process_pending_images(), (1, 0))
+        self.assertFalse(QueuedImage.objects.exists())
+        with schema_context(self.tenant.schema_name):
+            hero = CompanyProfile.objects.get().hero_image
+        self.assertTrue(hero.name.startswith('hero/beach') and hero.name.endswith('.webp'))
+        with Image.open(hero.path) as stored:
+            self.assertEqual(stored.size, (2560, 1280))
+        with schema_context(self.tenant.schema_name):
+            image_set = CompanyProfile.objects.get().get_hero_image_set()
+        self.assertEqual((image_set.width, image_set.height), (2560, 1280))
+        # Local storage gets a variant file for every srcset width below the original's
+        self.assertEqual(len(image_set.srcset.split(', ')), 6)
+        with Image.open(os.path.join(self.media_dir, variant_name(hero.name, 800))) as variant:
+            self.assertEqual(variant.size, (800, 400))
+
+    def test_newer_upload_supersedes_a_pending_one(self):
+        self._save_form(logo=SimpleUploadedFile('old.jpg', _jpeg(300, 100), 'image/jpeg'))
+        self._save_form(logo=SimpleUploadedFile('new.jpg', _jpeg(300, 100), 'image/jpeg'))
+        connection.set_schema_to_public()
+        self.assertEqual(list(QueuedImage.objects.values_list('original_name', flat=True)), ['new.jpg'])
+
+    def test_upload_superseded_while_processing_is_not_applied(self):
+        self._save_form(logo=SimpleUploadedFile('old.jpg', _jpeg(300, 100), 'image/jpeg'))
+        connection.set_schema_to_public()
+
+        def superseded(source, field_name):
+            # The row isn't locked while the worker optimises and uploads, so a new save can replace it
+            QueuedImage.objects.all().delete()
+            return optimised(source, field_name)
+
+        with patch('cms.images._optimised', side_effect=superseded):
+            self.assertEqual(process_pending_images(), (1, 0))
+        with schema_context(self.tenant.schema_name):
+            self.assertFalse(CompanyProfile.objects.get().logo)
+        # The files uploaded for it are removed again
+        logos = os.path.join(self.media_dir, 'logos')
+        self.assertFalse(os.path.isdir(logos) and os.listdir(logos))
+
+    def test_unreadable_upload_is_retried(self):
+        self._save_form(team_photo=SimpleUploadedFile('team.jpg', _jpeg(100, 100), 'image/jpeg'))
+        connection.set_schema_to_public()
+        QueuedImage.objects.update(content=b'not an image')
+        self.assertEqual(process_pending_images(), (0, 1))
+        queued = QueuedImage.objects.get()
+        self.assertEqual((queued.status, queued.attempts), ('pending', 1))
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_dir, ignore_errors=True)
+        connection.set_schema_to_public()
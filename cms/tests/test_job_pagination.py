@@ -0,0 +1,83 @@
+from datetime import timedelta
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches
+from django.utils import timezone
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context
+from cms.models import CompanyProfile, Job
+
+
+class JobListPaginationTest(TenantTestCase):
+    """
+    Tests the keyset-paginated public job list, its infinite-scroll feed,
+    and that job cards are loaded without the description column.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'job_pages_test'
+        tenant.is_active = True
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'job-pages.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        clear_url_caches()
+        with schema_context(self.tenant.schema_name):
+            CompanyProfile.objects.create(tenant_slug=self.tenant.schema_name, display_name='Paged Careers')
+            for i in range(5):
+                Job.objects.create(title=f'Role {i}', salary='£1', location='Hull', summary='S', description='Long text')
+            # Two jobs share a timestamp, so the id has to break the tie
+            now = timezone.now()
+            Job.objects.filter(title__in=['Role 1', 'Role 2']).update(created_at=now - timedelta(hours=1))
+            self.expected = list(Job.objects.order_by('-created_at', '-id').values_list('title', flat=True))
+
+    def _feed(self, cursor=''):
+        return self.client.get(f'/jobs/feed/?cursor={cursor}', HTTP_HOST='job-pages.localhost').json()
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant', JOB_PAGE_SIZE=2)
+    def test_feed_walks_every_job_once_in_order(self):
+        seen, cursor, pages = [], '', 0
+        while True:
+            page = self._feed(cursor)
+            pages += 1
+            seen += [title for title in self.expected if f'>{title}<' in page['html']]
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(seen, self.expected)
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant', JOB_PAGE_SIZE=2)
+    def test_job_list_links_to_next_page(self):
+        response = self.client.get('/jobs/', HTTP_HOST='job-pages.localhost')
+        self.assertContains(response, self.expected[0])
+        self.assertNotContains(response, self.expected[2])
+        self.assertContains(response, f'?cursor={response.context["next_cursor"]}')
+
+        response = self.client.get(f'/jobs/?cursor={response.context["next_cursor"]}', HTTP_HOST='job-pages.localhost')
+        self.assertContains(response, self.expected[2])
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant')
+    def test_mangled_cursor_shows_first_page(self):
+        response = self.client.get('/jobs/?cursor=not-a-cursor', HTTP_HOST='job-pages.localhost')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.expected[0])
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant')
+    def test_cards_are_loaded_without_descriptions(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/jobs/', HTTP_HOST='job-pages.localhost')
+        job_queries = [q['sql'] for q in ctx.captured_queries if 'FROM "cms_job"' in q['sql']]
+        self.assertTrue(job_queries)
+        self.assertFalse([sql for sql in job_queries if '"description"' in sql])
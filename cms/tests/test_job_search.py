@@ -0,0 +1,98 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches
+from django_tenants.test.cases import TenantTestCase
+from cms.models import CompanyProfile, Job
+from cms.search import search_jobs
+
+
+class JobSearchTest(TenantTestCase):
+    """
+    Tests the trigger-maintained full-text search, its facets and highlighted snippets.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'job_search_test'
+        tenant.is_active = True
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'job-search.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        clear_url_caches()
+        connection.set_tenant(self.tenant)
+        CompanyProfile.objects.create(tenant_slug=self.tenant.schema_name, display_name='Search Careers')
+        self.engineer = Job.objects.create(
+            title='Python Engineer', salary='£55k - £65k', location='Leeds',
+            summary='Backend role', description='Build Django services for R&D clients.',
+        )
+        self.analyst = Job.objects.create(
+            title='Data Analyst', salary='£28,000', location='York',
+            summary='Reporting role', description='Some Python scripting for reports.',
+        )
+        self.manager = Job.objects.create(
+            title='Office Manager', salary='Competitive', location='Leeds',
+            summary='Keep things running', description='Supplies and scheduling.',
+        )
+
+    def test_title_matches_rank_above_description_matches(self):
+        search = search_jobs('python')
+        self.assertEqual([job.pk for job in search['results']], [self.engineer.pk, self.analyst.pk])
+        self.assertEqual(search['total'], 2)
+
+    def test_vector_follows_updates(self):
+        self.manager.description = 'Python fan welcome'
+        self.manager.save()
+        self.assertIn(self.manager.pk, [job.pk for job in search_jobs('python')['results']])
+
+    def test_facets_come_from_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            search = search_jobs()
+        self.assertEqual(len([q for q in ctx.captured_queries if 'GROUPING SETS' in q['sql']]), 1)
+        self.assertEqual(search['locations'], [('Leeds', 2), ('York', 1)])
+        self.assertEqual(
+            search['salary_bands'],
+            [('under-30k', 'Under 30k', 1), ('50k-80k', '50k - 80k', 1), ('unspecified', 'Not stated', 1)],
+        )
+
+    def test_facet_filters_narrow_results_but_not_facets(self):
+        search = search_jobs(location='Leeds', band='50k-80k')
+        self.assertEqual([job.pk for job in search['results']], [self.engineer.pk])
+        self.assertEqual(search['total'], 1)
+        self.assertEqual(len(search['locations']), 2)
+
+    def test_absurdly_long_salary_lands_in_the_top_band(self):
+        """More digits than an integer holds must not break the search page."""
+        Job.objects.create(
+            title='Typo Role', salary='£' + '9' * 60, location='Hull',
+            summary='Role', description='Details',
+        )
+        search = search_jobs(band='80k-plus')
+        self.assertEqual([job.title for job in search['results']], ['Typo Role'])
+
+    def test_snippets_highlight_matches_and_escape_job_text(self):
+        snippet = search_jobs('django')['results'][0].snippet
+        self.assertIn('<mark>Django</mark>', snippet)
+        self.assertIn('R&amp;D', snippet)
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant')
+    def test_search_page_renders(self):
+        connection.set_schema_to_public()
+        response = self.client.get('/jobs/search/?q=python&location=Leeds', HTTP_HOST='job-search.localhost')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Python Engineer')
+        self.assertNotContains(response, 'Data Analyst')
+        self.assertContains(response, '?q=python&amp;location=York')
+
+    def tearDown(self):
+        connection.set_schema_to_public()
@@ -0,0 +1,124 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches
+from django.contrib.auth.models import User
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context
+from cms.models import CompanyProfile, Job
+from cms.page_cache import bump_page_version
+
+
+def _cms_queries(queries):
+    return [q for q in queries if '"cms_' in q['sql']]
+
+
+class PublicPageCacheTest(TenantTestCase):
+    """
+    Tests the full-page cache on the public tenant pages and its save-driven invalidation.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'page_cache_test'
+        tenant.is_active = True
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'page-cache.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        clear_url_caches()
+        bump_page_version(self.tenant.schema_name)
+        with schema_context(self.tenant.schema_name):
+            self.profile = CompanyProfile.objects.create(
+                tenant_slug=self.tenant.schema_name,
+                display_name='Cached Careers',
+            )
+            self.job = Job.objects.create(
+                title='Cached Engineer', salary='£50k', location='Leeds',
+                summary='Role', description='Details',
+            )
+
+    def _get(self, path):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path, HTTP_HOST='page-cache.localhost')
+        return response, _cms_queries(ctx.captured_queries)
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant', PAGE_CACHE_TIMEOUT=60)
+    def test_second_anonymous_visit_is_served_from_cache(self):
+        first, first_queries = self._get('/jobs/')
+        second, second_queries = self._get('/jobs/')
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first_queries)
+        self.assertEqual(second_queries, [])
+        self.assertEqual(first.content, second.content)
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant', PAGE_CACHE_TIMEOUT=60)
+    def test_unused_query_parameters_share_the_cached_page(self):
+        """Tracking tags or random cache busters must not mint a new entry per request."""
+        self._get('/jobs/')
+        _, queries = self._get('/jobs/?utm_source=linkedin&x=12345')
+        self.assertEqual(queries, [])
+        _, queries = self._get('/jobs/?cursor=not-a-cursor')
+        self.assertTrue(queries)
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant', PAGE_CACHE_TIMEOUT=60)
+    def test_saving_a_job_purges_cached_pages(self):
+        self._get('/jobs/')
+        with schema_context(self.tenant.schema_name):
+            self.job.title = 'Renamed Engineer'
+            self.job.save()
+        response, queries = self._get('/jobs/')
+        self.assertTrue(queries)
+        self.assertContains(response, 'Renamed Engineer')
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant', PAGE_CACHE_TIMEOUT=60)
+    def test_saving_the_profile_purges_cached_pages(self):
+        self._get('/about/')
+        with schema_context(self.tenant.schema_name):
+            self.profile.display_name = 'Rebranded Careers'
+            self.profile.save()
+        response, _ = self._get('/about/')
+        self.assertContains(response, 'Rebranded Careers')
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant', PAGE_CACHE_TIMEOUT=60)
+    def test_authenticated_users_bypass_the_cache(self):
+        self._get('/about/')
+        with schema_context(self.tenant.schema_name):
+            user = User.objects.create_user(username='recruiter@cache.com', password='password')
+            # Requests end on the public schema, so log in where the tenant's sessions live
+            self.client.force_login(user)
+        _, queries = self._get('/about/')
+        self.assertTrue(queries)
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant', PAGE_CACHE_TIMEOUT=60)
+    def test_job_detail_is_cached_for_visitors_without_a_csrf_cookie(self):
+        """The apply form gets its token on the client, so first-time visitors share one cached page."""
+        path = f'/jobs/{self.job.pk}/'
+        self.client.cookies.clear()
+        first, _ = self._get(path)
+        self.client.cookies.clear()
+        second, queries = self._get(path)
+        self.assertEqual(queries, [])
+        self.assertNotIn('csrftoken', second.cookies)
+        self.assertContains(second, 'name="csrfmiddlewaretoken" value=""')
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant')
+    def test_csrf_endpoint_sets_cookie_and_returns_token(self):
+        self.client.cookies.clear()
+        response = self.client.get('/csrf/', HTTP_HOST='page-cache.localhost')
+        self.assertIn('csrftoken', response.cookies)
+        self.assertTrue(response.json()['token'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def tearDown(self):
+        bump_page_version(self.tenant.schema_name)
+        connection.set_schema_to_public()
@@ -0,0 +1,99 @@
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.urls import clear_url_caches
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import AnonymousUser, User
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context
+from cms.models import CompanyProfile
+from cms.profile_cache import load_profile, invalidate_profile
+from cms.views import edit_site, home
+
+
+def _profile_queries(queries):
+    return [q for q in queries if 'cms_companyprofile' in q['sql']]
+
+
+class ProfileCacheTest(TenantTestCase):
+    """
+    Tests that the CompanyProfile is loaded once per request and shared
+    between the views and the tenant_profile context processor.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'profile_cache_test'
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'profile-cache.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        super().setUp()
+        clear_url_caches()
+        self.factory = RequestFactory()
+        invalidate_profile(self.tenant.schema_name)
+        with schema_context(self.tenant.schema_name):
+            self.profile = CompanyProfile.objects.create(
+                tenant_slug=self.tenant.schema_name,
+                display_name='Cache Corp',
+            )
+
+    def _request(self):
+        request = self.factory.get('/', HTTP_HOST='profile-cache.localhost')
+        request.tenant = self.tenant
+        request.user = AnonymousUser()
+        # Mirror CustomTenantMiddleware, which points the connection at the tenant schema
+        connection.set_tenant(self.tenant)
+        return request
+
+    def test_profile_loaded_once_per_request(self):
+        request = self._request()
+        with CaptureQueriesContext(connection) as ctx:
+            first = load_profile(request)
+            second = load_profile(request)
+        self.assertIs(first, second)
+        self.assertEqual(len(_profile_queries(ctx.captured_queries)), 1)
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant')
+    def test_home_page_queries_profile_once(self):
+        """The view and the context processor must share a single profile query."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = home(self._request())
+        self.assertContains(response, 'Cache Corp')
+        self.assertEqual(len(_profile_queries(ctx.captured_queries)), 1)
+
+    @override_settings(PROFILE_CACHE_TIMEOUT=60)
+    def test_cross_request_cache_is_invalidated_on_save(self):
+        load_profile(self._request())
+        with CaptureQueriesContext(connection) as ctx:
+            load_profile(self._request())
+        self.assertEqual(len(_profile_queries(ctx.captured_queries)), 0)
+
+        with schema_context(self.tenant.schema_name):
+            self.profile.display_name = 'Renamed Corp'
+            self.profile.save()
+        self.assertEqual(load_profile(self._request()).display_name, 'Renamed Corp')
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant')
+    def test_invalid_edit_leaves_the_shared_profile_alone(self):
+        """The nav and branding on the re-rendered editor show the saved profile, not the rejected post."""
+        request = self.factory.post('/dashboard/edit/', {'display_name': 'Unsaved Corp', 'template_choice': 'nope'})
+        request.tenant = self.tenant
+        connection.set_tenant(self.tenant)
+        request.user = User.objects.create_user(username='editor@cache.com', password='password')
+        response = edit_site(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(load_profile(request).display_name, 'Cache Corp')
+
+    def tearDown(self):
+        invalidate_profile(self.tenant.schema_name)
+        connection.set_schema_to_public()
+        super().tearDown()
@@ -0,0 +1,60 @@
+from unittest import mock
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+from cms.models import CompanyProfile
+from cms.responsive import ResponsiveImage, stored_image
+
+
+class ResponsiveImageTest(SimpleTestCase):
+    """
+    Tests the srcset helpers and the responsive_img tag. Nothing is read from the database,
+    so the FieldFiles are built on unsaved profiles.
+    """
+
+    def _render(self, image, **kwargs):
+        args = ' '.join(f'{key}={key}' for key in kwargs)
+        template = Template("{% load image_tags %}{% responsive_img image 'hero_image' theme " + args + " %}")
+        return template.render(Context({'image': image, 'theme': 'executive', **kwargs}))
+
+    def test_cloudinary_images_use_transformation_urls(self):
+        profile = CompanyProfile(hero_image='hero/beach.webp', hero_image_width=1000, hero_image_height=500)
+        url = 'https://res.cloudinary.com/demo/image/upload/v1/media/hero/beach.webp'
+        with mock.patch('cms.responsive.resizes_by_url', return_value=True), \
+                mock.patch.object(type(profile.hero_image), 'url', new_callable=mock.PropertyMock, return_value=url):
+            image = profile.get_hero_image_set()
+        self.assertEqual(image.srcset, ', '.join([
+            'https://res.cloudinary.com/demo/image/upload/c_limit,w_480/v1/media/hero/beach.webp 480w',
+            'https://res.cloudinary.com/demo/image/upload/c_limit,w_800/v1/media/hero/beach.webp 800w',
+            f'{url} 1000w',
+        ]))
+
+    @override_settings(STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }, MEDIA_URL='/media/')
+    def test_local_images_get_variant_urls_when_their_size_is_known(self):
+        profile = CompanyProfile(team_photo='team/office.webp')
+        self.assertEqual(stored_image(profile.team_photo).srcset, '')
+        image = stored_image(profile.team_photo, 900, 600)
+        self.assertEqual(image.srcset, '/media/team/office-480w.webp 480w, /media/team/office-800w.webp 800w, '
+                                       '/media/team/office.webp 900w')
+
+    def test_default_hero_has_its_intrinsic_size(self):
+        image = CompanyProfile(template_choice='boutique').get_hero_image_set()
+        self.assertTrue(image.src.endswith('marketing/images/default_boutique.webp'))
+        self.assertTrue(image.width and image.height)
+
+    def test_hero_tag_is_eager_with_sizes_and_dimensions(self):
+        html = self._render(ResponsiveImage('/h.webp', '/h-480w.webp 480w, /h.webp 960w', 960, 480), alt='Hero')
+        self.assertIn('srcset="/h-480w.webp 480w, /h.webp 960w"', html)
+        self.assertIn('sizes="(min-width: 1400px) 526px, (min-width: 1200px) 451px, '
+                      '(min-width: 992px) 376px, calc(100vw - 24px)"', html)
+        self.assertIn('width="960" height="480"', html)
+        self.assertIn('fetchpriority="high"', html)
+        self.assertNotIn('loading=', html)
+
+    def test_lazy_tag_escapes_alt_text(self):
+        html = self._render(ResponsiveImage('/t.webp', '', None, None), alt='"Team" <b>', lazy=True)
+        self.assertIn('alt="&quot;Team&quot; &lt;b&gt;"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertNotIn('srcset', html)
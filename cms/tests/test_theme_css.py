@@ -0,0 +1,101 @@
+from django.db import connection
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+from django.urls import clear_url_caches
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.test.client import TenantClient
+from unittest import mock
+from cms.models import CompanyProfile
+from cms.theme import minify_css, theme_bundle
+
+
+class ThemeStylesheetTest(TenantTestCase):
+    """
+    Tests the per-tenant theme bundle: its content-addressed URL, immutable caching,
+    and that the brand colours moved out of the page HTML.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'theme_css_test'
+        tenant.is_active = True
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'theme-css.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        clear_url_caches()
+        connection.set_tenant(self.tenant)
+        self.profile = CompanyProfile.objects.create(
+            tenant_slug=self.tenant.schema_name, display_name='Theme Co', template_choice='boutique',
+            primary_color='#123456',
+        )
+        self.client = TenantClient(self.tenant)
+
+    def test_bundle_holds_theme_css_and_brand_colours(self):
+        css, digest = theme_bundle(self.profile)
+        self.assertIn('.theme-boutique .about-image', css)
+        self.assertTrue(css.endswith('body.theme-boutique{--brand-primary:#123456;--brand-secondary:#0f172a;--brand-bg:#ffffff}'))
+        self.assertNotIn('/*', css)
+
+        self.profile.primary_color = '#654321'
+        self.assertNotEqual(theme_bundle(self.profile)[1], digest)
+
+    def test_colours_that_are_not_hex_are_replaced_by_defaults(self):
+        self.profile.primary_color = 'red}*{'
+        self.assertIn('--brand-primary:#0f172a;', theme_bundle(self.profile)[0])
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant')
+    def test_stylesheet_is_served_immutable(self):
+        digest = self.profile.theme_digest
+        response = self.client.get(f'/theme-{digest}.css')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/css; charset=utf-8')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+        stale = self.client.get('/theme-0000000000000000.css')
+        self.assertRedirects(stale, f'/theme-{digest}.css', fetch_redirect_response=False)
+        self.assertNotIn('immutable', stale.get('Cache-Control', ''))
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_tenant')
+    def test_page_links_the_bundle_instead_of_inlining_colours(self):
+        response = self.client.get('/')
+        self.assertContains(response, f'href="/theme-{self.profile.theme_digest}.css"')
+        self.assertNotContains(response, '<style>')
+
+    def tearDown(self):
+        clear_url_caches()
+        connection.set_schema_to_public()
+
+
+class VendorAssetTest(SimpleTestCase):
+    def _render(self, name):
+        return Template("{% load vendor_tags %}{% vendor_asset name %}").render(Context({'name': name}))
+
+    def test_minify_keeps_spaces_that_matter(self):
+        self.assertEqual(
+            minify_css('/* note */\n.a  > .b ,\n.c {\n  width: calc(100% - 24px);\n}\n'),
+            '.a>.b,.c{width:calc(100% - 24px)}',
+        )
+
+    def test_self_hosted_asset_uses_static_url(self):
+        with mock.patch('cms.templatetags.vendor_tags.is_self_hosted', return_value=True):
+            self.assertEqual(
+                self._render('bootstrap.js'),
+                '<script src="/static/vendor/bootstrap-5.3.2/js/bootstrap.bundle.min.js"></script>',
+            )
+
+    def test_missing_asset_falls_back_to_the_cdn_with_integrity(self):
+        with mock.patch('cms.templatetags.vendor_tags.is_self_hosted', return_value=False):
+            html = self._render('bootstrap.css')
+        self.assertIn('href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css"', html)
+        self.assertIn('integrity="sha384-', html)
@@ -0,0 +1,61 @@
+import hashlib
+import re
+from functools import lru_cache
+
+from django.contrib.staticfiles import finders
+
+THEME_SOURCE = 'cms/css/tenant_themes.css'
+
+DEFAULT_COLORS = {
+    'primary_color': '#0f172a',
+    'secondary_color': '#0f172a',
+    'background_color': '#ffffff',
+}
+_HEX_COLOR = re.compile(r'#[0-9a-fA-F]{6}')
+
+
+def minify_css(css):
+    """Drops comments and the whitespace CSS doesn't need; values such as calc(100vw - 24px) keep theirs."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+@lru_cache(maxsize=None)
+def base_css():
+    """The shared theme stylesheet, minified once per process (a deploy that changes it starts new processes)."""
+    with open(finders.find(THEME_SOURCE), encoding='utf-8') as source:
+        return minify_css(source.read())
+
+
+def _color(profile, field_name):
+    value = getattr(profile, field_name) or ''
+    # Anything but a plain hex colour could break out of the rule
+    return value if _HEX_COLOR.fullmatch(value) else DEFAULT_COLORS[field_name]
+
+
+@lru_cache(maxsize=1024)
+def _bundle(theme, primary, secondary, background):
+    css = (
+        f"{base_css()}body.theme-{theme}"
+        f"{{--brand-primary:{primary};--brand-secondary:{secondary};--brand-bg:{background}}}"
+    )
+    return css, hashlib.sha256(css.encode()).hexdigest()[:16]
+
+
+def theme_bundle(profile):
+    """
+    The tenant's stylesheet (the shared theme CSS plus its brand colours) and its content digest.
+    The digest goes in the stylesheet's URL, so the file can be cached for good: saving new
+    colours, or deploying a new tenant_themes.css, gives it a new URL.
+    """
+    choices = {choice for choice, _ in profile.TEMPLATE_CHOICES}
+    theme = profile.template_choice if profile.template_choice in choices else 'executive'
+    return _bundle(
+        theme,
+        _color(profile, 'primary_color'),
+        _color(profile, 'secondary_color'),
+        _color(profile, 'background_color'),
+    )
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.files.uploadhandler import StopUpload, TemporaryFileUploadHandler
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+
+# Room for the form fields and multipart boundaries around the CV itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class CVUploadHandler(TemporaryFileUploadHandler):
+    """
+    Upload handler for job applications.
+    Spools the CV to a temp file instead of memory, and stops storing the upload as soon as
+    the declared Content-Length or the received bytes go over MAX_CV_UPLOAD_SIZE. A body that
+    claims to fit but doesn't is drained rather than reset, so the candidate gets the form's
+    error page; the Content-Length check keeps what is drained bounded.
+    Sets request.cv_upload_rejected so the view can tell the candidate why.
+    """
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'MAX_CV_UPLOAD_SIZE', 5 * 1024 * 1024)
+
+    def _reject(self):
+        self.request.cv_upload_rejected = True
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if content_length > self.max_size + MULTIPART_OVERHEAD:
+            # Claim the parse with empty data so the body is never read
+            self._reject()
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return super().handle_raw_input(input_data, META, content_length, boundary, encoding)
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            self._reject()
+            raise StopUpload(connection_reset=False)
+        return super().receive_data_chunk(raw_data, start)
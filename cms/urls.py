@@ -6,6 +6,7 @@ app_name = 'cms'
 urlpatterns = [
     path('', views.home, name='home'),
     path('about/', views.about, name='about'),
+    path('theme-<str:digest>.css', views.theme_stylesheet, name='theme_css'),
     # Dashboard & Site Editing
     path('dashboard/', views.dashboard, name='dashboard'),
     path('dashboard/edit/', views.edit_site, name='edit_site'),
@@ -15,8 +16,11 @@ urlpatterns = [
     path('dashboard/jobs/add/', views.add_job, name='add_job'),
     # Public Job Listings
     path('jobs/', views.public_job_list, name='job_list'), 
+    path('jobs/feed/', views.public_job_feed, name='job_feed'),
+    path('jobs/search/', views.public_job_search, name='job_search'),
     path('jobs/<int:pk>/', views.public_job_detail, name='public_job_detail'),
     path('jobs/<int:pk>/apply/', views.apply_to_job, name='apply_to_job'),
+    path('csrf/', views.csrf_token, name='csrf_token'),
     path('application-success/', views.application_success, name='application_success'),
     # Live Preview for Tenants
     path('preview/', views.live_preview, name='live_preview'),
@@ -0,0 +1,48 @@
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+
+# Where fetch_vendor_assets puts the files: the cms app's static directory, under vendor/
+VENDOR_ROOT = Path(__file__).resolve().parent / 'static'
+
+# A third-party file served by WhiteNoise. `path` is its static path, with the version in the
+# directory name so WHITENOISE_IMMUTABLE_FILE_TEST can cache it for good; `integrity` is its
+# Subresource Integrity hash where the project publishes one.
+VendorAsset = namedtuple('VendorAsset', 'path cdn_url integrity')
+
+VENDOR_ASSETS = {
+    'bootstrap.css': VendorAsset(
+        'vendor/bootstrap-5.3.2/css/bootstrap.min.css',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css',
+        'sha384-T3c6CoIi6uLrA9TneNEoa7RxnatzjcDSCmG1MXxSR1GAsXEV/Dwwykc2MPK8M2HN',
+    ),
+    'bootstrap.js': VendorAsset(
+        'vendor/bootstrap-5.3.2/js/bootstrap.bundle.min.js',
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js',
+        'sha384-C6RzsynM9kWDrMNeT87bh95OGNyZPhcTNXj1NW7RuBCsyN/o0jlpcV8Qyq46cDfL',
+    ),
+    'bootstrap-icons.css': VendorAsset(
+        'vendor/bootstrap-icons-1.11.3/font/bootstrap-icons.min.css',
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css',
+        None,
+    ),
+    # Loaded by bootstrap-icons.min.css from fonts/ next to it
+    'bootstrap-icons.woff2': VendorAsset(
+        'vendor/bootstrap-icons-1.11.3/font/fonts/bootstrap-icons.woff2',
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/fonts/bootstrap-icons.woff2',
+        None,
+    ),
+    'bootstrap-icons.woff': VendorAsset(
+        'vendor/bootstrap-icons-1.11.3/font/fonts/bootstrap-icons.woff',
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/fonts/bootstrap-icons.woff',
+        None,
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def is_self_hosted(name):
+    """True once fetch_vendor_assets has put the file among the static files."""
+    return finders.find(VENDOR_ASSETS[name].path) is not None
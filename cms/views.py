@@ -1,31 +1,62 @@
+import copy
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.clickjacking import xframe_options_exempt
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_exempt, csrf_protect, ensure_csrf_cookie
+from django.middleware.csrf import get_token
 from django.contrib import messages
 from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
 
-from .models import CompanyProfile, Job
+from .models import Job
 from .forms import CompanyProfileForm, JobForm
+from .images import save_profile_form
+from .profile_cache import load_profile
+from .page_cache import cache_public_page
+from .pagination import paginate_newest_first
+from .search import search_jobs
+from .theme import theme_bundle
+from .uploadhandlers import CVUploadHandler
 
-from cloudinary.exceptions import BadRequest
+from customers.outbox import enqueue_email
 
 
 def get_profile(request):
-    """Reliably fetches the profile created by TenantService during onboarding."""
-    return get_object_or_404(CompanyProfile, tenant_slug=request.tenant.schema_name)
+    """Reliably fetches the profile created by TenantService during onboarding (shared with the context processor)."""
+    profile = load_profile(request)
+    if profile is None:
+        raise Http404("No CompanyProfile for this tenant.")
+    return profile
 
 
+@cache_public_page("cms/home.html")
 def home(request):
     """The main public landing page."""
     profile = get_profile(request)
     return render(request, "cms/home.html", {'profile': profile})
 
 
+@cache_public_page("cms/about.html")
 def about(request):
     profile = get_profile(request)
     return render(request, "cms/about.html", {'profile': profile})
 
 
+def theme_stylesheet(request, digest):
+    """The tenant's theme CSS bundle. Its URL changes with its content, so browsers keep it for a year."""
+    css, current = theme_bundle(get_profile(request))
+    if digest != current:
+        # A page cached before the colours changed: send it to the current bundle, which may be cached
+        return redirect('cms:theme_css', digest=current)
+    response = HttpResponse(css, content_type='text/css; charset=utf-8')
+    patch_cache_control(response, public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+    return response
+
+
 @login_required
 def dashboard(request):
     tenant = request.tenant
@@ -46,21 +77,24 @@ def dashboard(request):
 @login_required
 def edit_site(request):
     """
-    Site Editor: Maintains all preview logic, prevents MultipleObjectsReturned,
-    and catches Cloudinary 'File Too Large' errors.
+    Site Editor: Maintains all preview logic and prevents MultipleObjectsReturned.
+    New images are queued for the process_images worker instead of uploaded here.
     """
     profile = get_profile(request)
 
     if request.method == 'POST':
-        form = CompanyProfileForm(request.POST, request.FILES, instance=profile)
+        # The form gets its own copy: validation writes the posted values onto its instance, and the
+        # shared profile still drives the nav and branding if the page is shown again with errors
+        form = CompanyProfileForm(request.POST, request.FILES, instance=copy.copy(profile))
         if form.is_valid():
             try:
-                form.save()
-                messages.success(request, "Site updated successfully!")
+                queued = save_profile_form(form, request.tenant)
+                if queued:
+                    messages.success(request, "Site updated! New images will appear shortly, once they've been optimised.")
+                else:
+                    messages.success(request, "Site updated successfully!")
                 return redirect('cms:edit_site')
-            except BadRequest as e:
-                messages.error(request, "Upload failed: Image is too large (Max 10MB). Please resize and try again.")
-            except Exception as e:
+            except Exception:
                 messages.error(request, "A server error occurred during the upload.")
     else:
         form = CompanyProfileForm(instance=profile)
@@ -98,8 +132,12 @@ def payment_cancel(request):
 @login_required
 def manage_jobs(request):
     """The private dashboard area where tenants see their list of jobs."""
-    jobs = Job.objects.all().order_by('-created_at')
-    return render(request, 'cms/manage_jobs.html', {'jobs': jobs})
+    jobs = paginate_newest_first(Job.objects.defer('description'), request.GET.get('cursor'), settings.JOB_PAGE_SIZE)
+    return render(request, 'cms/manage_jobs.html', {
+        'jobs': jobs,
+        'job_count': Job.objects.count(),
+        'next_cursor': jobs.next_cursor,
+    })
 
 
 @login_required
@@ -150,15 +188,52 @@ def delete_job(request, pk):
 
 # --- PUBLIC FACING VIEWS ---
 
+@cache_public_page("cms/job_list.html", query_params=('cursor',))
 def public_job_list(request):
     profile = get_profile(request)
-    jobs = Job.objects.all().order_by('-created_at') 
+    jobs = paginate_newest_first(Job.objects.only(*Job.CARD_FIELDS), request.GET.get('cursor'), settings.JOB_PAGE_SIZE)
     return render(request, "cms/job_list.html", {
         'profile': profile, 
-        'jobs': jobs
+        'jobs': jobs,
+        'next_cursor': jobs.next_cursor,
     })
 
 
+@cache_public_page("cms/job_cards.html", query_params=('cursor',))
+def public_job_feed(request):
+    """The next page of job cards for infinite scroll, as {"html": ..., "next_cursor": ...}."""
+    jobs = paginate_newest_first(Job.objects.only(*Job.CARD_FIELDS), request.GET.get('cursor'), settings.JOB_PAGE_SIZE)
+    return JsonResponse({
+        'html': render_to_string("cms/job_cards.html", {'jobs': jobs}, request=request),
+        'next_cursor': jobs.next_cursor,
+    })
+
+
+@cache_public_page("cms/job_search.html", query_params=('q', 'location', 'salary', 'page'))
+def public_job_search(request):
+    """Ranked full-text job search with location and salary band facets."""
+    profile = get_profile(request)
+    query = request.GET.get('q', '').strip()[:200]
+    location = request.GET.get('location', '')
+    salary = request.GET.get('salary', '')
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+    per_page = settings.JOB_PAGE_SIZE
+    search = search_jobs(query, location, salary, offset=(page - 1) * per_page, limit=per_page)
+    return render(request, "cms/job_search.html", {
+        'profile': profile,
+        'query': query,
+        'location': location,
+        'salary': salary,
+        'page': page,
+        'has_next': page * per_page < search['total'],
+        **search,
+    })
+
+
+@cache_public_page("cms/public_job_detail.html")
 def public_job_detail(request, pk):
     job = get_object_or_404(Job, pk=pk)
     profile = get_profile(request)
@@ -168,7 +243,30 @@ def public_job_detail(request, pk):
     })
 
 
+@never_cache
+@ensure_csrf_cookie
+def csrf_token(request):
+    """The visitor's CSRF token, for forms on cached pages that can't carry one (see cms/js/csrf-field.js)."""
+    return JsonResponse({'token': get_token(request)})
+
+
+@csrf_exempt
 def apply_to_job(request, pk):
+    """
+    Installs the CV upload handler before anything reads the body, then checks the
+    CSRF token as usual. Oversized uploads are turned away before the rest is received.
+    """
+    if request.method == 'POST':
+        request.upload_handlers = [CVUploadHandler(request)]
+        request.POST  # parse now, the rejection needs no token as nothing is saved
+        if getattr(request, 'cv_upload_rejected', False):
+            messages.error(request, "File too large. Please upload a CV smaller than 5MB.")
+            return redirect('cms:public_job_detail', pk=pk)
+    return _apply_to_job(request, pk)
+
+
+@csrf_protect
+def _apply_to_job(request, pk):
     """Handles the application email trigger with safety checks."""
     job = get_object_or_404(Job, pk=pk)
     profile = get_profile(request)
@@ -201,23 +299,20 @@ def apply_to_job(request, pk):
             f"The candidate's CV is attached."
         )
 
-        from django.core.mail import EmailMessage
-        email_msg = EmailMessage(
-            subject=f"New Application: {job.title} - {candidate_name}",
-            body=email_body,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=recipients,
-            reply_to=[candidate_email] if candidate_email else None
-        )
-
-        if cv_file:
-            if cv_file.size > 5 * 1024 * 1024:
-                messages.error(request, "File too large. Please upload a CV smaller than 5MB.")
-                return redirect('cms:public_job_detail', pk=pk)
-            email_msg.attach(cv_file.name, cv_file.read(), cv_file.content_type)
+        if cv_file and cv_file.size > settings.MAX_CV_UPLOAD_SIZE:
+            messages.error(request, "File too large. Please upload a CV smaller than 5MB.")
+            return redirect('cms:public_job_detail', pk=pk)
 
+        # Queued for the process_outbox worker so a slow SMTP relay never holds up the candidate
         try:
-            email_msg.send(fail_silently=False)
+            enqueue_email(
+                subject=f"New Application: {job.title} - {candidate_name}",
+                body=email_body,
+                to=recipients,
+                reply_to=[candidate_email] if candidate_email else None,
+                tenant=request.tenant,
+                attachment=cv_file,
+            )
             messages.success(request, "Your application has been sent successfully!")
             return redirect('cms:application_success')
         except Exception as e:
@@ -1,7 +1,52 @@
 from django.contrib import admin
-from django_tenants.utils import schema_context
-from .models import Client
-from cms.models import Job 
+from django.contrib.admin.views.main import ChangeList
+from django.db import connection
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+from django_tenants.utils import schema_context, get_public_schema_name
+from .models import Client, Domain, PooledSchema, QueuedEmail, QueuedImage, RequestProfile, StripeEvent
+from cms.models import Job
+from recruit_saas.request_profiler import TOKEN_PARAM, make_token
+
+
+def _quote(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+def job_counts(schema_names):
+    """
+    Counts the jobs in each schema with a single UNION ALL query.
+    Schemas whose cms_job table doesn't exist yet (not migrated) are left out.
+    """
+    if not schema_names:
+        return {}
+    table = Job._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT table_schema FROM information_schema.tables WHERE table_name = %s AND table_schema = ANY(%s)",
+            [table, list(schema_names)],
+        )
+        migrated = [row[0] for row in cursor.fetchall()]
+        if not migrated:
+            return {}
+        cursor.execute(
+            " UNION ALL ".join(f"SELECT %s, COUNT(*) FROM {_quote(schema)}.{_quote(table)}" for schema in migrated),
+            migrated,
+        )
+        return dict(cursor.fetchall())
+
+
+class ClientChangeList(ChangeList):
+    """Fetches the job counts for the whole page at once instead of hopping into each schema."""
+    def get_results(self, request):
+        super().get_results(request)
+        public = get_public_schema_name()
+        counts = job_counts([c.schema_name for c in self.result_list if c.schema_name != public])
+        for client in self.result_list:
+            client.job_total = counts.get(client.schema_name, 0)
 
 
 @admin.register(Client)
@@ -9,16 +54,88 @@ class ClientAdmin(admin.ModelAdmin):
     list_display = ("name", "get_domain", "plan", "job_count", "trial_ends", "is_active", "schema_name")
     search_fields = ("name", "schema_name")
 
+    def get_changelist(self, request, **kwargs):
+        return ClientChangeList
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related(
+            Prefetch('domains', queryset=Domain.objects.filter(is_primary=True), to_attr='primary_domains')
+        )
+
     def job_count(self, obj):
-        """Hops into the tenant schema to count how many jobs they have posted."""
+        """Job total filled in by ClientChangeList; hops into the tenant schema if it's missing."""
         if obj.schema_name == 'public':
             return "N/A"
+        if hasattr(obj, 'job_total'):
+            return obj.job_total
         with schema_context(obj.schema_name):
             return Job.objects.count()
     job_count.short_description = "Jobs Posted"
 
     def get_domain(self, obj):
         """Retrieves the primary domain associated with the tenant."""
-        domain_obj = obj.domains.filter(is_primary=True).first()
+        if hasattr(obj, 'primary_domains'):
+            domain_obj = obj.primary_domains[0] if obj.primary_domains else None
+        else:
+            domain_obj = obj.domains.filter(is_primary=True).first()
         return domain_obj.domain if domain_obj else "No Domain"
     get_domain.short_description = "Domain"
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "tenant", "status", "attempts", "next_attempt_at", "created_at")
+    list_filter = ("status",)
+    readonly_fields = ("last_error",)
+
+
+@admin.register(QueuedImage)
+class QueuedImageAdmin(admin.ModelAdmin):
+    list_display = ("original_name", "field_name", "tenant", "status", "attempts", "next_attempt_at", "created_at")
+    list_filter = ("status", "field_name")
+    readonly_fields = ("last_error",)
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = ("event_id", "type", "customer_id", "status", "attempts", "next_attempt_at", "created", "processed_at")
+    list_filter = ("status", "type")
+    search_fields = ("event_id", "customer_id")
+    readonly_fields = ("payload", "last_error")
+
+
+@admin.register(PooledSchema)
+class PooledSchemaAdmin(admin.ModelAdmin):
+    list_display = ("schema_name", "fingerprint", "created_at")
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "tenant", "view_name", "method", "path", "status_code", "duration_ms", "download")
+    list_filter = ("tenant", "view_name", "format")
+    search_fields = ("path", "request_id")
+    exclude = ("data",)
+    readonly_fields = [f.name for f in RequestProfile._meta.fields if f.name != "data"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        return [
+            path("<int:pk>/download/", self.admin_site.admin_view(self.download_view), name="customers_requestprofile_download"),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        extension = "prof" if profile.format == "pstats" else "html"
+        response = HttpResponse(bytes(profile.data), content_type="application/octet-stream")
+        response["Content-Disposition"] = f'attachment; filename="{profile.request_id}.{extension}"'
+        return response
+
+    def download(self, obj):
+        return format_html('<a href="{}">Download</a>', reverse("admin:customers_requestprofile_download", args=[obj.pk]))
+
+    def changelist_view(self, request, extra_context=None):
+        # A fresh token for the signed-in staff member, to append to any tenant URL
+        extra_context = dict(extra_context or {}, profile_param=TOKEN_PARAM, profile_token=make_token(request.user.get_username()))
+        return super().changelist_view(request, extra_context)
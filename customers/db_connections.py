@@ -0,0 +1,51 @@
+import time
+
+from django.db import connections
+from django_tenants.utils import get_public_schema_name
+
+# Per process: connections opened, requests that started on an already open connection,
+# and request boundaries that found a connection still pointed at a tenant schema
+_stats = {'opened': 0, 'reused': 0, 'schema_resets': 0}
+# Connection alias -> time.monotonic() when its current connection was opened
+_opened_at = {}
+
+
+def _tenant_connections():
+    return [conn for conn in connections.all(initialized_only=True) if hasattr(conn, 'set_schema_to_public')]
+
+
+def reset_schemas():
+    """
+    Points every django-tenants connection back at the public schema. Runs at the start and end
+    of each request (customers.signals), so with CONN_MAX_AGE a kept connection never carries
+    the last request's tenant into the next one, or into code that runs before the tenant
+    middleware. The database backend sets the session's search_path from this before the next
+    query, and only if it differs.
+    """
+    public = get_public_schema_name()
+    for conn in _tenant_connections():
+        if conn.schema_name != public:
+            conn.set_schema_to_public()
+            _stats['schema_resets'] += 1
+
+
+def record_request_start():
+    """Counts a request that starts on a connection kept from an earlier one (after close_old_connections ran)."""
+    for conn in _tenant_connections():
+        if conn.connection is not None:
+            _stats['reused'] += 1
+
+
+def record_connect(alias):
+    _stats['opened'] += 1
+    _opened_at[alias] = time.monotonic()
+
+
+def connection_stats():
+    """This process's connection counters, and how long each open connection has been kept."""
+    now = time.monotonic()
+    return dict(_stats, ages={
+        conn.alias: round(now - _opened_at[conn.alias], 1)
+        for conn in _tenant_connections()
+        if conn.connection is not None and conn.alias in _opened_at
+    })
@@ -0,0 +1,115 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from recruit_saas.benchmarks import (
+    DEFAULT_THRESHOLDS, SCENARIOS, WEBHOOK_SECRET, BenchmarkError, find_regressions, measure, seed,
+)
+
+
+def _threshold(value):
+    metric, _, allowed = value.partition('=')
+    try:
+        return metric, float(allowed)
+    except ValueError:
+        raise ValueError(f"expected metric=fraction, got {value!r}") from None
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds benchmark portals into a throwaway copy of the database, measures latency percentiles, "
+        "queries and allocations for the hot tenant and marketing views, and writes them as JSON. "
+        "With --baseline, fails when a metric regressed past its threshold."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenants', type=int, default=5)
+        parser.add_argument('--jobs', type=int, default=50, help="Jobs per benchmark portal.")
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), dest='scenarios',
+                            help="Run only this scenario (repeatable).")
+        parser.add_argument('--output', default='benchmark.json')
+        parser.add_argument('--baseline', help="Results JSON from an earlier run to compare against.")
+        parser.add_argument('--threshold', action='append', type=_threshold, default=[],
+                            help="Allowed increase over the baseline as metric=fraction, e.g. p95_ms=0.3.")
+        parser.add_argument('--keepdb', action='store_true', help="Keep the benchmark database and its seed for the next run.")
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 2:
+            raise CommandError("--iterations must be at least 2 to take percentiles.")
+        thresholds = dict(getattr(settings, 'BENCHMARK_THRESHOLDS', DEFAULT_THRESHOLDS))
+        thresholds.update(options['threshold'])
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)['results']
+
+        # A database of its own, so seeding never touches real tenants or the test runner's database
+        old_name = connection.settings_dict['NAME']
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = f"{old_name}_benchmark"
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=options['keepdb'])
+        try:
+            with override_settings(
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET,
+                REQUEST_METRICS_SAMPLE_RATE=0,
+                REQUEST_METRICS_SLOW_MS=float('inf'),
+                REQUEST_METRICS_MAX_QUERIES=float('inf'),
+            ):
+                results = self.run(options)
+        except BenchmarkError as e:
+            raise CommandError(str(e))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        report = {
+            'meta': {
+                'commit': _git_commit(),
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'tenants': options['tenants'],
+                'jobs': options['jobs'],
+                'warmup': options['warmup'],
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        self.stdout.write(f"Wrote {options['output']}")
+
+        if baseline is not None:
+            regressions = find_regressions(baseline, results, thresholds)
+            if regressions:
+                raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def run(self, options):
+        self.stdout.write(f"Seeding {options['tenants']} portal(s) with {options['jobs']} jobs each...")
+        site = seed(max(1, options['tenants']), max(1, options['jobs']))
+        results = {}
+        for name in options['scenarios'] or SCENARIOS:
+            results[name] = result = measure(SCENARIOS[name], site, options['iterations'], options['warmup'])
+            self.stdout.write(
+                f"{name:<18} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+                f"{result['queries']:>3} queries  {result['alloc_peak_kb']:>8.1f} KiB peak"
+            )
+        return results
@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from customers.schema_pool import fill_pool
+
+
+class Command(BaseCommand):
+    help = "Keeps a pool of pre-migrated tenant schemas ready for instant signup."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Top the pool up once and exit.")
+        parser.add_argument('--size', type=int, default=None)
+        parser.add_argument('--interval', type=float, default=getattr(settings, 'SCHEMA_POOL_CHECK_INTERVAL', 30),
+                            help="Seconds to sleep between checks of the pool.")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                added = fill_pool(options['size'])
+            except Exception as e:
+                # A failed migration drops the half-built schema; try again on the next pass
+                self.stderr.write(f"Schema pool refill failed: {e}")
+                added = 0
+            if added:
+                self.stdout.write(f"Schema pool: {added} schema(s) added")
+            if options['once']:
+                return
+            time.sleep(options['interval'])
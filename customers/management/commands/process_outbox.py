@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from customers.outbox import deliver_pending, purge_failed
+
+
+class Command(BaseCommand):
+    help = "Delivers queued emails (job applications, billing notices) with retries and backoff."
+
+    # Seconds between purges of emails that failed for good
+    purge_interval = 3600
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the due emails once and exit.")
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--interval', type=float, default=getattr(settings, 'OUTBOX_POLL_INTERVAL', 5),
+                            help="Seconds to sleep when there is nothing to send.")
+
+    def handle(self, *args, **options):
+        last_purge = None
+        while True:
+            if last_purge is None or time.monotonic() - last_purge >= self.purge_interval:
+                try:
+                    purged = purge_failed()
+                except Exception as e:
+                    self.stderr.write(f"Outbox purge failed: {e}")
+                else:
+                    if purged:
+                        self.stdout.write(f"Outbox: purged {purged} failed emails")
+                last_purge = time.monotonic()
+            try:
+                sent, failed = deliver_pending(options['batch_size'])
+            except Exception as e:
+                # SMTP relay or database unavailable: the batch stays queued, try again later
+                self.stderr.write(f"Outbox batch failed: {e}")
+                sent = failed = 0
+            if sent or failed:
+                self.stdout.write(f"Outbox: {sent} sent, {failed} failed")
+                continue
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,37 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from customers.models import StripeEvent
+from customers.webhooks import process_pending_events
+
+
+class Command(BaseCommand):
+    help = "Applies recorded Stripe webhook events, oldest first and in order per customer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Work through the pending backlog once and exit.")
+        parser.add_argument('--retry-failed', action='store_true',
+                            help="Put every failed event back in the queue before starting.")
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--interval', type=float, default=getattr(settings, 'OUTBOX_POLL_INTERVAL', 5),
+                            help="Seconds to sleep when there is nothing to process.")
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            count = StripeEvent.objects.filter(status='failed').update(
+                status='pending', attempts=0, next_attempt_at=timezone.now(),
+            )
+            self.stdout.write(f"Requeued {count} failed events")
+
+        while True:
+            processed, failed = process_pending_events(options['batch_size'])
+            if processed or failed:
+                self.stdout.write(f"Stripe events: {processed} processed, {failed} failed")
+            if processed:
+                continue
+            if options['once']:
+                return
+            time.sleep(options['interval'])
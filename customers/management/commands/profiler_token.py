@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from recruit_saas.request_profiler import TOKEN_PARAM, make_token
+
+
+class Command(BaseCommand):
+    help = "Prints a signed token that profiles requests carrying it (see RequestProfilerMiddleware)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--by', default='', help="Who the captures are recorded for.")
+        parser.add_argument('-s', '--schema', dest='schema_name', default='', help="Only profile this tenant schema.")
+
+    def handle(self, *args, **options):
+        token = make_token(options['by'], options['schema_name'])
+        self.stdout.write(token)
+        self.stderr.write(f"Add ?{TOKEN_PARAM}={token} to a URL, or send it as an X-Profile-Token header.")
@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from customers.seeding import PASSWORD, seed_tenants
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates thousands of synthetic tenants (domain, admin user, profile and jobs each) for scale "
+        "testing, cloned from the template schema in parallel. The same --seed always gives the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tenants', type=int, default=1000)
+        parser.add_argument('--jobs', type=int, default=10, help="Jobs per tenant.")
+        parser.add_argument('--prefix', default='seed', help="Schema and domain prefix: seed_00042, seed-00042.getpillarpost.com.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'TENANT_MIGRATION_WORKERS', 4))
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows per INSERT for tenants, domains and jobs.")
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive')
+
+    def handle(self, *args, **options):
+        if options['interactive']:
+            answer = input(
+                f"This adds {options['tenants']} synthetic tenants to the configured database. Type 'yes' to continue: "
+            )
+            if answer != 'yes':
+                raise CommandError("Seeding cancelled.")
+
+        count = options['tenants']
+        started = time.monotonic()
+        seeded = 0
+        try:
+            results = seed_tenants(
+                count, jobs=options['jobs'], prefix=options['prefix'], seed=options['seed'],
+                workers=options['workers'], batch_size=options['batch_size'],
+            )
+            for schema_name, outcome in results:
+                if isinstance(outcome, Exception):
+                    raise CommandError(
+                        f"Seeding schema '{schema_name}' failed: {outcome}. Rerun to resume with the tenants that are left."
+                    )
+                seeded += 1
+                if seeded % 100 == 0 or options['verbosity'] > 1:
+                    self.stdout.write(f"[seed {seeded}] {schema_name} seeded in {outcome:.2f}s")
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{seeded} tenant schema(s) seeded in {elapsed:.1f}s ({count - seeded} already there). "
+            f"Admins sign in as owner@<domain prefix>.example.com with '{PASSWORD}'."
+        ))
@@ -0,0 +1,152 @@
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import CommandError, OutputWrapper
+from django.db import connection, connections
+from django.db.migrations.loader import MigrationLoader
+from django_tenants.migration_executors import get_executor as tenants_get_executor
+from django_tenants.migration_executors.base import MigrationExecutor, run_migrations
+
+
+def _quote(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+def tenant_migration_leaves():
+    """Latest migration of every tenant app in the running code, as (app_label, name) pairs."""
+    labels = {config.label for config in apps.get_app_configs() if config.name in settings.TENANT_APPS}
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    return sorted(node for node in loader.graph.leaf_nodes() if node[0] in labels)
+
+
+def pending_schemas(schema_names):
+    """
+    The schemas that are missing at least one of the latest tenant migrations, in the given order.
+    Lets an interrupted release pick up where it stopped instead of revisiting finished schemas.
+    """
+    schema_names = list(schema_names)
+    if not schema_names:
+        return []
+    leaves = set(tenant_migration_leaves())
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT table_schema FROM information_schema.tables WHERE table_name = 'django_migrations' "
+            "AND table_schema = ANY(%s)",
+            [schema_names],
+        )
+        recorded = [row[0] for row in cursor.fetchall()]
+        applied = {schema: set() for schema in recorded}
+        if recorded:
+            cursor.execute(
+                " UNION ALL ".join(
+                    f"SELECT %s, app, name FROM {_quote(schema)}.django_migrations" for schema in recorded
+                ),
+                recorded,
+            )
+            for schema, app, name in cursor.fetchall():
+                applied[schema].add((app, name))
+    return [schema for schema in schema_names if not leaves <= applied.get(schema, set())]
+
+
+def _migrate_schema(args, options, codename, schema_name):
+    start = time.monotonic()
+    run_migrations(args, options, codename, schema_name, allow_atomic=False)
+    return schema_name, time.monotonic() - start
+
+
+class ParallelExecutor(MigrationExecutor):
+    """
+    `migrate_schemas --executor=parallel`: migrates tenant schemas, and the TENANT_TEMPLATE_SCHEMA they're
+    cloned from, over TENANT_MIGRATION_WORKERS processes, each with its own connection. Prints progress
+    with per-schema timings, stops handing out schemas after the first failure, and skips schemas that
+    are already up to date, so a rerun resumes the release.
+    """
+    codename = 'parallel'
+
+    def run_migrations(self, tenants=None):
+        tenants = list(tenants or [])
+        stdout = OutputWrapper(sys.stdout)
+        template = ''
+
+        if self.PUBLIC_SCHEMA_NAME in tenants:
+            tenants.remove(self.PUBLIC_SCHEMA_NAME)
+            run_migrations(self.args, self.options, self.codename, self.PUBLIC_SCHEMA_NAME)
+        elif not self.options.get('schema_name'):
+            # A run over every tenant also keeps the golden schema new tenants are cloned from up to date
+            template = getattr(settings, 'TENANT_TEMPLATE_SCHEMA', '')
+            if template:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {_quote(template)}")
+                tenants.insert(0, template)
+
+        if not self.args and not self.options.get('fake'):
+            # Without a target migration, finished schemas have nothing left to do
+            total = len(tenants)
+            tenants = pending_schemas(tenants)
+            if total > len(tenants):
+                stdout.write(f"[{self.codename}] {total - len(tenants)} of {total} schema(s) already up to date")
+        if not tenants:
+            self._seed_template(template)
+            return
+
+        options = dict(self.options, verbosity=max(0, int(self.options.get('verbosity', 1)) - 1))
+        workers = min(getattr(settings, 'TENANT_MIGRATION_WORKERS', 4), len(tenants))
+        started = time.monotonic()
+
+        if workers <= 1:
+            results = (self._run_inline(options, schema_name) for schema_name in tenants)
+            self._report(results, len(tenants), stdout)
+        else:
+            # Children must open their own connections rather than share the parent's socket
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                futures = {
+                    pool.submit(_migrate_schema, self.args, options, self.codename, schema_name): schema_name
+                    for schema_name in tenants
+                }
+                try:
+                    self._report((self._result(f, futures[f]) for f in as_completed(futures)), len(tenants), stdout)
+                except CommandError:
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    raise
+
+        stdout.write(f"[{self.codename}] {len(tenants)} schema(s) migrated in {time.monotonic() - started:.1f}s")
+        self._seed_template(template)
+
+    def _seed_template(self, template):
+        # The starter rows clones copy are data, not migrations, so they go in once the template is
+        # fully migrated (not after a run to an older target)
+        if template and not self.args and not self.options.get('fake'):
+            from .schema_clone import seed_template_schema
+            seed_template_schema(template)
+
+    def _run_inline(self, options, schema_name):
+        try:
+            return _migrate_schema(self.args, options, self.codename, schema_name)
+        except Exception as e:
+            return schema_name, e
+
+    @staticmethod
+    def _result(future, schema_name):
+        try:
+            return future.result()
+        except Exception as e:
+            return schema_name, e
+
+    def _report(self, results, count, stdout):
+        for done, (schema_name, outcome) in enumerate(results, start=1):
+            if isinstance(outcome, Exception):
+                raise CommandError(
+                    f"Migrating schema '{schema_name}' failed: {outcome}. "
+                    f"Rerun migrate_schemas to resume with the schemas that aren't up to date."
+                )
+            stdout.write(f"[{self.codename} {done}/{count}] {schema_name} migrated in {outcome:.2f}s")
+
+
+def get_executor(codename=None):
+    """GET_EXECUTOR_FUNCTION hook; importing this module is what registers ParallelExecutor."""
+    return tenants_get_executor(codename)
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:23
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0003_stripeevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(django.db.models.functions.text.Lower('notification_email_1'), name='client_notify_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(django.db.models.functions.text.Lower('master_email'), name='client_master_email_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:45
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0006_queuedimage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('view_name', models.CharField(blank=True, max_length=200)),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=500)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField()),
+                ('requested_by', models.CharField(blank=True, max_length=150)),
+                ('format', models.CharField(choices=[('pstats', 'cProfile (pstats)'), ('html', 'pyinstrument (HTML)')], default='pstats', max_length=10)),
+                ('summary', models.TextField(blank=True)),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('tenant', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_profiles', to='customers.client')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django_tenants.models import TenantMixin, DomainMixin
+from django.utils import timezone
 from django.utils.text import slugify
 from datetime import date, timedelta
 import uuid
@@ -35,6 +37,13 @@ class Client(TenantMixin):
     stripe_customer_id = models.CharField(max_length=100, blank=True)
     auto_create_schema = False  # triggered in servies
 
+    class Meta:
+        indexes = [
+            # Portal finder matches emails case-insensitively
+            models.Index(Lower('notification_email_1'), name='client_notify_email_lower_idx'),
+            models.Index(Lower('master_email'), name='client_master_email_lower_idx'),
+        ]
+
     @property
     def is_on_trial(self):
         """Returns True if the trial hasn't expired yet."""
@@ -60,3 +69,144 @@ class Client(TenantMixin):
 # The Domain model is required by django-tenants
 class Domain(DomainMixin):
     pass
+
+
+class QueuedEmail(models.Model):
+    """An email waiting for the process_outbox worker, so requests never block on SMTP."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('failed', 'Failed'),
+    ]
+    tenant = models.ForeignKey(Client, on_delete=models.CASCADE, null=True, blank=True, related_name='queued_emails')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    reply_to = models.JSONField(default=list, blank=True)
+    # Attachments (e.g. a candidate's CV) are kept in the row until delivered, so any dyno can send them
+    attachment_content = models.BinaryField(null=True, blank=True)
+    attachment_name = models.CharField(max_length=255, blank=True)
+    attachment_type = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='queuedemail_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)}"
+
+
+class StripeEvent(models.Model):
+    """
+    A verified Stripe webhook event, recorded on receipt and processed later by process_stripe_events.
+    The event id is the primary key, so Stripe's retries of the same event are stored (and acted on) once.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('failed', 'Failed'),
+    ]
+    event_id = models.CharField(max_length=255, primary_key=True)
+    type = models.CharField(max_length=100)
+    customer_id = models.CharField(max_length=100, blank=True)
+    payload = models.JSONField()
+    # Stripe's own timestamp, used to apply each customer's events in order
+    created = models.DateTimeField()
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    # A failed event waits until then before it is tried again
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['created', 'received_at']
+        indexes = [
+            models.Index(fields=['status', 'customer_id', 'created'], name='stripeevent_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.type} ({self.event_id})"
+
+
+class PooledSchema(models.Model):
+    """
+    A migrated tenant schema that no Client owns yet, kept ready by fill_schema_pool.
+    Signup renames one to the new tenant's schema name instead of running every migration.
+    """
+    schema_name = models.CharField(max_length=63, unique=True)
+    # Latest tenant migrations applied to the schema; only entries matching the running code are claimed
+    fingerprint = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return self.schema_name
+
+
+class QueuedImage(models.Model):
+    """
+    A site editor image upload waiting for the process_images worker, which optimises it
+    and uploads it to the media storage, so saving the editor never waits on Cloudinary.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('failed', 'Failed'),
+    ]
+    tenant = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='queued_images')
+    # The CompanyProfile image field the upload replaces (a key of cms.images.IMAGE_SLOTS)
+    field_name = models.CharField(max_length=50)
+    # The original upload, kept in the row until processed so the worker dyno can read it
+    content = models.BinaryField()
+    original_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['next_attempt_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='queuedimage_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tenant} {self.field_name}: {self.original_name}"
+
+
+class RequestProfile(models.Model):
+    """A profile of one request, captured for staff with a signed profiling token (see recruit_saas/request_profiler.py)."""
+    FORMAT_CHOICES = [
+        ('pstats', 'cProfile (pstats)'),
+        ('html', 'pyinstrument (HTML)'),
+    ]
+    request_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    tenant = models.ForeignKey(Client, on_delete=models.SET_NULL, null=True, blank=True, related_name='request_profiles')
+    view_name = models.CharField(max_length=200, blank=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    requested_by = models.CharField(max_length=150, blank=True)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='pstats')
+    # The top functions by cumulative time, readable in the admin without downloading
+    summary = models.TextField(blank=True)
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f}ms)"
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import QueuedEmail
+from .queueing import claim_due, retry_delay
+
+
+# Size of the pieces an attachment is copied into its row in, so a CV is never read into memory whole
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024
+
+
+def _store_attachment(queued, attachment):
+    """Appends the attachment to the saved row one chunk at a time."""
+    table = connections[queued._state.db].ops.quote_name(QueuedEmail._meta.db_table)
+    with connections[queued._state.db].cursor() as cursor:
+        for chunk in attachment.chunks(ATTACHMENT_CHUNK_SIZE):
+            cursor.execute(
+                f"UPDATE {table} SET attachment_content = attachment_content || %s WHERE id = %s",
+                [chunk, queued.pk],
+            )
+    # Leave the content to be loaded on access rather than keep a stale empty value on the instance
+    del queued.attachment_content
+
+
+def enqueue_email(subject, body, to, reply_to=None, tenant=None, attachment=None, from_email=None):
+    """
+    Records an email for the worker to send and returns the QueuedEmail.
+    An attachment is stored in the row itself, as the worker runs on another dyno that can't see
+    this one's disk. It is streamed in from the upload in ATTACHMENT_CHUNK_SIZE pieces, within
+    the same transaction as the row, so the worker never sees a partly written CV.
+    """
+    queued = QueuedEmail(
+        tenant=tenant,
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+        reply_to=list(reply_to or []),
+    )
+    if attachment is None:
+        queued.save()
+        return queued
+    queued.attachment_content = b''
+    queued.attachment_name = attachment.name
+    queued.attachment_type = attachment.content_type or 'application/octet-stream'
+    with transaction.atomic():
+        queued.save()
+        _store_attachment(queued, attachment)
+    return queued
+
+
+def build_message(queued, connection=None):
+    message = EmailMessage(
+        subject=queued.subject,
+        body=queued.body,
+        from_email=queued.from_email,
+        to=queued.to,
+        reply_to=queued.reply_to or None,
+        connection=connection,
+    )
+    if queued.attachment_name:
+        message.attach(queued.attachment_name, bytes(queued.attachment_content), queued.attachment_type)
+    return message
+
+
+def deliver_pending(batch_size=None):
+    """
+    Sends one batch of due emails over a single SMTP connection and returns (sent, failed).
+    The batch is claimed in a short transaction (see claim_due) and sent outside it, so several
+    workers can run side by side and no lock is held while the relay is talking.
+    Each email is then deleted, or its failure recorded, on its own: a delivered email goes with
+    its attachment, and one that has failed for good keeps no CV (purge_failed drops the rest).
+    Attachments are left out of the batch query and loaded one email at a time while sending.
+    """
+    batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 50)
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 8)
+    base_delay = getattr(settings, 'OUTBOX_RETRY_DELAY', 60)
+    sent = failed = 0
+
+    batch = claim_due(
+        QueuedEmail.objects.defer('attachment_content'), batch_size, getattr(settings, 'OUTBOX_CLAIM_TIMEOUT', 300)
+    )
+    if not batch:
+        return 0, 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for queued in batch:
+            try:
+                build_message(queued, connection=connection).send()
+            except Exception as e:
+                failed += 1
+                queued.attempts += 1
+                queued.last_error = str(e)
+                update_fields = ['attempts', 'last_error', 'status', 'next_attempt_at']
+                if queued.attempts >= max_attempts:
+                    queued.status = 'failed'
+                    queued.attachment_content = None
+                    update_fields.append('attachment_content')
+                else:
+                    queued.next_attempt_at = timezone.now() + retry_delay(queued.attempts, base_delay)
+                queued.save(update_fields=update_fields)
+            else:
+                sent += 1
+                queued.delete()
+    finally:
+        connection.close()
+
+    return sent, failed
+
+
+def purge_failed(days=None):
+    """
+    Deletes emails that failed for good more than `days` (OUTBOX_FAILED_RETENTION_DAYS) days after
+    they were queued, so applications that could not be forwarded aren't kept. Returns how many.
+    """
+    days = days if days is not None else getattr(settings, 'OUTBOX_FAILED_RETENTION_DAYS', 7)
+    deleted, _ = QueuedEmail.objects.filter(
+        status='failed', created_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+
+def retry_delay(attempts, base=60):
+    """Exponential backoff for the queue workers: base seconds, doubled per failed attempt, capped at an hour."""
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 3600))
+
+
+def claim_due(queryset, batch_size, lease):
+    """
+    Claims up to batch_size due pending rows of queryset and returns them.
+    The rows are locked with SKIP LOCKED only for as long as it takes to push their next_attempt_at
+    `lease` seconds ahead, so the caller works on them outside any transaction and other workers
+    leave them alone meanwhile. A worker that dies mid-batch leaves its rows to be retried once the
+    lease runs out.
+    """
+    with transaction.atomic():
+        batch = list(
+            queryset.select_for_update(skip_locked=True, of=('self',))
+            .filter(status='pending', next_attempt_at__lte=timezone.now())[:batch_size]
+        )
+        if batch:
+            queryset.model.objects.filter(pk__in=[row.pk for row in batch]).update(
+                next_attempt_at=timezone.now() + timedelta(seconds=lease)
+            )
+    return batch
@@ -0,0 +1,218 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django_tenants.utils import schema_context, schema_exists
+
+from .migration_executor import pending_schemas
+
+
+def _quote(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+def template_schema_name():
+    """The golden schema new tenants are copied from ('' disables cloning)."""
+    return getattr(settings, 'TENANT_TEMPLATE_SCHEMA', '')
+
+
+def migrate_template_schema(verbosity=0):
+    """
+    Creates the template schema if it's missing and migrates it if it's behind, for tools that
+    clone many schemas without a `migrate_schemas --executor=parallel` run first. Returns False
+    when cloning is disabled.
+    """
+    template = template_schema_name()
+    if not template:
+        return False
+    if pending_schemas([template]):
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {_quote(template)}")
+        call_command('migrate_schemas', tenant=True, schema_name=template, interactive=False, verbosity=verbosity)
+        connection.set_schema_to_public()
+    seed_template_schema(template)
+    return True
+
+
+def seed_template_schema(template=None):
+    """
+    Gives the migrated template schema the rows every tenant starts with, so clones carry them:
+    a CompanyProfile with the STARTER_PROFILE content and no tenant_slug, which the cloner sets.
+    Does nothing if the profile is already there.
+    """
+    from cms.models import STARTER_PROFILE, CompanyProfile
+
+    template = template or template_schema_name()
+    with schema_context(template):
+        if not CompanyProfile.objects.exists():
+            CompanyProfile.objects.create(display_name='', **STARTER_PROFILE)
+
+
+def set_profile_slug(cursor, schema_name, tables=None):
+    """Points the CompanyProfile copied from the template into schema_name at that schema."""
+    from cms.models import CompanyProfile
+
+    table = CompanyProfile._meta.db_table
+    if tables is None or table in tables:
+        cursor.execute(f"UPDATE {_quote(schema_name)}.{_quote(table)} SET tenant_slug = %s", [schema_name])
+
+
+class SchemaCloner:
+    """
+    Copies the migrated template schema into new tenant schemas with plain DDL, instead of
+    running every tenant migration again.
+
+    The template is introspected once. Cloning then creates each table with
+    CREATE TABLE ... (LIKE ...), which brings columns, defaults, CHECK constraints and identity
+    sequences. It then recreates the primary keys, unique constraints and indexes under their
+    original names, copies the seed rows (django_migrations, content types, permissions, the
+    starter CompanyProfile), adds the foreign keys, trigger functions and triggers, and moves the
+    identity sequences past the copied ids. The copied profile is given the new schema's name as
+    its tenant_slug.
+    Views and standalone sequences aren't copied; tenant apps don't create any.
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.tables = []
+        self.statements = []
+        self.deferred = []
+        self.seeded = []
+        self.uses_serial = False
+        self._load()
+
+    @classmethod
+    def for_template(cls):
+        """A cloner for the configured template, or None if it's missing or behind the code's migrations."""
+        template = template_schema_name()
+        if not template or not schema_exists(template) or pending_schemas([template]):
+            return None
+        cloner = cls(template)
+        # A serial column's default would keep pointing at the template's sequence
+        return None if cloner.uses_serial else cloner
+
+    def _load(self):
+        # Introspect with only the template on the search_path, so definitions name its tables unqualified
+        # (and anything in public qualified), and can be replayed on the new schema's search_path.
+        # Index, trigger and function definitions always qualify their name, so that prefix is stripped.
+        connection.set_schema(self.template, include_public=False)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                    "WHERE n.nspname = %s AND c.relkind IN ('r', 'p') ORDER BY c.relname",
+                    [self.template],
+                )
+                self.tables = [row[0] for row in cursor.fetchall()]
+
+                cursor.execute(
+                    "SELECT table_name, string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position) "
+                    "FROM information_schema.columns WHERE table_schema = %s AND is_generated = 'NEVER' "
+                    "GROUP BY table_name",
+                    [self.template],
+                )
+                columns = dict(cursor.fetchall())
+
+                cursor.execute(
+                    "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+                    "WHERE table_schema = %s AND column_default LIKE 'nextval(%%')",
+                    [self.template],
+                )
+                self.uses_serial = cursor.fetchone()[0]
+
+                cursor.execute(
+                    "SELECT cl.relname, con.conname, con.contype, pg_get_constraintdef(con.oid) "
+                    "FROM pg_constraint con JOIN pg_class cl ON cl.oid = con.conrelid "
+                    "JOIN pg_namespace n ON n.oid = cl.relnamespace "
+                    "WHERE n.nspname = %s AND con.contype IN ('p', 'u', 'x', 'f') ORDER BY con.contype DESC, con.conname",
+                    [self.template],
+                )
+                constraints = cursor.fetchall()
+
+                cursor.execute(
+                    "SELECT replace(pg_get_indexdef(i.indexrelid), ' ON ' || quote_ident(n.nspname) || '.', ' ON ') "
+                    "FROM pg_index i "
+                    "JOIN pg_class cl ON cl.oid = i.indrelid JOIN pg_namespace n ON n.oid = cl.relnamespace "
+                    "WHERE n.nspname = %s AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = i.indexrelid)",
+                    [self.template],
+                )
+                indexes = [row[0] for row in cursor.fetchall()]
+
+                cursor.execute(
+                    "SELECT replace(pg_get_functiondef(p.oid), 'FUNCTION ' || quote_ident(n.nspname) || '.', 'FUNCTION ') "
+                    "FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace WHERE n.nspname = %s AND p.prokind = 'f'",
+                    [self.template],
+                )
+                functions = [row[0] for row in cursor.fetchall()]
+
+                cursor.execute(
+                    "SELECT replace(pg_get_triggerdef(t.oid), ' ON ' || quote_ident(n.nspname) || '.', ' ON ') "
+                    "FROM pg_trigger t JOIN pg_class cl ON cl.oid = t.tgrelid "
+                    "JOIN pg_namespace n ON n.oid = cl.relnamespace WHERE n.nspname = %s AND NOT t.tgisinternal",
+                    [self.template],
+                )
+                triggers = [row[0] for row in cursor.fetchall()]
+
+                cursor.execute(
+                    "SELECT table_name, column_name FROM information_schema.columns "
+                    "WHERE table_schema = %s AND is_identity = 'YES'",
+                    [self.template],
+                )
+                identities = cursor.fetchall()
+
+                if self.tables:
+                    cursor.execute(" UNION ALL ".join(
+                        f"SELECT %s WHERE EXISTS (SELECT 1 FROM {_quote(table)})" for table in self.tables
+                    ), self.tables)
+                    self.seeded = [row[0] for row in cursor.fetchall()]
+        finally:
+            connection.set_schema_to_public()
+
+        source = _quote(self.template)
+        for table in self.tables:
+            self.statements.append(
+                f"CREATE TABLE {{schema}}.{_quote(table)} (LIKE {source}.{_quote(table)} INCLUDING DEFAULTS "
+                f"INCLUDING CONSTRAINTS INCLUDING IDENTITY INCLUDING GENERATED INCLUDING STORAGE INCLUDING COMMENTS)"
+            )
+        for table, name, contype, definition in constraints:
+            statement = f"ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(name)} {definition}"
+            # Foreign keys go in after the seed rows, so copy order doesn't matter
+            (self.deferred if contype == 'f' else self.statements).append(statement)
+        self.statements.extend(indexes)
+        for table in self.seeded:
+            cols = columns[table]
+            self.statements.append(
+                f"INSERT INTO {{schema}}.{_quote(table)} ({cols}) SELECT {cols} FROM {source}.{_quote(table)}"
+            )
+        self.deferred.extend(functions)
+        self.deferred.extend(triggers)
+        for table, column in identities:
+            self.deferred.append(
+                f"SELECT setval(pg_get_serial_sequence('{{schema}}.{_quote(table)}', '{column}'), "
+                f"COALESCE(MAX({_quote(column)}), 0) + 1, false) FROM {{schema}}.{_quote(table)}"
+            )
+
+    def clone(self, schema_name):
+        """Creates schema_name as a copy of the template, atomically."""
+        target = _quote(schema_name)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f"CREATE SCHEMA {target}")
+            connection.set_schema(schema_name, include_public=False)
+            try:
+                with connection.cursor() as cursor:
+                    for statement in self.statements + self.deferred:
+                        cursor.execute(statement.replace('{schema}', target))
+                    set_profile_slug(cursor, schema_name, self.seeded)
+            finally:
+                connection.set_schema_to_public()
+
+
+def clone_template_schema(schema_name, cloner=None):
+    """Clones the template into schema_name; returns False when there is no usable template."""
+    if schema_exists(schema_name):
+        return False
+    cloner = cloner or SchemaCloner.for_template()
+    if cloner is None:
+        return False
+    cloner.clone(schema_name)
+    return True
@@ -0,0 +1,95 @@
+import hashlib
+import uuid
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django_tenants.utils import schema_exists
+
+from .migration_executor import tenant_migration_leaves
+from .models import PooledSchema
+from .schema_clone import SchemaCloner, set_profile_slug
+
+
+def _quote(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+@lru_cache(maxsize=None)
+def migration_fingerprint():
+    """Hash of the latest migration of every tenant app, as shipped with the running code."""
+    return hashlib.sha256(repr(tenant_migration_leaves()).encode()).hexdigest()
+
+
+def claim_schema(schema_name):
+    """
+    Renames a ready pool schema to schema_name and returns True, or False if the pool is empty
+    (or schema_name is already taken) and the caller has to create the schema itself.
+    Runs inside the caller's transaction, so a rolled back signup puts the schema back in the pool.
+    """
+    if schema_exists(schema_name):
+        return False
+    with transaction.atomic():
+        entry = (
+            PooledSchema.objects.select_for_update(skip_locked=True)
+            .filter(fingerprint=migration_fingerprint()).first()
+        )
+        if entry is None:
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER SCHEMA {_quote(entry.schema_name)} RENAME TO {_quote(schema_name)}")
+            # A schema cloned from the template came with a profile named after the pool schema
+            set_profile_slug(cursor, schema_name)
+        entry.delete()
+    return True
+
+
+def _migrate(schema_name, verbosity):
+    call_command('migrate_schemas', tenant=True, schema_name=schema_name, interactive=False, verbosity=verbosity)
+    connection.set_schema_to_public()
+
+
+def _drop(schema_name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {_quote(schema_name)} CASCADE")
+
+
+def fill_pool(size=None, verbosity=0):
+    """
+    Brings stale pool schemas up to the current migrations, then creates new ones until
+    `size` (SCHEMA_POOL_SIZE) are ready, cloned from the template schema when it's up to date.
+    Returns the number of schemas added.
+    """
+    size = size if size is not None else getattr(settings, 'SCHEMA_POOL_SIZE', 5)
+    fingerprint = migration_fingerprint()
+
+    for entry in PooledSchema.objects.exclude(fingerprint=fingerprint):
+        try:
+            _migrate(entry.schema_name, verbosity)
+        except Exception:
+            connection.set_schema_to_public()
+            entry.delete()
+            _drop(entry.schema_name)
+            raise
+        PooledSchema.objects.filter(pk=entry.pk).update(fingerprint=fingerprint)
+
+    added = 0
+    cloner = None
+    while PooledSchema.objects.filter(fingerprint=fingerprint).count() < size:
+        schema_name = f"pool_{uuid.uuid4().hex[:16]}"
+        cloner = cloner or SchemaCloner.for_template()
+        if cloner:
+            cloner.clone(schema_name)
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(f"CREATE SCHEMA {_quote(schema_name)}")
+            try:
+                _migrate(schema_name, verbosity)
+            except Exception:
+                connection.set_schema_to_public()
+                _drop(schema_name)
+                raise
+        PooledSchema.objects.create(schema_name=schema_name, fingerprint=fingerprint)
+        added += 1
+    return added
@@ -0,0 +1,194 @@
+import multiprocessing
+import random
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django_tenants.utils import schema_context
+
+from cms.models import CompanyProfile, Job
+from marketing.job_index import reconcile_tenant
+from .models import Client, Domain, Plan
+from .schema_clone import SchemaCloner, migrate_template_schema
+from .tenant_cache import tenant_cache
+
+PASSWORD = 'seed-Password-1'
+
+_FIRST = ('North', 'Blue', 'Summit', 'Harbour', 'Oak', 'Granite', 'Silver', 'Bright', 'Meridian', 'Kestrel')
+_SECOND = ('Talent', 'Recruitment', 'Partners', 'Search', 'Careers', 'People', 'Resourcing', 'Associates')
+_TITLES = ('Software Engineer', 'Account Manager', 'Finance Analyst', 'Project Manager', 'Nurse', 'Solicitor',
+           'Data Scientist', 'Marketing Executive', 'Operations Lead', 'Electrician', 'Teacher', 'Chef')
+_LOCATIONS = ('London', 'Manchester', 'Leeds', 'Bristol', 'Glasgow', 'Cardiff', 'Belfast', 'Remote')
+_COLOURS = (('#0f172a', '#ffffff'), ('#4a5d5e', '#f0f4f4'), ('#3f6212', '#fafaf9'))
+
+# One synthetic tenant; everything in it follows from the seed and its number
+SeedTenant = namedtuple('SeedTenant', 'number schema_name name domain email')
+
+# The template cloner each worker process builds once
+_cloner = None
+
+
+def seed_tenants_spec(count, prefix='seed', seed=0):
+    """The synthetic tenants for count, prefix and seed, always the same ones in the same order."""
+    if not re.fullmatch(r'[a-z][a-z0-9]*', prefix):
+        raise ValueError("The prefix must be lowercase letters and digits, starting with a letter.")
+    tenants = []
+    for number in range(count):
+        rng = random.Random(f'{seed}:{number}')
+        slug = f'{prefix}-{number:05d}'
+        tenants.append(SeedTenant(
+            number=number,
+            schema_name=slug.replace('-', '_'),
+            name=f"{rng.choice(_FIRST)} {rng.choice(_SECOND)} {number}",
+            domain=f'{slug}.getpillarpost.com',
+            email=f'owner@{slug}.example.com',
+        ))
+    return tenants
+
+
+def _existing_schemas(schema_names):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT schema_name FROM information_schema.schemata WHERE schema_name = ANY(%s)", [list(schema_names)]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def insert_tenant_rows(tenants, seed=0, batch_size=500):
+    """Bulk inserts the Client and primary Domain rows that don't exist yet; returns how many were added."""
+    existing = set(
+        Client.objects.filter(schema_name__in=[t.schema_name for t in tenants]).values_list('schema_name', flat=True)
+    )
+    missing = [t for t in tenants if t.schema_name not in existing]
+    if not missing:
+        return 0
+    plan, _ = Plan.objects.get_or_create(name="Standard")
+    today = date.today()
+    clients = []
+    for tenant in missing:
+        rng = random.Random(f'{seed}:{tenant.number}:client')
+        created = today - timedelta(days=rng.randrange(730))
+        clients.append(Client(
+            schema_name=tenant.schema_name,
+            name=tenant.name,
+            template_choice=rng.choice(Client.TEMPLATE_CHOICES)[0],
+            plan=plan,
+            created_on=created,
+            trial_ends=created + timedelta(days=14),
+            # Most seeded portals are paying, the rest are in or past their trial
+            is_active=rng.random() < 0.7,
+            master_email=tenant.email,
+            notification_email_1=tenant.email,
+        ))
+    # bulk_create skips save() and its signals, so the hostname cache is cleared by hand below:
+    # a host looked up before seeding may still be cached as unknown
+    with transaction.atomic():
+        clients = Client.objects.bulk_create(clients, batch_size=batch_size)
+        Domain.objects.bulk_create(
+            [Domain(domain=t.domain, tenant=c, is_primary=True) for t, c in zip(missing, clients)],
+            batch_size=batch_size,
+        )
+    transaction.on_commit(tenant_cache.invalidate)
+    return len(clients)
+
+
+def _init_worker(cloner):
+    global _cloner
+    _cloner = cloner
+
+
+def _job(rng, company_name):
+    title = rng.choice(_TITLES)
+    return Job(
+        title=title,
+        company_name=company_name,
+        salary=f"£{rng.randrange(25, 120)},000",
+        location=rng.choice(_LOCATIONS),
+        summary=f"A {title.lower()} role with a growing team.",
+        description=f"About the {title.lower()} role. " * rng.randrange(20, 80),
+    )
+
+
+def seed_schema(tenant, jobs, seed, password_hash):
+    """
+    Clones the template into the tenant's schema, fills in its company profile and adds an admin
+    user and `jobs` jobs using bulk inserts, then indexes the jobs on the marketplace, all in
+    one transaction. Returns (schema_name, seconds taken).
+    """
+    start = time.monotonic()
+    rng = random.Random(f'{seed}:{tenant.number}:schema')
+    User = get_user_model()
+    primary, background = rng.choice(_COLOURS)
+    with transaction.atomic():
+        _cloner.clone(tenant.schema_name)
+        with schema_context(tenant.schema_name):
+            User.objects.bulk_create([
+                User(username=tenant.email, email=tenant.email, password=password_hash, is_active=True),
+            ])
+            # The clone brought the template's starter profile along, already under this schema's name
+            CompanyProfile.objects.update_or_create(tenant_slug=tenant.schema_name, defaults={
+                'display_name': tenant.name,
+                'primary_color': primary,
+                'secondary_color': primary,
+                'background_color': background,
+                'hero_text': "We find the people who make great teams.",
+                'about_content': f"{tenant.name} has been placing candidates since {2000 + rng.randrange(25)}.",
+                'contact_email': tenant.email,
+            })
+            Job.objects.bulk_create([_job(rng, tenant.name) for _ in range(jobs)], batch_size=500)
+        reconcile_tenant(tenant.schema_name)
+    return tenant.schema_name, time.monotonic() - start
+
+
+def _seed_schema_safely(tenant, jobs, seed, password_hash):
+    try:
+        return seed_schema(tenant, jobs, seed, password_hash)
+    except Exception as e:
+        connection.set_schema_to_public()
+        return tenant.schema_name, e
+
+
+def seed_tenants(count, jobs=10, prefix='seed', seed=0, workers=4, batch_size=500):
+    """
+    Creates `count` synthetic tenants, each with a primary domain, an admin user (password
+    PASSWORD), a company profile and `jobs` jobs, and yields (schema_name, seconds or exception)
+    as each schema is done.
+
+    Tenant and domain rows go in with batched inserts; the schemas are cloned from the migrated
+    template schema (migrating it first if needed) across `workers` processes, each with its own
+    connection. Reruns skip tenants that already have a schema, so an interrupted seed resumes,
+    and a larger count adds to an earlier seed of the same prefix.
+    """
+    if not migrate_template_schema():
+        raise ValueError("Seeding clones TENANT_TEMPLATE_SCHEMA, which is disabled.")
+    cloner = SchemaCloner.for_template()
+    if cloner is None:
+        raise ValueError("The template schema can't be cloned; see SchemaCloner.for_template.")
+
+    tenants = seed_tenants_spec(count, prefix, seed)
+    insert_tenant_rows(tenants, seed, batch_size)
+    done = _existing_schemas(t.schema_name for t in tenants)
+    pending = [t for t in tenants if t.schema_name not in done]
+    # Hashing is slow on purpose, and every seeded admin shares the password anyway
+    password_hash = make_password(PASSWORD)
+
+    if workers <= 1 or len(pending) <= 1:
+        _init_worker(cloner)
+        for tenant in pending:
+            yield _seed_schema_safely(tenant, jobs, seed, password_hash)
+        return
+
+    # Children must open their own connections rather than share the parent's socket
+    connections.close_all()
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('fork'),
+        initializer=_init_worker, initargs=(cloner,),
+    ) as pool:
+        futures = [pool.submit(_seed_schema_safely, tenant, jobs, seed, password_hash) for tenant in pending]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,33 @@
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from . import db_connections
+from .models import Client, Domain
+from .tenant_cache import tenant_cache
+
+
+@receiver([post_save, post_delete], sender=Client)
+@receiver([post_save, post_delete], sender=Domain)
+def invalidate_tenant_cache(sender, **kwargs):
+    """Drops cached hostname lookups now, and again once the change is committed."""
+    tenant_cache.invalidate()
+    transaction.on_commit(tenant_cache.invalidate)
+
+
+@receiver(request_started)
+def start_request_in_public_schema(sender, **kwargs):
+    # Django's close_old_connections has already dropped expired or unusable connections
+    db_connections.record_request_start()
+    db_connections.reset_schemas()
+
+
+@receiver(request_finished)
+def finish_request_in_public_schema(sender, **kwargs):
+    db_connections.reset_schemas()
+
+
+@receiver(connection_created)
+def count_new_connection(sender, connection, **kwargs):
+    db_connections.record_connect(connection.alias)
@@ -0,0 +1,96 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+VERSION_KEY = 'tenant_cache:version'
+
+
+class CachedTenant:
+    """A resolved hostname: the tenant, its Domain row (None for the public fallback) and any per-tenant extras."""
+    __slots__ = ('tenant', 'domain', 'extra', 'expires')
+
+    def __init__(self, tenant, domain, expires):
+        self.tenant = tenant
+        self.domain = domain
+        self.extra = {}
+        self.expires = expires
+
+
+class TenantCache:
+    """
+    In-process LRU of hostname -> CachedTenant with a TTL.
+    Signals clear it locally; other processes notice through a version stamp kept in the shared cache.
+    Without one (TENANT_CACHE_SHARED off) the stamp stays per-process and only the short TTL bounds staleness.
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked = 0
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'TENANT_CACHE_TIMEOUT', 300)
+
+    @property
+    def shared(self):
+        """True when the version stamp reaches every process, so cached data can't outlive a change elsewhere."""
+        return getattr(settings, 'TENANT_CACHE_SHARED', False)
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'TENANT_CACHE_MAX_SIZE', 1000)
+
+    def _sync_version(self, now):
+        """Drops every entry if another worker has bumped the shared version since we last looked."""
+        interval = getattr(settings, 'TENANT_CACHE_VERSION_CHECK', 1)
+        if now - self._version_checked < interval:
+            return
+        self._version_checked = now
+        version = cache.get(VERSION_KEY)
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, hostname):
+        if self.timeout <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._sync_version(now)
+            entry = self._entries.get(hostname)
+            if entry is None:
+                return None
+            if entry.expires < now:
+                del self._entries[hostname]
+                return None
+            self._entries.move_to_end(hostname)
+            return entry
+
+    def set(self, hostname, tenant, domain=None):
+        entry = CachedTenant(tenant, domain, time.monotonic() + self.timeout)
+        if self.timeout <= 0:
+            return entry
+        with self._lock:
+            self._entries[hostname] = entry
+            self._entries.move_to_end(hostname)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self):
+        """Clears this worker's entries and bumps the shared version so every other worker clears theirs."""
+        version = uuid.uuid4().hex
+        cache.set(VERSION_KEY, version, None)
+        with self._lock:
+            self._entries.clear()
+            self._version = version
+            self._version_checked = time.monotonic()
+
+
+tenant_cache = TenantCache()
@@ -0,0 +1,65 @@
+import stripe
+from django.db import connection
+from django.http import HttpResponse
+from django.test import TestCase
+from recruit_saas.benchmarks import (
+    DEFAULT_THRESHOLDS, BenchmarkError, find_regressions, measure, scenario, stripe_signature, SCENARIOS,
+)
+
+
+class BenchmarkTest(TestCase):
+    """
+    Tests the benchmark suite's measurements, its regression check against a baseline
+    and the signed webhook payloads it sends.
+    """
+
+    def tearDown(self):
+        SCENARIOS.pop('test_view', None)
+
+    def test_measure_counts_queries_and_takes_percentiles(self):
+        calls = []
+
+        @scenario('test_view')
+        def view(site, iteration):
+            calls.append(iteration)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.execute("SELECT 2")
+            return HttpResponse('ok')
+
+        result = measure(view, None, iterations=10, warmup=2, traced=2)
+        self.assertEqual(calls, list(range(14)))
+        self.assertEqual((result['iterations'], result['queries']), (10, 2))
+        self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+        self.assertLessEqual(result['p95_ms'], result['max_ms'])
+        self.assertGreater(result['alloc_peak_kb'], 0)
+
+    def test_measure_caps_iterations_and_rejects_error_responses(self):
+        capped = scenario('test_view', max_iterations=3)(lambda site, iteration: HttpResponse('ok'))
+        self.assertEqual(measure(capped, None, iterations=50, traced=1)['iterations'], 3)
+
+        broken = scenario('test_view')(lambda site, iteration: HttpResponse(status=500))
+        with self.assertRaises(BenchmarkError):
+            measure(broken, None, iterations=2)
+
+    def test_regressions_past_the_threshold_are_reported(self):
+        baseline = {'home': {'p95_ms': 20.0, 'queries': 3, 'alloc_peak_kb': 40.0}}
+        results = {
+            'home': {'p95_ms': 30.0, 'queries': 4, 'alloc_peak_kb': 50.0},
+            'new_view': {'p95_ms': 5.0, 'queries': 1},
+        }
+        found = find_regressions(baseline, results, DEFAULT_THRESHOLDS)
+        self.assertEqual(found, [
+            "home p95_ms: 20.0 -> 30.0 (+50%, allowed +25%)",
+            "home queries: 3 -> 4 (+33%, allowed +0%)",
+        ])
+
+    def test_changes_within_the_noise_floor_are_ignored(self):
+        baseline = {'home': {'p50_ms': 0.5, 'p95_ms': 1.0, 'queries': 3}}
+        results = {'home': {'p50_ms': 1.2, 'p95_ms': 2.5, 'queries': 2}}
+        self.assertEqual(find_regressions(baseline, results, DEFAULT_THRESHOLDS), [])
+
+    def test_webhook_signature_is_accepted_by_stripe(self):
+        payload = '{"id": "evt_1", "object": "event", "type": "invoice.payment_failed", "data": {"object": {}}}'
+        event = stripe.Webhook.construct_event(payload, stripe_signature(payload, 'whsec_test'), 'whsec_test')
+        self.assertEqual(event['id'], 'evt_1')
@@ -4,6 +4,7 @@ from django.utils.crypto import get_random_string
 from unittest.mock import patch
 from customers.models import Plan
 from customers.views import create_checkout_session, stripe_webhook
+from customers.webhooks import process_pending_events
 from django_tenants.utils import schema_context, get_public_schema_name
 from django_tenants.test.cases import TenantTestCase
 from django.test import RequestFactory
@@ -51,6 +52,7 @@ class StripeBillingTests(TenantTestCase):
     @patch('stripe.Webhook.construct_event')
     def test_webhook_payment_success_activates_client(self, mock_webhook):
         payload = {
+            'id': 'evt_billing_1',
             'type': 'checkout.session.completed',
             'data': {
                 'object': {
@@ -69,6 +71,7 @@ class StripeBillingTests(TenantTestCase):
         response = stripe_webhook(request)
 
         self.assertEqual(response.status_code, 200)
+        process_pending_events()
         with schema_context(get_public_schema_name()):
             self.tenant.refresh_from_db()
             self.assertTrue(self.tenant.is_active)
@@ -80,6 +83,7 @@ class StripeBillingTests(TenantTestCase):
             self.tenant.save()
 
         payload = {
+            'id': 'evt_billing_2',
             'type': 'invoice.payment_failed',
             'data': {'object': {'customer': 'cus_123'}}
         }
@@ -93,6 +97,7 @@ class StripeBillingTests(TenantTestCase):
         response = stripe_webhook(request)
 
         self.assertEqual(response.status_code, 200)
+        process_pending_events()
         with schema_context(get_public_schema_name()):
             self.tenant.refresh_from_db()
             self.assertFalse(self.tenant.is_active)
@@ -0,0 +1,79 @@
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context
+from cms.models import Job
+from customers.admin import job_counts
+from customers.models import Client
+
+
+class ClientAdminJobCountTest(TenantTestCase):
+    """
+    Tests that the Client changelist fetches job counts and primary domains
+    in a fixed number of queries rather than a couple per tenant.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'admin_counts'
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'admin-counts.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        with schema_context(self.tenant.schema_name):
+            for i in range(3):
+                Job.objects.create(title=f'Job {i}', salary='£30k', location='Leeds', summary='S', description='D')
+        connection.set_schema_to_public()
+        # Provisioned but never migrated, so it has no cms_job table
+        Client.objects.create(schema_name='admin_unmigrated', name='Unmigrated')
+
+    def _changelist(self):
+        request = RequestFactory().get('/admin/customers/client/')
+        request.user = User(is_superuser=True, is_active=True, is_staff=True)
+        return site._registry[Client].get_changelist_instance(request)
+
+    def test_job_counts_skips_unmigrated_schemas(self):
+        counts = job_counts([self.tenant.schema_name, 'admin_unmigrated'])
+        self.assertEqual(counts, {self.tenant.schema_name: 3})
+
+    def _changelist_queries(self):
+        admin = site._registry[Client]
+        with CaptureQueriesContext(connection) as ctx:
+            for client in self._changelist().result_list:
+                admin.get_domain(client)
+                admin.job_count(client)
+        return [q['sql'] for q in ctx.captured_queries if not q['sql'].startswith('SET search_path')]
+
+    def test_changelist_queries_do_not_grow_with_tenants(self):
+        baseline = len(self._changelist_queries())
+        for i in range(3):
+            Client.objects.create(schema_name=f'admin_extra_{i}', name=f'Extra {i}')
+        self.assertEqual(len(self._changelist_queries()), baseline)
+
+    def test_changelist_attaches_job_totals(self):
+        clients = {c.schema_name: c for c in self._changelist().result_list}
+        self.assertEqual(clients[self.tenant.schema_name].job_total, 3)
+        self.assertEqual(clients['admin_unmigrated'].job_total, 0)
+
+    def test_primary_domain_is_prefetched(self):
+        changelist = self._changelist()
+        admin = site._registry[Client]
+        tenant = next(c for c in changelist.result_list if c.pk == self.tenant.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(admin.get_domain(tenant), 'admin-counts.localhost')
+            self.assertEqual(admin.job_count(tenant), 3)
+
+    def tearDown(self):
+        connection.set_schema_to_public()
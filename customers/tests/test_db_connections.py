@@ -0,0 +1,71 @@
+from django.core.signals import request_started
+from django.db import connection
+from django.test import TestCase, override_settings
+from django_tenants.utils import schema_context
+from cms.models import Job
+from customers.db_connections import connection_stats
+from customers.models import Client
+from customers.seeding import seed_tenants
+from customers.tenant_cache import tenant_cache
+
+
+@override_settings(TENANT_TEMPLATE_SCHEMA='_conn_template', SERVER_TIMING_HEADER=True)
+class PersistentConnectionTest(TestCase):
+    """
+    Tests that with connections kept between requests, every request starts and ends on the
+    public schema, so a reused connection never serves one tenant's rows to another.
+    """
+
+    def setUp(self):
+        tenant_cache.invalidate()
+        list(seed_tenants(2, jobs=0, prefix='conn', workers=1))
+        Client.objects.filter(schema_name__startswith='conn_').update(is_active=True)
+        for schema_name, title in (('conn_00000', 'Only At Agency A'), ('conn_00001', 'Only At Agency B')):
+            with schema_context(schema_name):
+                Job.objects.create(title=title, salary='£1', location='Hull', summary='S', description='D')
+        connection.ensure_connection()
+        self.raw_connection = connection.connection
+
+    def tearDown(self):
+        connection.set_schema_to_public()
+
+    def _jobs(self, host):
+        return self.client.get('/jobs/', HTTP_HOST=host, secure=True)
+
+    def test_reused_connection_serves_each_tenant_its_own_jobs(self):
+        reused = connection_stats()['reused']
+        response_a = self._jobs('conn-00000.getpillarpost.com')
+        response_b = self._jobs('conn-00001.getpillarpost.com')
+
+        self.assertContains(response_a, 'Only At Agency A')
+        self.assertNotContains(response_a, 'Only At Agency B')
+        self.assertContains(response_b, 'Only At Agency B')
+        self.assertNotContains(response_b, 'Only At Agency A')
+        # Both requests ran on the one connection, without opening another
+        self.assertIs(connection.connection, self.raw_connection)
+        self.assertIn('conn;desc="0 opened"', response_b['Server-Timing'])
+        self.assertEqual(connection_stats()['reused'], reused + 2)
+
+    def test_requests_end_on_the_public_schema(self):
+        self._jobs('conn-00000.getpillarpost.com')
+
+        self.assertEqual(connection.schema_name, 'public')
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW search_path")
+            self.assertEqual(cursor.fetchone()[0], 'public')
+
+    def test_next_request_starts_on_the_public_schema(self):
+        seen = []
+
+        def before_tenant_middleware(sender, **kwargs):
+            seen.append(connection.schema_name)
+
+        self._jobs('conn-00000.getpillarpost.com')
+        # Leave the connection pointed at the tenant, as an error path or a worker might
+        connection.set_schema('conn_00000')
+        request_started.connect(before_tenant_middleware)
+        try:
+            self._jobs('conn-00001.getpillarpost.com')
+        finally:
+            request_started.disconnect(before_tenant_middleware)
+        self.assertEqual(seen, ['public'])
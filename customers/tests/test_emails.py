@@ -4,8 +4,9 @@ from django.test import RequestFactory
 from django.utils.crypto import get_random_string
 from django_tenants.test.cases import TenantTestCase
 from django_tenants.utils import schema_context, get_public_schema_name
-from customers.models import Client, Domain, Plan
+from customers.models import Client, Domain, Plan, QueuedEmail
 from customers.views import stripe_webhook
+from customers.webhooks import process_pending_events
 
 
 class EmailNotificationTests(TenantTestCase):
@@ -113,14 +114,14 @@ class EmailNotificationTests(TenantTestCase):
 
     # Payment Success Email
 
-    @patch('customers.views.send_mail')
     @patch('stripe.Webhook.construct_event')
-    def test_payment_success_sends_confirmation_email(self, mock_webhook, mock_send_mail):
+    def test_payment_success_sends_confirmation_email(self, mock_webhook):
         """
-        When a payment succeeds, a confirmation email must be sent to
+        When a payment succeeds, a confirmation email must be queued for
         the tenant's notification email containing the portal URL.
         """
         payload = {
+            'id': 'evt_email_success',
             'type': 'checkout.session.completed',
             'data': {
                 'object': {
@@ -137,29 +138,21 @@ class EmailNotificationTests(TenantTestCase):
             content_type='application/json'
         )
         stripe_webhook(request)
+        process_pending_events()
 
-        self.assertTrue(mock_send_mail.called,
-                        "send_mail should be called after a successful payment.")
-
-        call_kwargs = mock_send_mail.call_args
-        positional = call_kwargs[0] if call_kwargs[0] else []
-        kwargs = call_kwargs[1] if call_kwargs[1] else {}
-
-        subject = positional[0] if positional else kwargs.get('subject', '')
-        self.assertIn('Active', subject,
-                      f"Success email subject should confirm activation, got: {subject}")
-
-        recipient_list = positional[3] if len(positional) > 3 else kwargs.get('recipient_list', [])
-        self.assertIn('owner@emailtest.com', recipient_list,
+        queued = QueuedEmail.objects.filter(tenant=self.tenant).first()
+        self.assertIsNotNone(queued, "An email should be queued after a successful payment.")
+        self.assertIn('Active', queued.subject,
+                      f"Success email subject should confirm activation, got: {queued.subject}")
+        self.assertIn('owner@emailtest.com', queued.to,
                       "Success email must be sent to notification_email_1.")
 
     # Payment Failure Email
 
-    @patch('customers.views.send_mail')
     @patch('stripe.Webhook.construct_event')
-    def test_payment_failure_sends_alert_email(self, mock_webhook, mock_send_mail):
+    def test_payment_failure_sends_alert_email(self, mock_webhook):
         """
-        When a payment fails, an alert email must be sent to the
+        When a payment fails, an alert email must be queued for the
         tenant's notification email so they can update their billing details.
         """
         with schema_context(get_public_schema_name()):
@@ -167,6 +160,7 @@ class EmailNotificationTests(TenantTestCase):
             self.tenant.save()
 
         payload = {
+            'id': 'evt_email_failure',
             'type': 'invoice.payment_failed',
             'data': {
                 'object': {
@@ -182,18 +176,11 @@ class EmailNotificationTests(TenantTestCase):
             content_type='application/json'
         )
         stripe_webhook(request)
+        process_pending_events()
 
-        self.assertTrue(mock_send_mail.called,
-                        "send_mail should be called after a payment failure.")
-
-        call_kwargs = mock_send_mail.call_args
-        positional = call_kwargs[0] if call_kwargs[0] else []
-        kwargs = call_kwargs[1] if call_kwargs[1] else {}
-
-        subject = positional[0] if positional else kwargs.get('subject', '')
-        self.assertIn('Payment', subject,
-                      f"Failure email subject should reference payment, got: {subject}")
-
-        recipient_list = positional[3] if len(positional) > 3 else kwargs.get('recipient_list', [])
-        self.assertIn('owner@emailtest.com', recipient_list,
+        queued = QueuedEmail.objects.filter(tenant=self.tenant).first()
+        self.assertIsNotNone(queued, "An email should be queued after a payment failure.")
+        self.assertIn('Payment', queued.subject,
+                      f"Failure email subject should reference payment, got: {queued.subject}")
+        self.assertIn('owner@emailtest.com', queued.to,
                       "Failure email must be sent to notification_email_1.")
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import override_settings
+from django_tenants.test.cases import TenantTestCase
+from customers.migration_executor import ParallelExecutor, get_executor, pending_schemas
+
+
+class ParallelExecutorTest(TenantTestCase):
+    """
+    Tests for `migrate_schemas --executor=parallel`: resuming from unfinished schemas and failing fast.
+    Workers are forked in production; TENANT_MIGRATION_WORKERS=1 runs them inline here.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'migrate_parallel'
+        return tenant
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        connection.set_schema_to_public()
+
+    def test_executor_is_registered(self):
+        self.assertIs(get_executor('parallel'), ParallelExecutor)
+
+    def test_only_unfinished_schemas_are_pending(self):
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE SCHEMA "migrate_half_done"')
+        self.assertEqual(
+            pending_schemas([self.tenant.schema_name, 'migrate_half_done', 'migrate_missing']),
+            ['migrate_half_done', 'migrate_missing'],
+        )
+
+    @override_settings(TENANT_MIGRATION_WORKERS=1, TENANT_TEMPLATE_SCHEMA='')
+    def test_stops_at_first_failure(self):
+        def migrate(args, options, codename, schema_name, **kwargs):
+            if schema_name == 'tenant_b':
+                raise RuntimeError('bad migration')
+
+        executor = ParallelExecutor([], {'verbosity': 0})
+        with patch('customers.migration_executor.run_migrations', side_effect=migrate) as run, \
+                patch('customers.migration_executor.pending_schemas', side_effect=list):
+            with self.assertRaisesMessage(CommandError, "Migrating schema 'tenant_b' failed: bad migration"):
+                executor.run_migrations(['tenant_a', 'tenant_b', 'tenant_c'])
+
+        self.assertEqual([c.args[3] for c in run.call_args_list], ['tenant_a', 'tenant_b'])
+
+    @override_settings(TENANT_TEMPLATE_SCHEMA='')
+    def test_up_to_date_schemas_are_skipped(self):
+        executor = ParallelExecutor([], {'verbosity': 0})
+        with patch('customers.migration_executor.run_migrations') as run:
+            executor.run_migrations([self.tenant.schema_name])
+        run.assert_not_called()
+
+    @override_settings(TENANT_MIGRATION_WORKERS=1, TENANT_TEMPLATE_SCHEMA='_migrate_template')
+    def test_template_schema_is_created_and_migrated_first(self):
+        executor = ParallelExecutor([], {'verbosity': 0})
+        with patch('customers.migration_executor.run_migrations') as run:
+            executor.run_migrations([self.tenant.schema_name])
+        self.assertEqual([c.args[3] for c in run.call_args_list], ['_migrate_template'])
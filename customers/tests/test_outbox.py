@@ -0,0 +1,178 @@
+import os
+from datetime import timedelta
+from unittest.mock import patch
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.urls import clear_url_caches
+from django.utils import timezone
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context, get_public_schema_name
+from cms.models import CompanyProfile, Job
+from cms.views import apply_to_job
+from customers.models import QueuedEmail
+from customers.outbox import enqueue_email, deliver_pending, purge_failed
+
+
+class ApplicationOutboxTest(TenantTestCase):
+    """
+    Tests that job applications are queued instead of sent inside the request,
+    and that the outbox worker delivers them with retries.
+    The test runner's locmem email backend stands in for the SMTP relay.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'outbox_test'
+        tenant.master_email = 'recruiter@outbox.com'
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'outbox-test.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        self.settings_override = override_settings(ROOT_URLCONF='recruit_saas.urls_tenant')
+        self.settings_override.enable()
+        clear_url_caches()
+        with schema_context(self.tenant.schema_name):
+            CompanyProfile.objects.create(tenant_slug=self.tenant.schema_name, display_name='Outbox Ltd')
+            self.job = Job.objects.create(
+                title='Outbox Analyst', salary='£40k', location='York',
+                summary='Role', description='Details',
+            )
+
+    def _apply(self, data):
+        request = RequestFactory().post(f'/jobs/{self.job.pk}/apply/', data)
+        request.tenant = self.tenant
+        request.user = AnonymousUser()
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        request._dont_enforce_csrf_checks = True
+        connection.set_tenant(self.tenant)
+        return apply_to_job(request, pk=self.job.pk)
+
+    def test_application_is_queued_not_sent(self):
+        cv = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 candidate', content_type='application/pdf')
+        response = self._apply({'full_name': 'Ada', 'email': 'ada@example.com', 'cv': cv})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 0)
+        queued = QueuedEmail.objects.get()
+        self.assertEqual(queued.to, ['recruiter@outbox.com'])
+        self.assertEqual(queued.reply_to, ['ada@example.com'])
+        self.assertEqual(bytes(queued.attachment_content), b'%PDF-1.4 candidate')
+
+    def test_worker_delivers_and_removes_application(self):
+        cv = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 candidate', content_type='application/pdf')
+        self._apply({'full_name': 'Ada', 'cv': cv})
+
+        sent, failed = deliver_pending()
+
+        self.assertEqual((sent, failed), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('Outbox Analyst', mail.outbox[0].subject)
+        self.assertEqual(mail.outbox[0].attachments[0][0], 'cv.pdf')
+        self.assertFalse(QueuedEmail.objects.exists())
+
+    def test_worker_on_another_dyno_sends_the_cv_without_the_upload_file(self):
+        """The worker has none of the web dyno's files, so the CV has to come from the queued row."""
+        cv = TemporaryUploadedFile('cv.pdf', 'application/pdf', 18, None)
+        cv.write(b'%PDF-1.4 candidate')
+        cv.seek(0)
+        queued = enqueue_email('Subject', 'Body', ['recruiter@outbox.com'], attachment=cv)
+        path = cv.temporary_file_path()
+        cv.close()
+        self.assertFalse(os.path.exists(path))
+
+        sent, failed = deliver_pending()
+
+        self.assertEqual((sent, failed), (1, 0))
+        self.assertEqual(mail.outbox[0].attachments[0][1], b'%PDF-1.4 candidate')
+        self.assertFalse(QueuedEmail.objects.filter(pk=queued.pk).exists())
+
+    @patch('customers.outbox.ATTACHMENT_CHUNK_SIZE', 4)
+    def test_attachment_is_copied_into_the_row_chunk_by_chunk(self):
+        cv = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 candidate', content_type='application/pdf')
+        queued = enqueue_email('Subject', 'Body', ['recruiter@outbox.com'], attachment=cv)
+
+        self.assertEqual(bytes(queued.attachment_content), b'%PDF-1.4 candidate')
+        self.assertEqual(bytes(QueuedEmail.objects.get(pk=queued.pk).attachment_content), b'%PDF-1.4 candidate')
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        with schema_context(get_public_schema_name()):
+            queued = enqueue_email('Subject', 'Body', ['recruiter@outbox.com'])
+
+        with patch('django.core.mail.EmailMessage.send', side_effect=OSError('relay down')):
+            sent, failed = deliver_pending()
+
+        self.assertEqual((sent, failed), (0, 1))
+        queued.refresh_from_db()
+        self.assertEqual(queued.attempts, 1)
+        self.assertEqual(queued.status, 'pending')
+        self.assertGreater(queued.next_attempt_at, timezone.now())
+        # Not due yet, so the next batch leaves it alone
+        self.assertEqual(deliver_pending(), (0, 0))
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=1)
+    def test_email_is_marked_failed_after_max_attempts(self):
+        cv = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 candidate', content_type='application/pdf')
+        queued = enqueue_email('Subject', 'Body', ['recruiter@outbox.com'], attachment=cv)
+        with patch('django.core.mail.EmailMessage.send', side_effect=OSError('relay down')):
+            deliver_pending()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'failed')
+        # The CV isn't kept once there is no more chance of forwarding it
+        self.assertIsNone(queued.attachment_content)
+
+    def test_failed_emails_are_purged_after_the_retention_period(self):
+        old = enqueue_email('Old', 'Body', ['recruiter@outbox.com'])
+        recent = enqueue_email('Recent', 'Body', ['recruiter@outbox.com'])
+        pending = enqueue_email('Pending', 'Body', ['recruiter@outbox.com'])
+        QueuedEmail.objects.filter(pk__in=[old.pk, recent.pk]).update(status='failed')
+        QueuedEmail.objects.filter(pk__in=[old.pk, pending.pk]).update(created_at=timezone.now() - timedelta(days=30))
+
+        self.assertEqual(purge_failed(days=7), 1)
+        self.assertEqual(
+            sorted(QueuedEmail.objects.values_list('subject', flat=True)), ['Pending', 'Recent']
+        )
+
+    def test_claimed_emails_are_not_due_for_other_workers_while_sending(self):
+        """The claim outlives its short transaction, so another worker skips the batch being sent."""
+        queued = enqueue_email('Subject', 'Body', ['recruiter@outbox.com'])
+        seen = {}
+
+        def send(message, fail_silently=False):
+            seen['due'] = QueuedEmail.objects.filter(pk=queued.pk, next_attempt_at__lte=timezone.now()).exists()
+            return 1
+
+        with patch('django.core.mail.EmailMessage.send', autospec=True, side_effect=send):
+            self.assertEqual(deliver_pending(), (1, 0))
+        self.assertFalse(seen['due'])
+        self.assertFalse(QueuedEmail.objects.filter(pk=queued.pk).exists())
+
+    def test_worker_reuses_one_connection_per_batch(self):
+        for i in range(3):
+            QueuedEmail.objects.create(
+                subject=f'Email {i}', body='Body', from_email='hello@getpillarpost.com',
+                to=['recruiter@outbox.com'], next_attempt_at=timezone.now() - timedelta(seconds=1),
+            )
+        with patch('customers.outbox.get_connection', wraps=mail.get_connection) as mock_connection:
+            sent, _ = deliver_pending()
+        self.assertEqual(sent, 3)
+        self.assertEqual(mock_connection.call_count, 1)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        clear_url_caches()
+        connection.set_schema_to_public()
@@ -0,0 +1,72 @@
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django_tenants.utils import schema_context, get_public_schema_name
+from customers.models import Client, Domain
+from customers.tenant_cache import tenant_cache
+from recruit_saas.debug_middleware import CustomTenantMiddleware
+from recruit_saas.request_metrics import RequestMetricsMiddleware, external_call
+
+
+class RequestMetricsTest(TestCase):
+    """
+    Tests RequestMetricsMiddleware's query, search_path and external call counts,
+    the Server-Timing header and the sampled log line.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with schema_context(get_public_schema_name()):
+            cls.agency = Client.objects.create(schema_name='metrics-agency', name='Metrics Agency')
+            Domain.objects.create(domain='metrics.localhost', tenant=cls.agency, is_primary=True)
+
+    def setUp(self):
+        tenant_cache.invalidate()
+        self.factory = RequestFactory()
+
+    def _view(self, request):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.execute("SELECT 2")
+        with external_call('stripe'):
+            pass
+        return HttpResponse('ok')
+
+    def _middleware(self):
+        tenant_middleware = CustomTenantMiddleware(self._view)
+        return RequestMetricsMiddleware(tenant_middleware)
+
+    def tearDown(self):
+        connection.set_schema_to_public()
+
+    @override_settings(SERVER_TIMING_HEADER=True, REQUEST_METRICS_SAMPLE_RATE=0, REQUEST_METRICS_SLOW_MS=10000)
+    def test_server_timing_counts_queries_switches_and_external_calls(self):
+        response = self._middleware()(self.factory.get('/', HTTP_HOST='metrics.localhost'))
+        timing = response['Server-Timing']
+        # Tenant lookup, then the view's two queries in the tenant's schema
+        self.assertIn('desc="3 queries"', timing)
+        self.assertRegex(timing, r'schema;desc="[1-9]\d* search_path switches, \d+ skipped"')
+        self.assertIn('stripe;dur=', timing)
+        self.assertIn('desc="1 calls"', timing)
+        self.assertTrue(timing.split(', ')[-1].startswith('total;dur='))
+
+    @override_settings(SERVER_TIMING_HEADER=False, REQUEST_METRICS_SAMPLE_RATE=1.0)
+    def test_sampled_request_is_logged_with_schema(self):
+        with self.assertLogs('recruit_saas.requests', level='INFO') as logs:
+            response = self._middleware()(self.factory.get('/jobs/', HTTP_HOST='metrics.localhost'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        line = logs.records[0].getMessage()
+        self.assertTrue(line.startswith('method=GET path=/jobs/ status=200 schema=metrics-agency'))
+        self.assertIn('db_queries=3', line)
+        self.assertRegex(line, r'schema_switches=[1-9]')
+        self.assertEqual(logs.records[0].request_metrics['stripe_calls'], 1)
+        self.assertRegex(line, r'conn_opened_total=\d+ conn_reused_total=\d+ conn_schema_resets_total=\d+ conn_age_s=')
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0, REQUEST_METRICS_SLOW_MS=10000, REQUEST_METRICS_MAX_QUERIES=2)
+    def test_query_heavy_request_is_logged_even_when_unsampled(self):
+        with self.assertLogs('recruit_saas.requests', level='INFO'):
+            self._middleware()(self.factory.get('/', HTTP_HOST='metrics.localhost'))
+
+    def test_external_call_outside_a_request_is_a_no_op(self):
+        with external_call('smtp'):
+            pass
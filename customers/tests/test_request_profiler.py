@@ -0,0 +1,71 @@
+import marshal
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django_tenants.utils import schema_context, get_public_schema_name
+from customers.models import Client, Domain, RequestProfile
+from customers.tenant_cache import tenant_cache
+from recruit_saas.debug_middleware import CustomTenantMiddleware
+from recruit_saas.request_profiler import RequestProfilerMiddleware, make_token
+
+
+@override_settings(PROFILER_PREFER_SAMPLING=False)
+class RequestProfilerTest(TestCase):
+    """
+    Tests that only requests with a valid signed token are profiled, that captures are
+    tagged with the tenant, and that staff can list and download them in the admin.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with schema_context(get_public_schema_name()):
+            cls.agency = Client.objects.create(schema_name='profiled-agency', name='Profiled Agency')
+            Domain.objects.create(domain='profiled.localhost', tenant=cls.agency, is_primary=True)
+
+    def setUp(self):
+        tenant_cache.invalidate()
+        self.factory = RequestFactory()
+        self.middleware = CustomTenantMiddleware(RequestProfilerMiddleware(lambda request: HttpResponse('ok')))
+
+    def _get(self, path, **extra):
+        return self.middleware(self.factory.get(path, HTTP_HOST='profiled.localhost', **extra))
+
+    def test_request_without_token_is_not_profiled(self):
+        response = self._get('/jobs/')
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_tampered_or_other_tenant_tokens_are_ignored(self):
+        self._get('/', HTTP_X_PROFILE_TOKEN=make_token('ops') + 'x')
+        self._get('/', HTTP_X_PROFILE_TOKEN=make_token('ops', schema_name='someone-else'))
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_token_request_is_stored_as_pstats(self):
+        response = self._get('/jobs/', data={'_profile': make_token('ops', schema_name='profiled-agency')})
+        profile = RequestProfile.objects.get(request_id=response['X-Profile-Id'])
+        self.assertEqual((profile.tenant, profile.path, profile.requested_by), (self.agency, '/jobs/', 'ops'))
+        self.assertEqual(profile.format, 'pstats')
+        self.assertIsInstance(marshal.loads(bytes(profile.data)), dict)
+        self.assertIn('cumulative', profile.summary)
+
+    @override_settings(PROFILER_KEEP=2)
+    def test_only_the_latest_captures_are_kept(self):
+        for _ in range(3):
+            self._get('/', HTTP_X_PROFILE_TOKEN=make_token('ops'))
+        self.assertEqual(RequestProfile.objects.count(), 2)
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_public')
+    def test_admin_lists_and_downloads_captures(self):
+        response = self._get('/', HTTP_X_PROFILE_TOKEN=make_token('ops'))
+        profile = RequestProfile.objects.get(request_id=response['X-Profile-Id'])
+        staff = get_user_model().objects.create_superuser('staff', 'staff@example.com', 'pw')
+        self.client.force_login(staff)
+
+        listing = self.client.get(reverse('admin:customers_requestprofile_changelist'))
+        self.assertContains(listing, 'Profiled Agency')
+        self.assertContains(listing, '?_profile=')
+
+        download = self.client.get(reverse('admin:customers_requestprofile_download', args=[profile.pk]))
+        self.assertEqual(download['Content-Disposition'], f'attachment; filename="{profile.request_id}.prof"')
+        self.assertEqual(download.content, bytes(profile.data))
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django_tenants.utils import schema_context
+from cms.models import STARTER_PROFILE, CompanyProfile, Job
+from customers.migration_executor import pending_schemas
+from customers.models import Client
+from customers.schema_clone import SchemaCloner, clone_template_schema, seed_template_schema
+from marketing.services import TenantService
+
+
+def _catalog(schema_name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT tablename FROM pg_tables WHERE schemaname = %s ORDER BY 1", [schema_name])
+        tables = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = %s ORDER BY 1", [schema_name])
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT con.conname FROM pg_constraint con JOIN pg_namespace n ON n.oid = con.connamespace "
+            "WHERE n.nspname = %s ORDER BY 1",
+            [schema_name],
+        )
+        constraints = [row[0] for row in cursor.fetchall()]
+    return tables, indexes, constraints
+
+
+@override_settings(TENANT_TEMPLATE_SCHEMA='_clone_template')
+class SchemaCloneTest(TestCase):
+    """
+    Tests for provisioning tenant schemas by copying the migrated template schema.
+    """
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE SCHEMA "_clone_template"')
+        call_command('migrate_schemas', tenant=True, schema_name='_clone_template', interactive=False, verbosity=0)
+        connection.set_schema_to_public()
+        seed_template_schema()
+
+    def test_clone_matches_template(self):
+        self.assertTrue(clone_template_schema('cloned_agency'))
+
+        self.assertEqual(_catalog('cloned_agency'), _catalog('_clone_template'))
+        # The copied django_migrations rows mark the clone as fully migrated
+        self.assertEqual(pending_schemas(['cloned_agency']), [])
+        with schema_context('cloned_agency'):
+            job = Job.objects.create(title='Clone', salary='£1', location='Hull', summary='S', description='D')
+            self.assertEqual(job.pk, 1)
+            # The search trigger and its function came across too
+            self.assertTrue(Job.objects.filter(pk=job.pk, search_vector__isnull=False).exists())
+        with schema_context('_clone_template'):
+            self.assertFalse(Job.objects.exists())
+
+    def test_clone_starts_with_the_template_profile(self):
+        self.assertTrue(clone_template_schema('cloned_agency'))
+
+        with schema_context('cloned_agency'):
+            profile = CompanyProfile.objects.get()
+            self.assertEqual(profile.tenant_slug, 'cloned_agency')
+            self.assertEqual(profile.hero_title, STARTER_PROFILE['hero_title'])
+            # The copied identity sequence carries on after the copied row
+            self.assertGreater(CompanyProfile.objects.create(display_name='Second').pk, profile.pk)
+        with schema_context('_clone_template'):
+            self.assertIsNone(CompanyProfile.objects.get().tenant_slug)
+
+    @override_settings(TENANT_TEMPLATE_SCHEMA='_stale_template')
+    def test_outdated_template_is_not_used(self):
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE SCHEMA "_stale_template"')
+        self.assertIsNone(SchemaCloner.for_template())
+        self.assertFalse(clone_template_schema('cloned_agency'))
+
+    def test_signup_clones_instead_of_migrating(self):
+        with patch.object(Client, 'create_schema') as create_schema:
+            results = TenantService.create_agency_tenants(
+                ['North Branch', 'South Branch'], 'group@agency.com', 'SecurePassword123!',
+            )
+
+        create_schema.assert_not_called()
+        self.assertEqual([domain for _, domain in results],
+                         ['north-branch.getpillarpost.com', 'south-branch.getpillarpost.com'])
+        with schema_context('south_branch'):
+            self.assertEqual(CompanyProfile.objects.get().display_name, 'South Branch')
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+from django.db import connection
+from django.test import TestCase
+from django_tenants.utils import schema_context, schema_exists
+from cms.models import CompanyProfile
+from customers.models import Client, PooledSchema
+from customers.schema_pool import claim_schema, fill_pool
+from marketing.services import TenantService
+
+
+class SchemaPoolTest(TestCase):
+    """
+    Tests for the pre-migrated schema pool used by signup.
+    """
+
+    def test_fill_pool_creates_migrated_schemas(self):
+        self.assertEqual(fill_pool(size=1), 1)
+        entry = PooledSchema.objects.get()
+        self.assertTrue(schema_exists(entry.schema_name))
+        with schema_context(entry.schema_name):
+            self.assertEqual(CompanyProfile.objects.count(), 0)
+        # Already full
+        self.assertEqual(fill_pool(size=1), 0)
+
+    def test_signup_claims_pooled_schema(self):
+        fill_pool(size=1)
+        pooled = PooledSchema.objects.get().schema_name
+
+        with patch.object(Client, 'create_schema') as create_schema:
+            tenant, domain_name = TenantService.create_onboarding_tenant(
+                company_name='Pool Agency', admin_email='admin@pool.com', password='SecurePassword123!',
+            )
+
+        create_schema.assert_not_called()
+        self.assertEqual(domain_name, 'pool-agency.getpillarpost.com')
+        self.assertFalse(PooledSchema.objects.exists())
+        self.assertFalse(schema_exists(pooled))
+        with schema_context(tenant.schema_name):
+            self.assertEqual(CompanyProfile.objects.get().display_name, 'Pool Agency')
+
+    def test_stale_schemas_are_not_claimed(self):
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE SCHEMA "pool_stale"')
+        PooledSchema.objects.create(schema_name='pool_stale', fingerprint='older-migrations')
+        self.assertFalse(claim_schema('stale_agency'))
+        self.assertTrue(schema_exists('pool_stale'))
+
+    def test_claim_from_empty_pool_leaves_signup_to_migrate(self):
+        self.assertFalse(claim_schema('fresh_agency'))
+        self.assertFalse(schema_exists('fresh_agency'))
@@ -0,0 +1,69 @@
+from django.db import connection, transaction
+from django.test import TestCase
+from django_tenants.utils import schema_context
+
+
+class SearchPathTrackingTest(TestCase):
+    """
+    Tests that the database backend only sends SET search_path when the session's path has to
+    change, and sends it again after anything that may have undone it.
+    """
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE SCHEMA "path_a"')
+            cursor.execute('CREATE SCHEMA "path_b"')
+        self.statements = []
+
+    def tearDown(self):
+        connection.set_schema_to_public()
+
+    def _record(self, execute, sql, params, many, context):
+        self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def _sets(self):
+        return [sql for sql in self.statements if sql.startswith('SET search_path')]
+
+    def _search_path(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW search_path")
+            return cursor.fetchone()[0]
+
+    def test_repeated_schema_context_for_the_current_schema_sets_nothing(self):
+        with connection.execute_wrapper(self._record):
+            with schema_context('path_a'):
+                self._search_path()
+                with schema_context('path_a'):
+                    self.assertEqual(self._search_path(), 'path_a, public')
+                    with schema_context('path_a'):
+                        self._search_path()
+                self._search_path()
+        self.assertEqual(self._sets(), ["SET search_path = 'path_a','public'"])
+
+    def test_each_schema_change_sets_the_path(self):
+        sets = connection.search_path_sets
+        skipped = connection.search_path_skips
+        with connection.execute_wrapper(self._record):
+            with schema_context('path_a'):
+                self._search_path()
+            with schema_context('path_b'):
+                self.assertEqual(self._search_path(), 'path_b, public')
+            self.assertEqual(self._search_path(), 'public')
+        self.assertEqual(len(self._sets()), 3)
+        self.assertEqual(connection.search_path_sets - sets, 3)
+        self.assertEqual(connection.search_path_skips - skipped, 0)
+
+    def test_rolled_back_switch_is_set_again(self):
+        with connection.execute_wrapper(self._record):
+            try:
+                with transaction.atomic():
+                    # The SET for path_a happens inside the savepoint, and is undone with it
+                    connection.set_schema('path_a')
+                    self._search_path()
+                    raise ValueError
+            except ValueError:
+                pass
+            self.assertEqual(self._search_path(), 'path_a, public')
+        rollback = next(i for i, sql in enumerate(self.statements) if sql.startswith('ROLLBACK TO SAVEPOINT'))
+        self.assertIn("SET search_path = 'path_a','public'", self.statements[rollback + 1:])
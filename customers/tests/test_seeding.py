@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django_tenants.utils import schema_context, get_public_schema_name
+from cms.models import CompanyProfile, Job
+from customers.models import Client, Domain
+from customers.seeding import insert_tenant_rows, seed_tenants, seed_tenants_spec
+from customers.tenant_cache import tenant_cache
+from recruit_saas.debug_middleware import CustomTenantMiddleware
+from marketing.models import PublicJobIndex
+
+
+@override_settings(TENANT_TEMPLATE_SCHEMA='_seed_template')
+class SeedTenantsTest(TestCase):
+    """
+    Tests bulk seeding of synthetic tenants from the template schema, and that it's
+    deterministic and resumable.
+    """
+
+    def test_seeds_tenants_with_domains_users_profiles_and_jobs(self):
+        results = list(seed_tenants(3, jobs=4, prefix='load', workers=1))
+
+        self.assertEqual(sorted(name for name, _ in results), ['load_00000', 'load_00001', 'load_00002'])
+        self.assertFalse(any(isinstance(outcome, Exception) for _, outcome in results))
+        self.assertEqual(Domain.objects.filter(domain__startswith='load-', is_primary=True).count(), 3)
+        with schema_context('load_00001'):
+            self.assertTrue(get_user_model().objects.get(email='owner@load-00001.example.com').check_password('seed-Password-1'))
+            self.assertEqual(CompanyProfile.objects.get().tenant_slug, 'load_00001')
+            self.assertEqual(Job.objects.filter(search_vector__isnull=False).count(), 4)
+        self.assertEqual(PublicJobIndex.objects.filter(tenant__schema_name__startswith='load_').count(), 12)
+
+    def test_rerun_only_adds_the_missing_tenants(self):
+        list(seed_tenants(2, jobs=1, prefix='load', workers=1))
+        results = list(seed_tenants(3, jobs=1, prefix='load', workers=1))
+
+        self.assertEqual([name for name, _ in results], ['load_00002'])
+        self.assertEqual(Client.objects.filter(schema_name__startswith='load_').count(), 3)
+
+    def test_same_seed_gives_the_same_tenants(self):
+        self.assertEqual(seed_tenants_spec(5, 'load', seed=7), seed_tenants_spec(5, 'load', seed=7))
+        self.assertNotEqual(
+            [t.name for t in seed_tenants_spec(5, 'load', seed=7)],
+            [t.name for t in seed_tenants_spec(5, 'load', seed=8)],
+        )
+        with self.assertRaises(ValueError):
+            seed_tenants_spec(1, 'Bad_Prefix')
+
+    def test_seeded_host_replaces_a_cached_unknown_host(self):
+        """A host looked up before it was seeded must not stay cached as the public fallback."""
+        with schema_context(get_public_schema_name()):
+            Client.objects.get_or_create(schema_name='public', defaults={'name': 'Public'})
+        tenant_cache.invalidate()
+        middleware = CustomTenantMiddleware(lambda request: None)
+        spec = seed_tenants_spec(1, 'cached')
+        self.assertEqual(middleware.get_tenant(Domain, spec[0].domain).schema_name, 'public')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            insert_tenant_rows(spec)
+
+        self.assertEqual(middleware.get_tenant(Domain, spec[0].domain).schema_name, 'cached_00000')
+        tenant_cache.invalidate()
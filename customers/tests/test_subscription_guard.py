@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+from django_tenants.utils import schema_context, get_public_schema_name
+from customers.models import Client, Domain
+from customers.tenant_cache import tenant_cache
+from recruit_saas.debug_middleware import CustomTenantMiddleware, SubscriptionGuardMiddleware
+
+
+class SubscriptionGuardTest(TestCase):
+    """
+    Tests SubscriptionGuardMiddleware's allowlist and the access decision
+    it caches next to the resolved tenant.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with schema_context(get_public_schema_name()):
+            cls.expired = Client.objects.create(
+                schema_name='guard-expired', name='Expired Agency',
+                trial_ends=date.today() - timedelta(days=1),
+            )
+            Domain.objects.create(domain='guard-expired.localhost', tenant=cls.expired, is_primary=True)
+            cls.trialing = Client.objects.create(schema_name='guard-trial', name='Trial Agency')
+            Domain.objects.create(domain='guard-trial.localhost', tenant=cls.trialing, is_primary=True)
+
+    def setUp(self):
+        tenant_cache.invalidate()
+        self.factory = RequestFactory()
+        self.tenant_middleware = CustomTenantMiddleware(lambda request: None)
+        self.guard = SubscriptionGuardMiddleware(lambda request: HttpResponse('ok'))
+
+    def _request(self, host, path='/'):
+        request = self.factory.get(path, HTTP_HOST=host)
+        self.tenant_middleware.process_request(request)
+        return request
+
+    def test_expired_tenant_is_redirected_to_checkout(self):
+        response = self.guard(self._request('guard-expired.localhost'))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], '/billing/upgrade/')
+
+    def test_blocked_redirect_is_served_without_queries(self):
+        """Once the tenant and its decision are cached, the redirect costs nothing, with or without a shared cache."""
+        self.guard(self._request('guard-expired.localhost'))
+        with self.assertNumQueries(0):
+            response = self.guard(self._request('guard-expired.localhost', '/jobs/'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_billing_and_login_paths_are_always_allowed(self):
+        for path in ('/billing/upgrade/', '/billing/portal/', '/login/', '/logout/'):
+            response = self.guard(self._request('guard-expired.localhost', path))
+            self.assertEqual(response.status_code, 200, path)
+
+    def test_tenant_on_trial_is_let_through(self):
+        response = self.guard(self._request('guard-trial.localhost'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_activating_tenant_refreshes_cached_decision(self):
+        self.guard(self._request('guard-expired.localhost'))
+        with schema_context(get_public_schema_name()):
+            self.expired.is_active = True
+            self.expired.save()
+        response = self.guard(self._request('guard-expired.localhost'))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(TENANT_CACHE_SHARED=False)
+    def test_payment_applied_by_another_process_is_seen_once_the_entry_expires(self):
+        """Without a shared stamp the cached decision lasts only as long as the short local TTL."""
+        self.guard(self._request('guard-expired.localhost'))
+        with schema_context(get_public_schema_name()):
+            # update() sends no signals, like a save in the stripe_worker as seen from this process
+            Client.objects.filter(pk=self.expired.pk).update(is_active=True)
+        self.assertEqual(self.guard(self._request('guard-expired.localhost')).status_code, 302)
+        tenant_cache.get('guard-expired.localhost').expires = 0
+        self.assertEqual(self.guard(self._request('guard-expired.localhost')).status_code, 200)
+
+    def tearDown(self):
+        tenant_cache.invalidate()
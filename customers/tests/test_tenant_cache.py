@@ -0,0 +1,99 @@
+from django.db import connection
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django_tenants.utils import schema_context, get_public_schema_name
+from customers.models import Client, Domain
+from customers.tenant_cache import VERSION_KEY, tenant_cache
+from recruit_saas.debug_middleware import CustomTenantMiddleware
+
+
+def _lookups(queries):
+    """Ignores the SET search_path statements django-tenants issues per cursor."""
+    return [q for q in queries if not q['sql'].startswith('SET search_path')]
+
+
+class TenantCacheTest(TestCase):
+    """
+    Tests the hostname -> tenant cache used by CustomTenantMiddleware.
+    Clients and Domains live in the public schema, so plain TestCase is enough.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with schema_context(get_public_schema_name()):
+            cls.public_tenant, _ = Client.objects.get_or_create(
+                schema_name='public',
+                defaults={'name': 'Public'},
+            )
+            cls.agency = Client.objects.create(schema_name='cache-agency', name='Cache Agency')
+            Domain.objects.create(domain='cache-agency.localhost', tenant=cls.agency, is_primary=True)
+
+    def setUp(self):
+        tenant_cache.invalidate()
+        self.middleware = CustomTenantMiddleware(lambda request: None)
+
+    def test_second_lookup_hits_no_database(self):
+        """Once a hostname is resolved, later requests for it cost zero queries."""
+        with CaptureQueriesContext(connection) as ctx:
+            tenant = self.middleware.get_tenant(Domain, 'cache-agency.localhost')
+        self.assertEqual(len(_lookups(ctx.captured_queries)), 1)
+        with self.assertNumQueries(0):
+            cached = self.middleware.get_tenant(Domain, 'cache-agency.localhost:8000')
+        self.assertEqual(tenant.pk, self.agency.pk)
+        self.assertEqual(cached.pk, self.agency.pk)
+
+    def test_each_request_gets_its_own_copy(self):
+        """Changes a view makes to request.tenant must not leak into the cached instance."""
+        first = self.middleware.get_tenant(Domain, 'cache-agency.localhost')
+        first.master_email = 'changed@agency.com'
+        second = self.middleware.get_tenant(Domain, 'cache-agency.localhost')
+        self.assertIsNot(first, second)
+        self.assertIsNone(second.master_email)
+
+    def test_unknown_host_falls_back_to_public_with_one_query(self):
+        """A miss costs one lookup for the public tenant, then nothing."""
+        with CaptureQueriesContext(connection) as ctx:
+            tenant = self.middleware.get_tenant(Domain, 'unknown.localhost')
+        self.assertEqual(len(_lookups(ctx.captured_queries)), 2)
+        self.assertEqual(tenant.schema_name, 'public')
+        with self.assertNumQueries(0):
+            self.middleware.get_tenant(Domain, 'unknown.localhost')
+
+    def test_saving_client_invalidates_cache(self):
+        """A post_save on Client drops cached lookups so the next request sees fresh data."""
+        self.middleware.get_tenant(Domain, 'cache-agency.localhost')
+        with schema_context(get_public_schema_name()):
+            self.agency.is_active = True
+            self.agency.save()
+        with CaptureQueriesContext(connection) as ctx:
+            tenant = self.middleware.get_tenant(Domain, 'cache-agency.localhost')
+        self.assertEqual(len(_lookups(ctx.captured_queries)), 1)
+        self.assertTrue(tenant.is_active)
+
+    def test_deleting_domain_invalidates_cache(self):
+        """Removing a Domain means the host no longer resolves to that tenant."""
+        self.middleware.get_tenant(Domain, 'cache-agency.localhost')
+        with schema_context(get_public_schema_name()):
+            Domain.objects.filter(domain='cache-agency.localhost').delete()
+        tenant = self.middleware.get_tenant(Domain, 'cache-agency.localhost')
+        self.assertEqual(tenant.schema_name, 'public')
+
+    @override_settings(TENANT_CACHE_VERSION_CHECK=0)
+    def test_version_bumped_by_another_process_drops_entries(self):
+        """A stamp written to the shared cache elsewhere (e.g. by the stripe_worker) clears this process's copy."""
+        self.middleware.get_tenant(Domain, 'cache-agency.localhost')
+        cache.set(VERSION_KEY, 'bumped-elsewhere', None)
+        with CaptureQueriesContext(connection) as ctx:
+            self.middleware.get_tenant(Domain, 'cache-agency.localhost')
+        self.assertEqual(len(_lookups(ctx.captured_queries)), 1)
+
+    def test_request_resolves_cached_tenant(self):
+        """The full process_request path attaches the cached tenant and tenant URLconf."""
+        request = RequestFactory().get('/', HTTP_HOST='cache-agency.localhost')
+        self.middleware.process_request(request)
+        self.assertEqual(request.tenant.schema_name, 'cache-agency')
+        self.assertEqual(request.urlconf, 'recruit_saas.urls_tenant')
+
+    def tearDown(self):
+        tenant_cache.invalidate()
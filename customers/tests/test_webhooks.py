@@ -1,9 +1,12 @@
 import json
 from unittest.mock import patch
 from django.test import RequestFactory
+from django.utils import timezone
 from django_tenants.test.cases import TenantTestCase
 from django_tenants.utils import schema_context, get_public_schema_name
+from customers.models import QueuedEmail, StripeEvent
 from customers.views import stripe_webhook
+from customers.webhooks import process_pending_events
 
 
 class StripeWebhookTests(TenantTestCase):
@@ -33,6 +36,7 @@ class StripeWebhookTests(TenantTestCase):
     @patch('stripe.Webhook.construct_event')
     def test_webhook_payment_success_activates_client(self, mock_webhook):
         payload = {
+            "id": "evt_webhook_1",
             "type": "checkout.session.completed",
             "data": {
                 "object": {
@@ -50,6 +54,7 @@ class StripeWebhookTests(TenantTestCase):
         mock_webhook.return_value = payload
         response = stripe_webhook(request)
         self.assertEqual(response.status_code, 200)
+        process_pending_events()
         with schema_context(get_public_schema_name()):
             self.tenant.refresh_from_db()
             self.assertTrue(self.tenant.is_active)
@@ -61,6 +66,7 @@ class StripeWebhookTests(TenantTestCase):
             self.tenant.save()
 
         payload = {
+            "id": "evt_webhook_2",
             "type": "invoice.payment_failed",
             "data": {"object": {"customer": "cus_webhook_123"}}
         }
@@ -73,6 +79,87 @@ class StripeWebhookTests(TenantTestCase):
         mock_webhook.return_value = payload
         response = stripe_webhook(request)
         self.assertEqual(response.status_code, 200)
+        process_pending_events()
         with schema_context(get_public_schema_name()):
             self.tenant.refresh_from_db()
             self.assertFalse(self.tenant.is_active)
+
+    def _post(self, mock_webhook, payload):
+        mock_webhook.return_value = payload
+        request = self.factory.post(
+            '/customers/stripe-webhook/',
+            data=json.dumps(payload),
+            content_type="application/json"
+        )
+        return stripe_webhook(request)
+
+    @patch('stripe.Webhook.construct_event')
+    def test_webhook_records_event_without_processing(self, mock_webhook):
+        """The webhook answers 200 straight away; subscription changes wait for the worker."""
+        response = self._post(mock_webhook, {
+            "id": "evt_deferred",
+            "type": "checkout.session.completed",
+            "data": {"object": {"customer": "cus_webhook_123", "metadata": {"tenant_id": str(self.tenant.id)}}}
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(StripeEvent.objects.get(pk="evt_deferred").status, "pending")
+        with schema_context(get_public_schema_name()):
+            self.tenant.refresh_from_db()
+            self.assertFalse(self.tenant.is_active)
+
+    @patch('stripe.Webhook.construct_event')
+    def test_duplicate_event_is_applied_once(self, mock_webhook):
+        """Stripe retries deliver the same event id again; it must only email once."""
+        with schema_context(get_public_schema_name()):
+            self.tenant.notification_email_1 = "owner@webhook.com"
+            self.tenant.save()
+        payload = {
+            "id": "evt_duplicate",
+            "type": "checkout.session.completed",
+            "data": {"object": {"customer": "cus_webhook_123", "metadata": {"tenant_id": str(self.tenant.id)}}}
+        }
+        self._post(mock_webhook, payload)
+        process_pending_events()
+        self._post(mock_webhook, payload)
+        process_pending_events()
+        self.assertEqual(StripeEvent.objects.filter(pk="evt_duplicate").count(), 1)
+        self.assertEqual(QueuedEmail.objects.filter(tenant=self.tenant).count(), 1)
+
+    @patch('stripe.Webhook.construct_event')
+    def test_events_are_applied_in_order_per_customer(self, mock_webhook):
+        """A payment failure created after the checkout must win, whatever order they arrive in."""
+        self._post(mock_webhook, {
+            "id": "evt_later", "created": 2000,
+            "type": "invoice.payment_failed",
+            "data": {"object": {"customer": "cus_webhook_123"}}
+        })
+        self._post(mock_webhook, {
+            "id": "evt_earlier", "created": 1000,
+            "type": "checkout.session.completed",
+            "data": {"object": {"customer": "cus_webhook_123", "metadata": {"tenant_id": str(self.tenant.id)}}}
+        })
+        process_pending_events()
+        process_pending_events()
+        with schema_context(get_public_schema_name()):
+            self.tenant.refresh_from_db()
+            self.assertFalse(self.tenant.is_active)
+        self.assertFalse(StripeEvent.objects.filter(status="pending").exists())
+
+    @patch('stripe.Webhook.construct_event')
+    def test_failed_event_backs_off_before_retrying(self, mock_webhook):
+        """A transient failure must not use up every attempt within a few polls."""
+        self._post(mock_webhook, {
+            "id": "evt_flaky",
+            "type": "invoice.payment_failed",
+            "data": {"object": {"customer": "cus_webhook_123"}}
+        })
+        with patch('customers.webhooks.Client.objects.filter', side_effect=OSError('database blip')):
+            self.assertEqual(process_pending_events(), (0, 1))
+        event = StripeEvent.objects.get(pk="evt_flaky")
+        self.assertEqual((event.status, event.attempts), ("pending", 1))
+        self.assertGreater(event.next_attempt_at, timezone.now())
+        # Not due yet, so the next poll leaves it alone
+        self.assertEqual(process_pending_events(), (0, 0))
+
+        StripeEvent.objects.filter(pk="evt_flaky").update(next_attempt_at=timezone.now())
+        self.assertEqual(process_pending_events(), (1, 0))
@@ -0,0 +1,139 @@
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Client, StripeEvent
+from .outbox import enqueue_email
+from .queueing import retry_delay
+
+
+# Stripe event type -> handler(event_object). Register more with @webhook_handler.
+HANDLERS = {}
+
+
+def webhook_handler(event_type):
+    def register(func):
+        HANDLERS[event_type] = func
+        return func
+    return register
+
+
+def _notify(client, subject, body):
+    if client.notification_email_1:
+        enqueue_email(subject=subject, body=body, to=[client.notification_email_1], tenant=client)
+
+
+def _portal_url(client):
+    domain = client.domains.filter(is_primary=True).first()
+    return f"https://{domain.domain}/login/" if domain else "https://getpillarpost.com"
+
+
+@webhook_handler('checkout.session.completed')
+def handle_checkout_completed(session):
+    tenant_id = session.get('metadata', {}).get('tenant_id')
+    if not tenant_id:
+        return
+    client = Client.objects.get(id=tenant_id)
+    client.is_active = True
+    client.save()
+    _notify(
+        client,
+        subject="Subscription Active!",
+        body=f"Hi {client.name},\n\nYour Standard Plan is now active! You can access your portal here: {_portal_url(client)}",
+    )
+
+
+@webhook_handler('invoice.payment_failed')
+def handle_payment_failed(invoice):
+    customer_id = invoice.get('customer')
+    if not customer_id:
+        return
+    client = Client.objects.filter(stripe_customer_id=customer_id).first()
+    if client is None:
+        return
+    client.is_active = False
+    client.save()
+    _notify(
+        client,
+        subject="Action Required: Payment Failed",
+        body=f"Hi {client.name}, we were unable to process your payment. Please log in to update your billing.",
+    )
+
+
+def record_event(event, raw_payload):
+    """
+    Stores a verified event for later processing and returns it, or None if no handler wants it.
+    Duplicate deliveries of the same event id leave the original row untouched.
+    """
+    if event['type'] not in HANDLERS:
+        return None
+    obj = event['data']['object']
+    created = event.get('created')
+    stored, _ = StripeEvent.objects.get_or_create(
+        event_id=event['id'],
+        defaults={
+            'type': event['type'],
+            'customer_id': obj.get('customer') or '',
+            'payload': json.loads(raw_payload),
+            'created': datetime.fromtimestamp(created, tz=dt_timezone.utc) if created else timezone.now(),
+        },
+    )
+    return stored
+
+
+def _process_event(event_id):
+    """Returns True if processed, False if the handler failed, None if the event was skipped."""
+    max_attempts = getattr(settings, 'STRIPE_EVENT_MAX_ATTEMPTS', 5)
+    base_delay = getattr(settings, 'STRIPE_EVENT_RETRY_DELAY', 60)
+    with transaction.atomic():
+        event = (
+            StripeEvent.objects.select_for_update(skip_locked=True)
+            .filter(pk=event_id, status='pending', next_attempt_at__lte=timezone.now()).first()
+        )
+        if event is None:
+            # Another worker holds it, it has already been handled, or it is waiting to be retried
+            return None
+        if event.customer_id and StripeEvent.objects.filter(
+            customer_id=event.customer_id, status='pending', created__lt=event.created
+        ).exists():
+            # An earlier event for this customer has to be applied first
+            return None
+
+        try:
+            # The handler's effects (including queued emails) commit together with the 'processed' mark
+            with transaction.atomic():
+                HANDLERS[event.type](event.payload['data']['object'])
+        except Exception as e:
+            event.attempts += 1
+            event.last_error = str(e)
+            if event.attempts >= max_attempts:
+                event.status = 'failed'
+            else:
+                event.next_attempt_at = timezone.now() + retry_delay(event.attempts, base_delay)
+            event.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+            return False
+
+        event.status = 'processed'
+        event.processed_at = timezone.now()
+        event.save(update_fields=['status', 'processed_at'])
+        return True
+
+
+def process_pending_events(batch_size=None):
+    """Applies one batch of due pending events, oldest first, and returns (processed, failed)."""
+    batch_size = batch_size or getattr(settings, 'STRIPE_EVENT_BATCH_SIZE', 100)
+    event_ids = list(
+        StripeEvent.objects.filter(status='pending', next_attempt_at__lte=timezone.now())
+        .values_list('event_id', flat=True)[:batch_size]
+    )
+    processed = failed = 0
+    for event_id in event_ids:
+        outcome = _process_event(event_id)
+        if outcome is True:
+            processed += 1
+        elif outcome is False:
+            failed += 1
+    return processed, failed
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import PublicJobIndex
+
+
+@admin.register(PublicJobIndex)
+class PublicJobIndexAdmin(admin.ModelAdmin):
+    list_display = ("title", "agency_name", "location", "job_id", "created_at")
+    search_fields = ("title", "agency_name")
+    exclude = ("search_vector",)
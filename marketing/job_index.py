@@ -0,0 +1,83 @@
+from django.db import connection
+from django_tenants.utils import get_public_schema_name
+
+from cms.models import Job
+from customers.models import Domain
+from .models import PublicJobIndex
+
+
+def _quote(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+def _index_table():
+    return f"{_quote(get_public_schema_name())}.{_quote(PublicJobIndex._meta.db_table)}"
+
+
+def _jobs_table(schema_name):
+    return f"{_quote(schema_name)}.{_quote(Job._meta.db_table)}"
+
+
+_UPSERT_SQL = """
+INSERT INTO {index} (tenant_id, job_id, title, location, salary, summary, created_at, search_vector,
+                     agency_name, portal_domain)
+SELECT %s, j.id, j.title, j.location, j.salary, j.summary, j.created_at, j.search_vector, %s, %s
+FROM {jobs} AS j {where}
+ON CONFLICT (tenant_id, job_id) DO UPDATE SET
+    title = EXCLUDED.title, location = EXCLUDED.location, salary = EXCLUDED.salary,
+    summary = EXCLUDED.summary, created_at = EXCLUDED.created_at, search_vector = EXCLUDED.search_vector,
+    agency_name = EXCLUDED.agency_name, portal_domain = EXCLUDED.portal_domain
+"""
+
+
+def _portal(schema_name):
+    """(tenant id, name, primary domain) for the schema, or None if it has no public portal."""
+    return (
+        Domain.objects.filter(tenant__schema_name=schema_name, is_primary=True)
+        .values_list('tenant_id', 'tenant__name', 'domain').first()
+    )
+
+
+def index_job(schema_name, job_id):
+    """Copies one job (and the vector its trigger just computed) into the public index."""
+    portal = _portal(schema_name)
+    if portal is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _UPSERT_SQL.format(index=_index_table(), jobs=_jobs_table(schema_name), where="WHERE j.id = %s"),
+            [*portal, job_id],
+        )
+
+
+def unindex_job(schema_name, job_id):
+    PublicJobIndex.objects.filter(tenant__schema_name=schema_name, job_id=job_id).delete()
+
+
+def refresh_portal(tenant):
+    """Rewrites the denormalised agency name and domain after the tenant or its primary domain changes."""
+    portal = _portal(tenant.schema_name)
+    if portal is not None:
+        PublicJobIndex.objects.filter(tenant_id=portal[0]).update(agency_name=portal[1], portal_domain=portal[2])
+
+
+def reconcile_tenant(schema_name):
+    """
+    Brings the tenant's index rows in line with its cms_job table with one upsert and one delete,
+    catching changes the signals never saw (queryset updates, raw SQL, restores).
+    Returns the number of jobs indexed.
+    """
+    portal = _portal(schema_name)
+    if portal is None:
+        PublicJobIndex.objects.filter(tenant__schema_name=schema_name).delete()
+        return 0
+    jobs = _jobs_table(schema_name)
+    with connection.cursor() as cursor:
+        cursor.execute(_UPSERT_SQL.format(index=_index_table(), jobs=jobs, where=""), portal)
+        indexed = cursor.rowcount
+        cursor.execute(
+            f"DELETE FROM {_index_table()} AS i WHERE i.tenant_id = %s "
+            f"AND NOT EXISTS (SELECT 1 FROM {jobs} AS j WHERE j.id = i.job_id)",
+            [portal[0]],
+        )
+    return indexed
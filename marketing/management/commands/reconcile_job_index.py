@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django_tenants.utils import get_public_schema_name
+
+from cms.models import Job
+from customers.models import Client
+from marketing.job_index import reconcile_tenant
+from marketing.models import PublicJobIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the marketplace's PublicJobIndex rows from each tenant's jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('-s', '--schema', dest='schema_name', help="Reconcile a single tenant schema.")
+
+    def handle(self, *args, **options):
+        schemas = Client.objects.exclude(schema_name=get_public_schema_name()).values_list('schema_name', flat=True)
+        if options['schema_name']:
+            schemas = schemas.filter(schema_name=options['schema_name'])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT table_schema FROM information_schema.tables WHERE table_name = %s AND table_schema = ANY(%s)",
+                [Job._meta.db_table, list(schemas)],
+            )
+            migrated = sorted(row[0] for row in cursor.fetchall())
+
+        total = 0
+        for schema_name in migrated:
+            total += reconcile_tenant(schema_name)
+        self.stdout.write(f"Job index: {total} job(s) across {len(migrated)} tenant(s)")
+        if not options['schema_name']:
+            # Tenants that were deleted or never migrated keep no rows
+            PublicJobIndex.objects.exclude(tenant__schema_name__in=migrated).delete()
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-18 12:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('customers', '0005_pooledschema'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicJobIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.BigIntegerField()),
+                ('title', models.CharField(max_length=150)),
+                ('location', models.CharField(max_length=100)),
+                ('salary', models.CharField(max_length=100)),
+                ('summary', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField()),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+                ('agency_name', models.CharField(max_length=100)),
+                ('portal_domain', models.CharField(max_length=253)),
+                ('tenant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indexed_jobs', to='customers.client')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='publicjob_created_id_idx'), django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='publicjob_search_vector_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tenant', 'job_id'), name='publicjobindex_tenant_job_uniq')],
+            },
+        ),
+    ]
@@ -1,3 +1,41 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from customers.models import Client
 
 
-# Create your models here.
+class PublicJobIndex(models.Model):
+    """
+    A copy of every tenant's jobs in the public schema, so the marketplace on getpillarpost.com
+    reads one table instead of visiting each tenant schema. Kept current by the cms Job signals
+    (see marketing.job_index) and `manage.py reconcile_job_index`.
+    """
+    tenant = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='indexed_jobs')
+    job_id = models.BigIntegerField()
+    title = models.CharField(max_length=150)
+    location = models.CharField(max_length=100)
+    salary = models.CharField(max_length=100)
+    summary = models.CharField(max_length=255)
+    created_at = models.DateTimeField()
+    # The tenant job's own weighted vector, description included
+    search_vector = SearchVectorField(null=True)
+    # Denormalised from the tenant for rendering, refreshed when the Client or its Domain changes
+    agency_name = models.CharField(max_length=100)
+    portal_domain = models.CharField(max_length=253)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        constraints = [
+            models.UniqueConstraint(fields=['tenant', 'job_id'], name='publicjobindex_tenant_job_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='publicjob_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='publicjob_search_vector_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.agency_name})"
+
+    @property
+    def url(self):
+        return f"https://{self.portal_domain}/jobs/{self.job_id}/"
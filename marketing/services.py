@@ -1,15 +1,25 @@
+import hashlib
+import logging
 import os
+from django.conf import settings
+from django.core.cache import cache
 from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.utils.text import slugify
 from django_tenants.utils import schema_context
 from customers.models import Client, Domain, Plan
+from customers.schema_clone import SchemaCloner, clone_template_schema
+from customers.schema_pool import claim_schema
 from django.contrib.auth import get_user_model
 
+logger = logging.getLogger(__name__)
+
 
 # Service class to handle tenant creation and onboarding logic.
 class TenantService:
     @staticmethod
-    def create_onboarding_tenant(company_name, admin_email, password, template_id='executive'):
+    def create_onboarding_tenant(company_name, admin_email, password, template_id='executive', cloner=None):
         admin_email = admin_email.lower().strip() 
         tenant_slug = slugify(company_name)
         domain_name = f"{tenant_slug}.getpillarpost.com"
@@ -38,8 +48,11 @@ class TenantService:
                     tenant=tenant,
                     is_primary=True
                 )
+                # Take a pre-migrated schema from the pool, or copy the template schema
+                claimed = claim_schema(schema_name) or clone_template_schema(schema_name, cloner)
 
-            tenant.create_schema(check_if_exists=True, verbosity=1)  
+            if not claimed:
+                tenant.create_schema(check_if_exists=True, verbosity=1)
             with schema_context(tenant.schema_name):
                 User = get_user_model()
                 if not User.objects.filter(email=admin_email).exists():
@@ -65,7 +78,7 @@ class TenantService:
                 }
                 vibe = configs.get(template_id, configs['executive'])
 
-                from cms.models import CompanyProfile
+                from cms.models import STARTER_PROFILE, CompanyProfile
                 CompanyProfile.objects.update_or_create(
                     tenant_slug=schema_name,
                     defaults={
@@ -74,35 +87,61 @@ class TenantService:
                         'primary_color': vibe['primary'],
                         'secondary_color': vibe['primary'],
                         'background_color': vibe['bg'],                    
-                        'hero_title': "Connecting Exceptional Talent with World-Class Teams",
-                        'hero_text': (
-                            "We specialize in finding the perfect match between industry leaders "
-                            "and top-tier professionals."
-                        ),                  
-                        'homepage_body_text': (
-                            "Whether you're a business looking for your next key hire or a professional ready for a new challenge, "
-                            "we're here to make the right introduction. Our consultants bring deep sector knowledge and a "
-                            "personal approach to every search, ensuring that we don't just fill roles, but build lasting "
-                            "professional partnerships. By combining rigorous candidate screening with an intuitive understanding "
-                            "of company culture, we help organizations scale with confidence while guiding talented individuals "
-                            "toward the career-defining opportunities they deserve."
-                            "We believe that recruitment is about more than just matching a CV to a job description; "
-                            "it is about recognizing potential and fostering growth. In today’s competitive landscape, "
-                            "finding the right fit requires a partner who listens as much as they search. From the initial "
-                            "consultation to the final placement, we remain committed to transparency, integrity, and the "
-                            "long-term success of both our clients and our candidates."
-                        ),            
-                        'about_title': "Expertise. Integrity. Results.",
-                        'about_content': "With over a decade of experience in specialized recruitment...",
-                        'jobs_header_text': "Current Vacancies",
+                        **STARTER_PROFILE,
                     }
                 )
 
             return tenant, domain_name
 
-        except Exception as e:
+        except Exception:
             connection.set_schema_to_public()
             with connection.cursor() as cursor:
                 cursor.execute(f"DROP SCHEMA IF EXISTS {schema_name} CASCADE;")
-            print(f"Cleanup successful after error: {e}")
+            logger.exception("Creating tenant schema %s failed; dropped it", schema_name)
             return None, None
+
+    @staticmethod
+    def create_agency_tenants(company_names, admin_email, password, template_id='executive'):
+        """Creates one portal per company for an agency group, introspecting the template schema once."""
+        cloner = SchemaCloner.for_template()
+        return [
+            TenantService.create_onboarding_tenant(name, admin_email, password, template_id, cloner=cloner)
+            for name in company_names
+        ]
+
+
+# Looks up which portals an email address belongs to, for the public portal finder.
+class PortalService:
+    @staticmethod
+    def _miss_key(email):
+        return 'portal_finder:miss:' + hashlib.sha256(email.encode()).hexdigest()
+
+    @staticmethod
+    def find_portals(email):
+        """
+        Returns [{'name', 'login_url'}] for every tenant with this notification or master email.
+        Uses the lower() indexes and joins the primary domain in the same query.
+        Unknown addresses are remembered for PORTAL_FINDER_MISS_TIMEOUT seconds.
+        """
+        email = email.strip().lower()
+        key = PortalService._miss_key(email)
+        if cache.get(key):
+            return []
+        rows = (
+            Domain.objects.filter(is_primary=True)
+            .alias(notify_email=Lower('tenant__notification_email_1'), master_email=Lower('tenant__master_email'))
+            .filter(Q(notify_email=email) | Q(master_email=email))
+            .order_by('tenant__name')
+            .values_list('tenant__name', 'domain')
+        )
+        found = [{'name': name, 'login_url': f"https://{domain}/login/"} for name, domain in rows]
+        if not found:
+            cache.set(key, True, getattr(settings, 'PORTAL_FINDER_MISS_TIMEOUT', 60))
+        return found
+
+    @staticmethod
+    def forget_misses(*emails):
+        """Drops cached misses so a newly registered address is found straight away."""
+        keys = [PortalService._miss_key(e.strip().lower()) for e in emails if e]
+        if keys:
+            cache.delete_many(keys)
@@ -0,0 +1,30 @@
+from django.db import connection
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from cms.models import Job
+from customers.models import Client, Domain
+from .job_index import index_job, refresh_portal, unindex_job
+from .services import PortalService
+
+
+@receiver(post_save, sender=Client)
+def client_portal_changed(sender, instance, **kwargs):
+    PortalService.forget_misses(instance.notification_email_1, instance.master_email)
+    refresh_portal(instance)
+
+
+@receiver(post_save, sender=Domain)
+def domain_portal_changed(sender, instance, **kwargs):
+    # A tenant only shows up in the finder once it has a primary domain
+    PortalService.forget_misses(instance.tenant.notification_email_1, instance.tenant.master_email)
+    refresh_portal(instance.tenant)
+
+
+@receiver(post_save, sender=Job)
+def index_saved_job(sender, instance, **kwargs):
+    index_job(connection.schema_name, instance.pk)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_deleted_job(sender, instance, **kwargs):
+    unindex_job(connection.schema_name, instance.pk)
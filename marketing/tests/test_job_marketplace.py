@@ -0,0 +1,89 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client as TestClient, override_settings
+from django.urls import clear_url_caches, set_urlconf
+from django_tenants.test.cases import TenantTestCase
+from cms.models import Job
+from marketing.models import PublicJobIndex
+
+
+class JobMarketplaceTest(TenantTestCase):
+    """
+    Tests the public-schema job index: kept current by the Job signals, repaired by
+    reconcile_job_index, and read by the /jobs/ marketplace without entering tenant schemas.
+    """
+
+    @classmethod
+    def setup_tenant(cls, tenant):
+        tenant.schema_name = 'job_market_test'
+        tenant.name = 'Market Agency'
+        tenant.is_active = True
+        return tenant
+
+    @classmethod
+    def setup_domain(cls, domain):
+        domain.domain = 'job-market.localhost'
+        return domain
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tenant.create_schema(check_if_exists=True)
+
+    def setUp(self):
+        connection.set_tenant(self.tenant)
+        self.engineer = Job.objects.create(
+            title='Python Engineer', salary='£55k', location='Leeds',
+            summary='Backend role', description='Build Django services.',
+        )
+        self.analyst = Job.objects.create(
+            title='Data Analyst', salary='£28,000', location='York',
+            summary='Reporting role', description='Spreadsheets and SQL.',
+        )
+
+    def _indexed(self):
+        return PublicJobIndex.objects.filter(tenant=self.tenant)
+
+    def test_saved_job_is_indexed_with_its_search_vector(self):
+        row = self._indexed().get(job_id=self.engineer.pk)
+        self.assertEqual(row.title, 'Python Engineer')
+        self.assertEqual(row.agency_name, 'Market Agency')
+        self.assertEqual(row.url, f'https://job-market.localhost/jobs/{self.engineer.pk}/')
+        self.assertIsNotNone(row.search_vector)
+
+        self.engineer.title = 'Senior Python Engineer'
+        self.engineer.save()
+        self.assertEqual(self._indexed().get(job_id=self.engineer.pk).title, 'Senior Python Engineer')
+
+    def test_deleted_job_is_unindexed(self):
+        self.analyst.delete()
+        self.assertEqual(list(self._indexed().values_list('job_id', flat=True)), [self.engineer.pk])
+
+    def test_reconcile_catches_changes_the_signals_missed(self):
+        Job.objects.filter(pk=self.engineer.pk).update(title='Rust Engineer')
+        PublicJobIndex.objects.create(tenant=self.tenant, job_id=self.analyst.pk + 1000, title='Gone',
+                                      created_at=self.analyst.created_at)
+        call_command('reconcile_job_index', schema_name=self.tenant.schema_name, stdout=StringIO())
+        self.assertEqual(
+            dict(self._indexed().values_list('job_id', 'title')),
+            {self.engineer.pk: 'Rust Engineer', self.analyst.pk: 'Data Analyst'},
+        )
+
+    @override_settings(ROOT_URLCONF='recruit_saas.urls_public')
+    def test_marketplace_lists_and_searches_jobs(self):
+        connection.set_schema_to_public()
+        clear_url_caches()
+        set_urlconf(None)
+        client = TestClient()
+        try:
+            response = client.get('/jobs/')
+            self.assertContains(response, 'Python Engineer')
+            self.assertContains(response, 'Data Analyst')
+            self.assertContains(response, f'https://job-market.localhost/jobs/{self.analyst.pk}/')
+
+            response = client.get('/jobs/', {'q': 'spreadsheets'})
+            self.assertContains(response, 'Data Analyst')
+            self.assertNotContains(response, 'Python Engineer')
+        finally:
+            clear_url_caches()
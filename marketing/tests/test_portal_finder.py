@@ -2,8 +2,12 @@ import uuid
 from django.test import TestCase, Client as TestClient
 from django.urls import clear_url_caches, set_urlconf
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django_tenants.utils import schema_context, get_public_schema_name
 from customers.models import Client as TenantClient, Domain
+from marketing.services import PortalService
 
 
 class PortalFinderTest(TestCase):
@@ -44,6 +48,7 @@ class PortalFinderTest(TestCase):
         clear_url_caches()
         set_urlconf(settings.PUBLIC_SCHEMA_URLCONF)
         self.client = TestClient()
+        cache.clear()
 
     def test_portal_found_by_exact_email(self):
         """POSTing a matching email returns the tenant's login URL in the response."""
@@ -99,6 +104,27 @@ class PortalFinderTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'finder-agency.getpillarpost.com')
 
+    def test_lookup_is_a_single_joined_query(self):
+        """Tenant names and primary domains come back from one query."""
+        with CaptureQueriesContext(connection) as ctx:
+            found = PortalService.find_portals('Hello@FinderAgency.com')
+        queries = [q for q in ctx.captured_queries if not q['sql'].startswith('SET search_path')]
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(found, [{'name': 'Finder Agency', 'login_url': 'https://finder-agency.getpillarpost.com/login/'}])
+
+    def test_unknown_email_is_cached_until_a_tenant_registers_it(self):
+        """Repeat misses skip the database, and a new tenant with that email clears the miss."""
+        self.assertEqual(PortalService.find_portals('new@agency.com'), [])
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(PortalService.find_portals('new@agency.com'), [])
+        self.assertEqual([q for q in ctx.captured_queries if not q['sql'].startswith('SET search_path')], [])
+
+        uid = str(uuid.uuid4())[:4]
+        with schema_context(get_public_schema_name()):
+            agency = TenantClient.objects.create(schema_name=f'new-agency-{uid}', name='New Agency', master_email='new@agency.com')
+            Domain.objects.create(domain=f'new-agency-{uid}.getpillarpost.com', tenant=agency, is_primary=True)
+        self.assertEqual(len(PortalService.find_portals('new@agency.com')), 1)
+
     def tearDown(self):
         set_urlconf(None)
         clear_url_caches()
\ No newline at end of file
@@ -9,5 +9,6 @@ urlpatterns = [
     path("choose-template/", views.template_select, name="template_select"),
     path("preview/<str:template_id>/", views.template_preview, name="template_preview"),
     path("signup/", views.tenant_signup, name="tenant_signup"),
+    path("jobs/", views.job_marketplace, name="job_marketplace"),
     path("about/", views.company_about, name="about")
 ]
@@ -1,13 +1,23 @@
+import logging
+
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django_tenants.utils import schema_context
 from django.templatetags.static import static
-from customers.models import Client
 from .forms import TenantSignupForm, TenantLoginForm
 from django.core.mail import send_mail
 from django.conf import settings
-from .services import TenantService
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
+from django.utils import timezone
+from cms.pagination import paginate_newest_first
+from cms.search import SEARCH_CONFIG
+from .models import PublicJobIndex
+from recruit_saas.request_metrics import external_call
+from .services import TenantService, PortalService
+
+logger = logging.getLogger(__name__)
 
 
 def company_about(request):
@@ -53,15 +63,16 @@ def tenant_signup(request):
             })
         portal_url = f"https://{domain_name}/login/"
         try:
-            send_mail(
-                subject="Welcome to PillarPost!",
-                message=f"Hi {company_name}, your portal is ready at: {portal_url}",
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[admin_email],
-                fail_silently=False, 
-            )
-        except Exception as e:
-            print(f"EMAIL ERROR: {e}")
+            with external_call('smtp'):
+                send_mail(
+                    subject="Welcome to PillarPost!",
+                    message=f"Hi {company_name}, your portal is ready at: {portal_url}",
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[admin_email],
+                    fail_silently=False,
+                )
+        except Exception:
+            logger.exception("Welcome email to %s failed", admin_email)
             messages.warning(
                 request, 
                 "Your portal is ready, but we had trouble sending the welcome email. Please note your login details below."
@@ -135,14 +146,7 @@ def portal_finder(request):
     email = request.POST.get('email', '').strip().lower() 
 
     if request.method == "POST" and email:
-        tenants = Client.objects.filter(notification_email_1__iexact=email)
-        for tenant in tenants:
-            domain = tenant.domains.filter(is_primary=True).first()
-            if domain:
-                found_tenants.append({
-                    'name': tenant.name,
-                    'login_url': f"https://{domain.domain}/login/"
-                }) 
+        found_tenants = PortalService.find_portals(email)
         if not found_tenants:
             messages.error(request, "No portals found for that email address.")
 
@@ -150,3 +154,33 @@ def portal_finder(request):
         'found_tenants': found_tenants,
         'email': email
     })
+
+
+def job_marketplace(request):
+    """Jobs from every live tenant board, read from PublicJobIndex alone; newest first, or ranked for ?q=."""
+    query = request.GET.get('q', '').strip()[:200]
+    per_page = settings.JOB_PAGE_SIZE
+    jobs = PublicJobIndex.objects.defer('search_vector').filter(
+        Q(tenant__is_active=True) | Q(tenant__trial_ends__gte=timezone.localdate())
+    )
+    context = {'query': query, 'next_cursor': None, 'page': 1, 'has_next': False}
+
+    if query:
+        try:
+            page = max(1, int(request.GET.get('page', 1)))
+        except ValueError:
+            page = 1
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        results = list(
+            jobs.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-created_at', '-id')[(page - 1) * per_page:page * per_page + 1]
+        )
+        context.update(page=page, has_next=len(results) > per_page)
+        jobs = results[:per_page]
+    else:
+        jobs = paginate_newest_first(jobs, request.GET.get('cursor'), per_page)
+        context['next_cursor'] = jobs.next_cursor
+
+    context['jobs'] = jobs
+    return render(request, "marketing/job_marketplace.html", context)
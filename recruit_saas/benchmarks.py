@@ -0,0 +1,238 @@
+import hashlib
+import hmac
+import json
+import statistics
+import time
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client as HttpClient
+from django_tenants.utils import get_public_schema_name, schema_context
+from cms.models import Job
+from customers.models import Client, Domain
+from customers.seeding import PASSWORD, seed_tenants, seed_tenants_spec
+
+PUBLIC_HOST = 'getpillarpost.com'
+WEBHOOK_SECRET = 'whsec_benchmark'
+
+# Metric -> largest allowed increase over the baseline, as a fraction (0 allows no increase at all)
+DEFAULT_THRESHOLDS = {'p50_ms': 0.25, 'p95_ms': 0.25, 'queries': 0, 'alloc_peak_kb': 0.25}
+# Changes smaller than this are timer or allocator noise, whatever the percentage
+NOISE_FLOOR = {'p50_ms': 1.0, 'p95_ms': 2.0, 'alloc_peak_kb': 16.0}
+
+# Scenario name -> scenario(site, iteration) returning the response. Register more with @scenario.
+SCENARIOS = {}
+
+
+def scenario(name, status=200, max_iterations=None):
+    """
+    Registers a benchmarked request and the status it must answer with, so a redirect to a
+    login or error page is never timed as the real thing. max_iterations caps scenarios that
+    create a tenant each time.
+    """
+    def register(func):
+        func.status = status
+        func.max_iterations = max_iterations
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class BenchmarkSite:
+    """The seeded portals and the clients benchmarks browse them with."""
+
+    def __init__(self, tenants):
+        self.tenants = tenants
+        self.tenant = tenants[0]
+        with schema_context(self.tenant.schema_name):
+            self.job_id = Job.objects.order_by('pk').values_list('pk', flat=True).first()
+            user = get_user_model().objects.order_by('pk').first()
+            self.staff = self.client_for(self.tenant.get_primary_domain().domain)
+            self.staff.force_login(user)
+        self.visitor = self.client_for(self.tenant.get_primary_domain().domain)
+        self.public = self.client_for(PUBLIC_HOST)
+        self.run_id = uuid.uuid4().hex[:8]
+
+    @staticmethod
+    def client_for(host):
+        # Over https, so SECURE_SSL_REDIRECT sends nothing to the redirect
+        return HttpClient(HTTP_HOST=host, **{'wsgi.url_scheme': 'https'})
+
+
+def seed(tenants, jobs):
+    """
+    Creates the public site and `tenants` benchmark portals with `jobs` jobs each, cloned from
+    the template schema by customers.seeding, or reuses them when a kept database already has them.
+    """
+    public, _ = Client.objects.get_or_create(schema_name=get_public_schema_name(), defaults={'name': 'Pillar & Post'})
+    Domain.objects.get_or_create(domain=PUBLIC_HOST, defaults={'tenant': public, 'is_primary': True})
+    for schema_name, outcome in seed_tenants(tenants, jobs, prefix='bench', workers=1):
+        if isinstance(outcome, Exception):
+            raise BenchmarkError(f"Seeding benchmark portal {schema_name} failed: {outcome}")
+    portals = Client.objects.filter(
+        schema_name__in=[tenant.schema_name for tenant in seed_tenants_spec(tenants, prefix='bench')]
+    ).order_by('schema_name')
+    # Paying portals, so the subscription guard lets every scenario through
+    portals.update(is_active=True)
+    return BenchmarkSite(list(portals))
+
+
+@scenario('home')
+def home(site, iteration):
+    return site.visitor.get('/')
+
+
+@scenario('public_job_list')
+def public_job_list(site, iteration):
+    return site.visitor.get('/jobs/')
+
+
+@scenario('public_job_detail')
+def public_job_detail(site, iteration):
+    return site.visitor.get(f'/jobs/{site.job_id}/')
+
+
+@scenario('apply_to_job', status=302)
+def apply_to_job(site, iteration):
+    cv = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 benchmark cv\n' * 2000, content_type='application/pdf')
+    return site.visitor.post(f'/jobs/{site.job_id}/apply/', {
+        'full_name': 'Bench Candidate', 'email': 'candidate@example.com', 'phone': '0123', 'cv': cv,
+    })
+
+
+@scenario('dashboard')
+def dashboard(site, iteration):
+    return site.staff.get('/dashboard/')
+
+
+@scenario('portal_finder')
+def portal_finder(site, iteration):
+    return site.public.post('/find-portal/', {'email': site.tenant.master_email})
+
+
+@scenario('tenant_signup', status=302, max_iterations=10)
+def tenant_signup(site, iteration):
+    return site.public.post('/signup/', {
+        'company_name': f"Bench Signup {site.run_id} {iteration}",
+        'admin_email': 'signup@example.com',
+        'password': PASSWORD,
+    })
+
+
+@scenario('stripe_webhook')
+def stripe_webhook(site, iteration):
+    payload = json.dumps({
+        'id': f'evt_bench_{site.run_id}_{iteration}',
+        'object': 'event',
+        'type': 'invoice.payment_failed',
+        'created': int(time.time()),
+        'data': {'object': {'object': 'invoice', 'customer': 'cus_benchmark'}},
+    })
+    return site.public.post(
+        '/customers/stripe-webhook/', payload, content_type='application/json',
+        HTTP_STRIPE_SIGNATURE=stripe_signature(payload, settings.STRIPE_WEBHOOK_SECRET),
+    )
+
+
+def stripe_signature(payload, secret, timestamp=None):
+    """A Stripe-Signature header for payload, as Stripe signs its webhook deliveries."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signed = hmac.new(secret.encode(), f'{timestamp}.{payload}'.encode(), hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={signed}'
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Schema switches come from the backend's search_path_sets counter instead (see measure)
+        if not (isinstance(sql, str) and sql.startswith('SET search_path')):
+            self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def _call(func, site, iteration):
+    response = func(site, iteration)
+    if response.status_code != func.status:
+        raise BenchmarkError(f"{func.__name__} answered {response.status_code}, not {func.status}")
+    return response
+
+
+def measure(func, site, iterations, warmup=3, traced=3):
+    """
+    Times `iterations` requests after `warmup` untimed ones, counting each one's queries and
+    search_path switches, then traces `traced` more with tracemalloc for their peak allocation
+    (kept out of the timings, which tracing slows down several times over).
+    """
+    if func.max_iterations:
+        iterations = min(iterations, func.max_iterations)
+        warmup = min(warmup, 1)
+    iteration = 0
+    for _ in range(warmup):
+        _call(func, site, iteration)
+        iteration += 1
+
+    timings, queries, switches = [], [], []
+    for _ in range(iterations):
+        counter = _QueryCounter()
+        sets = getattr(connection, 'search_path_sets', 0)
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            _call(func, site, iteration)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(counter.queries)
+        switches.append(getattr(connection, 'search_path_sets', 0) - sets)
+        iteration += 1
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(traced):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            _call(func, site, iteration)
+            peaks.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+            iteration += 1
+    finally:
+        tracemalloc.stop()
+
+    cuts = statistics.quantiles(timings, n=100, method='inclusive')
+    return {
+        'iterations': iterations,
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'p50_ms': round(cuts[49], 2),
+        'p90_ms': round(cuts[89], 2),
+        'p95_ms': round(cuts[94], 2),
+        'p99_ms': round(cuts[98], 2),
+        'max_ms': round(max(timings), 2),
+        'queries': max(queries),
+        'schema_switches': max(switches),
+        'alloc_peak_kb': round(statistics.median(peaks), 1),
+    }
+
+
+def find_regressions(baseline, results, thresholds):
+    """Describes every metric in results that grew past its threshold over the baseline."""
+    found = []
+    for name, metrics in sorted(results.items()):
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric, allowed in sorted(thresholds.items()):
+            if metric not in metrics or metric not in before:
+                continue
+            old, new = before[metric], metrics[metric]
+            if new - old <= NOISE_FLOOR.get(metric, 0) or new <= old * (1 + allowed):
+                continue
+            change = f"+{(new - old) / old:.0%}" if old else "new"
+            found.append(f"{name} {metric}: {old} -> {new} ({change}, allowed +{allowed:.0%})")
+    return found
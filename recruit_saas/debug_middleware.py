@@ -1,23 +1,37 @@
+import copy
+from datetime import date
 from django_tenants.middleware.main import TenantMainMiddleware
+from django_tenants.utils import get_tenant_model, get_public_schema_name
 from django.conf import settings
 from django.utils.cache import patch_vary_headers
 from django.urls import set_urlconf, reverse
-from django.shortcuts import redirect
+from django.http import HttpResponseRedirect
+from customers.tenant_cache import tenant_cache
 
 
 class CustomTenantMiddleware(TenantMainMiddleware):
     """Custom Tenant Middleware that ensures the correct URLconf is used based on the tenant."""
     def get_tenant(self, domain_model, hostname):
         hostname_no_port = hostname.split(':')[0]
+        entry = tenant_cache.get(hostname_no_port)
+        if entry is None:
+            tenant, domain = self.resolve_tenant(domain_model, hostname_no_port)
+            entry = tenant_cache.set(hostname_no_port, tenant, domain)
+        # Each request gets its own copy so views can modify/save request.tenant safely
+        return copy.copy(entry.tenant)
+
+    def resolve_tenant(self, domain_model, hostname):
+        """Returns (tenant, domain) for the hostname, falling back to the public tenant with no domain."""
+        try:
+            domain = domain_model.objects.select_related('tenant').get(domain=hostname)
+            return domain.tenant, domain
+        except domain_model.DoesNotExist:
+            pass
+        # Unknown host: serve the public schema. One query, and the result is cached under this hostname.
         try:
-            # Try to get the tenant
-            return domain_model.objects.select_related('tenant').get(
-                domain=hostname_no_port
-            ).tenant
-        except (domain_model.DoesNotExist, Exception):
-            # If the table doesn't exist OR the domain isn't found, 
-            # force return the public schema so migrations can run.
-            return domain_model.objects.get(schema_name='public')
+            return get_tenant_model().objects.get(schema_name=get_public_schema_name()), None
+        except get_tenant_model().DoesNotExist:
+            raise domain_model.DoesNotExist(f'No tenant for hostname "{hostname}" and no public tenant')
 
     def process_request(self, request):
         # Let the parent find the tenant and set the schema
@@ -39,35 +53,75 @@ class CustomTenantMiddleware(TenantMainMiddleware):
         return response
 
 
+# Paths that are ALWAYS allowed (Login, Logout, and Billing)
+# We use a mix of url names and hardcoded paths to ensure Stripe can always reach you
+ALLOWED_URL_NAMES = (
+    'customers:create_checkout',
+    'customers:payment_success',
+    'customers:payment_cancel',
+    'customers:customer_portal',
+)
+ALLOWED_PATHS = ('/login/', '/logout/', '/customers/stripe-webhook/')
+
+ACCESS_ACTIVE = 'active'
+ACCESS_TRIAL = 'trial'
+ACCESS_BLOCKED = 'blocked'
+
+
+def tenant_access(tenant):
+    """Returns the subscription guard's decision for a tenant as (state, trial_ends)."""
+    if tenant.is_active:
+        return ACCESS_ACTIVE, None
+    if tenant.trial_ends:
+        return ACCESS_TRIAL, tenant.trial_ends
+    return ACCESS_BLOCKED, None
+
+
 class SubscriptionGuardMiddleware:
     """Blocks access to inactive tenants except for billing/auth paths.""" 
     def __init__(self, get_response):
         self.get_response = get_response
+        # urlconf -> (allowed path prefixes, checkout url), built on first use
+        self._routes = {}
+
+    def routes_for(self, urlconf):
+        routes = self._routes.get(urlconf)
+        if routes is None:
+            prefixes = tuple(reverse(name, urlconf=urlconf) for name in ALLOWED_URL_NAMES) + ALLOWED_PATHS
+            routes = (prefixes, reverse('customers:create_checkout', urlconf=urlconf))
+            self._routes[urlconf] = routes
+        return routes
+
+    def access_for(self, tenant):
+        """
+        Reuses the decision stored next to the tenant in the hostname cache, computing it on a miss.
+        It lives as long as the cache entry: until the shared stamp changes, or without a shared cache
+        (TENANT_CACHE_SHARED off) the few seconds of the local TTL, so a webhook applied by the
+        stripe_worker is picked up within that window without a query per request.
+        """
+        entry = tenant_cache.get(getattr(tenant, 'domain_url', None))
+        if entry is not None and 'access' in entry.extra:
+            return entry.extra['access']
+        access = tenant_access(tenant)
+        if entry is not None:
+            entry.extra['access'] = access
+        return access
 
     def __call__(self, request):
         # If it's the public schema or no tenant attached, let it through
         if not hasattr(request, 'tenant') or request.tenant.schema_name == 'public':
             return self.get_response(request)
 
-        # Paths that are ALWAYS allowed (Login, Logout, and Billing)
-        # We use a mix of reverse and hardcoded paths to ensure Stripe can always reach you
-        allowed_paths = [
-            reverse('customers:create_checkout'),
-            reverse('customers:payment_success'),
-            reverse('customers:payment_cancel'),
-            reverse('customers:customer_portal'),
-            '/login/', 
-            '/logout/',
-            '/customers/stripe-webhook/',
-        ]
+        allowed_prefixes, checkout_url = self.routes_for(getattr(request, 'urlconf', None))
 
         # If the request is for an allowed path, continue without checking subscription status
-        if any(request.path.startswith(path) for path in allowed_paths):
+        if request.path.startswith(allowed_prefixes):
             return self.get_response(request)
 
         # Guard: If the tenant is inactive AND their trial has ended, force a redirect to checkout
-        if not request.tenant.is_active and not request.tenant.is_on_trial:
-            return redirect(reverse('customers:create_checkout'))
+        state, trial_ends = self.access_for(request.tenant)
+        if state == ACCESS_BLOCKED or (state == ACCESS_TRIAL and date.today() > trial_ends):
+            return HttpResponseRedirect(checkout_url)
 
         return self.get_response(request)
 
@@ -0,0 +1,71 @@
+import django.db.utils
+from django_tenants.postgresql_backend import base as tenants_base
+
+
+class DatabaseWrapper(tenants_base.DatabaseWrapper):
+    """
+    django-tenants' backend, but it remembers the search_path the session actually has and only
+    sends SET search_path when the next cursor needs a different one. Stock django-tenants sets
+    it again on every cursor, and clears the ContentType cache on every set_tenant(), so a
+    schema_context() for the schema already active cost a round trip per query inside it.
+
+    The remembered path is forgotten whenever the session may have lost it: on close, on a
+    rollback (which undoes a SET made in the transaction) and when a SET fails.
+    search_path_sets and search_path_skips count the SETs sent and avoided, for request metrics.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.session_search_path = None
+        self.search_path_sets = 0
+        self.search_path_skips = 0
+        super().__init__(*args, **kwargs)
+
+    def set_tenant(self, tenant, include_public=True):
+        if self.schema_name == tenant.schema_name and self.include_public_schema == include_public:
+            # Same schema: keep the caller's tenant object, nothing else changes
+            self.tenant = tenant
+            return
+        super().set_tenant(tenant, include_public)
+
+    def close(self):
+        self.session_search_path = None
+        super().close()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self.session_search_path = None
+
+    def _savepoint_rollback(self, sid):
+        # Forgotten after the rollback, as the cursor running it may SET a path that the rollback undoes
+        try:
+            return super()._savepoint_rollback(sid)
+        finally:
+            self.session_search_path = None
+
+    def _cursor(self, name=None):
+        # The plain Django cursor: django-tenants' own _cursor is the one that always sets the path
+        cursor = super(tenants_base.DatabaseWrapper, self)._cursor(name)
+        search_paths = self._get_cursor_search_paths()
+        if search_paths == self.session_search_path:
+            self.search_path_skips += 1
+            return cursor
+
+        # A named (server-side) cursor can only run its own query
+        cursor_for_search_path = self.connection.cursor() if name or tenants_base.is_psycopg3 else cursor
+        try:
+            cursor_for_search_path.execute(
+                'SET search_path = {0}'.format(','.join("'{}'".format(s) for s in search_paths))
+            )
+        except (django.db.utils.DatabaseError, tenants_base.psycopg.InternalError):
+            # Most likely an aborted transaction, which only a rollback gets out of
+            self.session_search_path = None
+        else:
+            self.session_search_path = search_paths
+            self.search_path_sets += 1
+        finally:
+            if name or tenants_base.is_psycopg3:
+                cursor_for_search_path.close()
+        self.search_path_set_schemas = self.session_search_path
+        return cursor
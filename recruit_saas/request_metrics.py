@@ -0,0 +1,159 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from customers.db_connections import connection_stats
+
+logger = logging.getLogger('recruit_saas.requests')
+
+# The metrics of the request being handled on this thread (None outside requests, e.g. in workers)
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        # SET search_path statements the backend sent, and those it left out because the session already had that path
+        self.schema_switches = 0
+        self.schema_switches_skipped = 0
+        # Database connections opened, 0 when CONN_MAX_AGE kept one from an earlier request
+        self.connects = 0
+        # service -> [calls, seconds]
+        self.external = {}
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        # The backend counts the SET search_path statements it sends (search_path_sets), so they're left out here
+        if not (isinstance(sql, str) and sql.startswith('SET search_path')):
+            metrics.queries += 1
+            metrics.query_time += elapsed
+
+
+@receiver(connection_created)
+def _record_connect(sender, connection, **kwargs):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.connects += 1
+
+
+@contextmanager
+def external_call(service):
+    """Times an outbound call (Stripe, Cloudinary, SMTP) against the current request, if there is one."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        totals = metrics.external.setdefault(service, [0, 0.0])
+        totals[0] += 1
+        totals[1] += time.perf_counter() - start
+
+
+class RequestMetricsMiddleware:
+    """
+    Counts each request's SQL queries and their time, search_path switches (and those the
+    backend skipped as no-ops), new database connections and external_call() time, and reports
+    them as a Server-Timing header (SERVER_TIMING_HEADER, off unless DEBUG or set) and a logfmt
+    line on the recruit_saas.requests logger. The log line also carries the process's connection
+    reuse counters and the age of the connection in use (customers.db_connections).
+    REQUEST_METRICS_SAMPLE_RATE of requests are logged, plus every request slower than
+    REQUEST_METRICS_SLOW_MS or with more than REQUEST_METRICS_MAX_QUERIES queries. Goes first in
+    MIDDLEWARE, so tenant lookups are counted too.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        sets = getattr(connection, 'search_path_sets', 0)
+        skips = getattr(connection, 'search_path_skips', 0)
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(_record_query):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        duration = time.perf_counter() - start
+        metrics.schema_switches = getattr(connection, 'search_path_sets', 0) - sets
+        metrics.schema_switches_skipped = getattr(connection, 'search_path_skips', 0) - skips
+
+        if getattr(settings, 'SERVER_TIMING_HEADER', False):
+            response['Server-Timing'] = self.server_timing(metrics, duration)
+        if self.should_log(metrics, duration):
+            self.log(request, response, metrics, duration)
+        return response
+
+    @staticmethod
+    def server_timing(metrics, duration):
+        entries = [
+            f'db;dur={metrics.query_time * 1000:.1f};desc="{metrics.queries} queries"',
+            f'schema;desc="{metrics.schema_switches} search_path switches, {metrics.schema_switches_skipped} skipped"',
+            f'conn;desc="{metrics.connects} opened"',
+        ]
+        for service, (calls, seconds) in sorted(metrics.external.items()):
+            entries.append(f'{service};dur={seconds * 1000:.1f};desc="{calls} calls"')
+        entries.append(f'total;dur={duration * 1000:.1f}')
+        return ', '.join(entries)
+
+    @staticmethod
+    def should_log(metrics, duration):
+        if duration * 1000 >= getattr(settings, 'REQUEST_METRICS_SLOW_MS', 500):
+            return True
+        if metrics.queries > getattr(settings, 'REQUEST_METRICS_MAX_QUERIES', 50):
+            return True
+        return random.random() < getattr(settings, 'REQUEST_METRICS_SAMPLE_RATE', 0.0)
+
+    @staticmethod
+    def log(request, response, metrics, duration):
+        tenant = getattr(request, 'tenant', None)
+        match = getattr(request, 'resolver_match', None)
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'schema': tenant.schema_name if tenant is not None else '-',
+            'view': match.view_name if match is not None else '-',
+            'duration_ms': round(duration * 1000, 1),
+            'db_queries': metrics.queries,
+            'db_ms': round(metrics.query_time * 1000, 1),
+            'schema_switches': metrics.schema_switches,
+            'schema_switches_skipped': metrics.schema_switches_skipped,
+            'db_connects': metrics.connects,
+        }
+        # This process's connection reuse so far, to check CONN_MAX_AGE is keeping connections
+        stats = connection_stats()
+        fields['conn_opened_total'] = stats['opened']
+        fields['conn_reused_total'] = stats['reused']
+        fields['conn_schema_resets_total'] = stats['schema_resets']
+        fields['conn_age_s'] = stats['ages'].get(connection.alias, '-')
+        for service, (calls, seconds) in sorted(metrics.external.items()):
+            fields[f'{service}_calls'] = calls
+            fields[f'{service}_ms'] = round(seconds * 1000, 1)
+        logger.info(' '.join(f'{key}={_logfmt(value)}' for key, value in fields.items()), extra={'request_metrics': fields})
+
+
+def _logfmt(value):
+    value = str(value)
+    if not value or any(c in value for c in ' "='):
+        return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+    return value
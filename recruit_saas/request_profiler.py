@@ -0,0 +1,131 @@
+import cProfile
+import io
+import marshal
+import pstats
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+
+from customers.models import RequestProfile
+
+SALT = 'recruit_saas.request_profiler'
+TOKEN_HEADER = 'X-Profile-Token'
+TOKEN_PARAM = '_profile'
+
+
+def make_token(username, schema_name=''):
+    """A signed profiling token for a staff member, optionally limited to one tenant schema."""
+    return signing.dumps({'by': username, 'schema': schema_name}, salt=SALT, compress=True)
+
+
+def read_token(request):
+    """The token's payload if the request carries a valid, unexpired token for its schema, else None."""
+    token = request.headers.get(TOKEN_HEADER) or request.GET.get(TOKEN_PARAM)
+    if not token:
+        return None
+    try:
+        payload = signing.loads(token, salt=SALT, max_age=getattr(settings, 'PROFILER_TOKEN_MAX_AGE', 3600))
+    except signing.BadSignature:
+        return None
+    tenant = getattr(request, 'tenant', None)
+    if payload.get('schema') and (tenant is None or payload['schema'] != tenant.schema_name):
+        return None
+    return payload
+
+
+class _CProfile:
+    format = 'pstats'
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        stats = pstats.Stats(self.profiler)
+        data = marshal.dumps(stats.stats)
+        output = io.StringIO()
+        pstats.Stats(self.profiler, stream=output).sort_stats('cumulative').print_stats(40)
+        return data, output.getvalue()
+
+
+class _Pyinstrument:
+    """Statistical profiling with pyinstrument when it's installed: far lower overhead on deep call stacks."""
+    format = 'html'
+
+    def __init__(self):
+        from pyinstrument import Profiler
+        self.profiler = Profiler()
+
+    def start(self):
+        self.profiler.start()
+
+    def stop(self):
+        self.profiler.stop()
+        return self.profiler.output_html().encode(), self.profiler.output_text(unicode=True)
+
+
+def _profiler():
+    if getattr(settings, 'PROFILER_PREFER_SAMPLING', True):
+        try:
+            return _Pyinstrument()
+        except ImportError:
+            pass
+    return _CProfile()
+
+
+class RequestProfilerMiddleware:
+    """
+    Runs requests carrying a valid profiling token (the X-Profile-Token header or ?_profile=) under
+    pyinstrument if installed, or cProfile, and stores the result as a RequestProfile for the admin.
+    Tokens are signed with SECRET_KEY and made by `manage.py profiler_token` or on the admin listing,
+    so staff can profile a tenant's real code path and schema without touching its users.
+    Goes after CustomTenantMiddleware, so the capture is tagged with the tenant.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        payload = read_token(request)
+        if payload is None:
+            return self.get_response(request)
+
+        profiler = _profiler()
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            data, summary = profiler.stop()
+        duration = time.perf_counter() - start
+
+        request_id = self.save(request, response, payload, profiler.format, data, summary, duration)
+        response['X-Profile-Id'] = str(request_id)
+        return response
+
+    @staticmethod
+    def save(request, response, payload, format, data, summary, duration):
+        tenant = getattr(request, 'tenant', None)
+        match = getattr(request, 'resolver_match', None)
+        profile = RequestProfile.objects.create(
+            request_id=uuid.uuid4(),
+            tenant=tenant if tenant is not None and tenant.pk else None,
+            view_name=match.view_name if match is not None else '',
+            method=request.method,
+            path=request.path[:500],
+            status_code=response.status_code,
+            duration_ms=duration * 1000,
+            requested_by=payload.get('by', ''),
+            format=format,
+            summary=summary,
+            data=data,
+        )
+        # Keep only the latest captures
+        keep = getattr(settings, 'PROFILER_KEEP', 200)
+        stale = RequestProfile.objects.order_by('-created_at').values_list('pk', flat=True)[keep:]
+        RequestProfile.objects.filter(pk__in=list(stale)).delete()
+        return profile.request_id
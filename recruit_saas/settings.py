@@ -55,7 +55,9 @@ INSTALLED_APPS = SHARED_APPS + [
 
 # --- MIDDLEWARE ---
 MIDDLEWARE = [
+    'recruit_saas.request_metrics.RequestMetricsMiddleware',
     'recruit_saas.debug_middleware.CustomTenantMiddleware',
+    'recruit_saas.request_profiler.RequestProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -67,6 +69,31 @@ MIDDLEWARE = [
     'recruit_saas.debug_middleware.SubscriptionGuardMiddleware',
 ]
 
+# Per-request query, search_path and external call metrics (see recruit_saas/request_metrics.py).
+# The Server-Timing header shows them to any visitor, so it's off in production unless asked for.
+SERVER_TIMING_HEADER = os.getenv('SERVER_TIMING_HEADER', str(DEBUG)) == 'True'
+# Share of requests logged; slow or query-heavy requests are always logged
+REQUEST_METRICS_SAMPLE_RATE = float(os.getenv('REQUEST_METRICS_SAMPLE_RATE', 0.05))
+REQUEST_METRICS_SLOW_MS = int(os.getenv('REQUEST_METRICS_SLOW_MS', 500))
+REQUEST_METRICS_MAX_QUERIES = int(os.getenv('REQUEST_METRICS_MAX_QUERIES', 50))
+# Staff profiling tokens (`manage.py profiler_token`) stay valid this long; the latest PROFILER_KEEP captures are kept
+PROFILER_TOKEN_MAX_AGE = 3600
+PROFILER_KEEP = 200
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'recruit_saas': {'handlers': ['console'], 'level': 'INFO'},
+        'customers': {'handlers': ['console'], 'level': 'INFO'},
+        'marketing': {'handlers': ['console'], 'level': 'INFO'},
+        'cms': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
 # Allow iframe embedding for tenant preview
 X_FRAME_OPTIONS = 'SAMEORIGIN'
 
@@ -100,11 +127,17 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 # --- DATABASE ---
+# Each worker keeps its connection for CONN_MAX_AGE seconds instead of a new TLS handshake per request,
+# re-checked before reuse; requests start and end on the public schema (customers/db_connections.py).
+# Use the direct (unpooled) endpoint: a transaction-mode pooler can't keep a session's search_path.
+# The backend is django-tenants' plus skipping SET search_path when the session already has it.
 DATABASES = {
     'default': dj_database_url.config(
         default=os.getenv('DATABASE_URL'),
-        engine="django_tenants.postgresql_backend",
-        ssl_require=os.getenv('DATABASE_SSL', 'True') == 'True'
+        engine="recruit_saas.postgresql_backend",
+        ssl_require=os.getenv('DATABASE_SSL', 'True') == 'True',
+        conn_max_age=int(os.getenv('CONN_MAX_AGE', 600)),
+        conn_health_checks=True,
     )
 }
 
@@ -118,6 +151,51 @@ TENANT_MODEL = "customers.Client"
 TENANT_DOMAIN_MODEL = "customers.Domain"
 DEFAULT_SCHEMA_NAME = "public"
 AUTO_CREATE_SCHEMA = True
+# Pre-migrated schemas kept ready by `manage.py fill_schema_pool`; signup migrates a fresh one when it's empty
+SCHEMA_POOL_SIZE = int(os.getenv('SCHEMA_POOL_SIZE', 5))
+SCHEMA_POOL_CHECK_INTERVAL = 30
+# `migrate_schemas --executor=parallel` (see customers/migration_executor.py) spreads tenants over this many processes
+GET_EXECUTOR_FUNCTION = 'customers.migration_executor.get_executor'
+TENANT_MIGRATION_WORKERS = int(os.getenv('TENANT_MIGRATION_WORKERS', 4))
+# Golden schema kept migrated by the parallel executor; new tenant schemas are copied from it with DDL.
+# The leading underscore keeps it clear of slugified company names. Set to '' to migrate each new schema.
+TENANT_TEMPLATE_SCHEMA = os.getenv('TENANT_TEMPLATE_SCHEMA', '_tenant_template')
+
+# --- CACHING ---
+# Per-process by default; set REDIS_URL so every process (web workers and the worker dynos) shares
+# version stamps and cached data. Heroku Redis serves rediss:// with a self-signed certificate.
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {'ssl_cert_reqs': None} if REDIS_URL.startswith('rediss://') else {},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Hostname -> tenant lookups kept in memory by CustomTenantMiddleware (timeout 0 disables).
+# Without a shared cache a save in another process can't reach this one, so entries only live a few seconds.
+TENANT_CACHE_TIMEOUT = int(os.getenv('TENANT_CACHE_TIMEOUT', 300 if REDIS_URL else 5))
+TENANT_CACHE_MAX_SIZE = int(os.getenv('TENANT_CACHE_MAX_SIZE', 1000))
+# Whether the version stamp below is seen by every process, i.e. invalidation is immediate everywhere
+TENANT_CACHE_SHARED = bool(REDIS_URL)
+# Seconds between checks of the shared version stamp bumped when a Client or Domain changes
+TENANT_CACHE_VERSION_CHECK = 1
+# Cross-request CompanyProfile cache, rendered public tenant pages for anonymous visitors and rendered nav and
+# footer fragments ({% cachedfragment %}). Without a shared cache a save only clears the saving process's copy,
+# so the per-process defaults are short enough that other processes catch up within seconds.
+PROFILE_CACHE_TIMEOUT = int(os.getenv('PROFILE_CACHE_TIMEOUT', 300 if REDIS_URL else 10))
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', 600 if REDIS_URL else 30))
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv('FRAGMENT_CACHE_TIMEOUT', 3600 if REDIS_URL else 30))
+# Seconds the portal finder remembers an email with no portals
+PORTAL_FINDER_MISS_TIMEOUT = 60
 
 
 # --- URL ROUTING ---
@@ -153,6 +231,9 @@ TEMPLATES = [
 # --- STATIC FILES ---
 STATICFILES_DIRS = []
 
+# Vendor files live under versioned directories (see cms.vendor), so their content never changes
+WHITENOISE_IMMUTABLE_FILE_TEST = r'/vendor/[\w.-]+-\d+\.\d+\.\d+/'
+
 
 # --- CRISPY FORMS ---
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
@@ -198,3 +279,32 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'hello@getpillarpost.com')
+
+# Outbox: emails are queued in the database and sent by `manage.py process_outbox`
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_POLL_INTERVAL = 5
+# Seconds a worker has to send a claimed batch before other workers may pick it up again
+OUTBOX_CLAIM_TIMEOUT = 300
+# Emails that failed for good are deleted this many days after they were queued
+OUTBOX_FAILED_RETENTION_DAYS = 7
+
+# Site editor images are queued in the database and optimised and uploaded by `manage.py process_images`
+IMAGE_QUEUE_BATCH_SIZE = 10
+IMAGE_QUEUE_MAX_ATTEMPTS = 5
+IMAGE_QUEUE_POLL_INTERVAL = 5
+# Seconds a worker has to upload a claimed batch before other workers may pick it up again
+IMAGE_QUEUE_CLAIM_TIMEOUT = 300
+IMAGE_WEBP_QUALITY = 82
+
+# Job cards per page on the public job list, its infinite-scroll feed and the dashboard
+JOB_PAGE_SIZE = 24
+
+# Largest CV accepted by the apply form; bigger uploads are cut off mid-stream
+MAX_CV_UPLOAD_SIZE = 5 * 1024 * 1024
+
+# Stripe webhook events are recorded by the view and applied by `manage.py process_stripe_events`
+STRIPE_EVENT_BATCH_SIZE = 100
+STRIPE_EVENT_MAX_ATTEMPTS = 5
+STRIPE_EVENT_RETRY_DELAY = 60
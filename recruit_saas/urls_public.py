@@ -10,6 +10,7 @@ urlpatterns = [
     path('signup/', views.tenant_signup, name='tenant_signup'),
     path('find-portal/', views.portal_finder, name='portal_finder'),
     path('about/', views.company_about, name='about'),
+    path('jobs/', views.job_marketplace, name='job_marketplace'),
     # Root page - must be last
     path('', views.landing_page, name='landing'),
 ]